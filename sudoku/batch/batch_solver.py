@@ -0,0 +1,102 @@
+import math
+
+from board.board import Board
+from board.board_exception import BoardException
+from solver.budget_exhausted import BudgetExhausted
+from sudoku_exception import SudokuException
+
+
+class BatchSolver(object):
+    # The results of solving a puzzle that is not solved (see solve_line_result)
+    RESULT_INVALID = "invalid"
+    RESULT_UNSOLVED = "unsolved"
+    RESULT_TIMEOUT = "timeout"
+    FAILED_RESULTS = (RESULT_INVALID, RESULT_UNSOLVED, RESULT_TIMEOUT)
+
+    # Converts a puzzle line of 81 characters (row by row) to a list of nine rows,
+    # as accepted by the Board constructor. Besides '.', '0' is accepted for an
+    # unsolved cell. Surrounding whitespace is ignored. Lines of larger boards are
+    # accepted as well: 256 characters for a 16 x 16 board, and 625 characters for a
+    # 25 x 25 board (see get_box_size).
+    @staticmethod
+    def line_to_rows(line):
+        line = line.strip().replace('0', '.')
+        size = BatchSolver.get_box_size(line) ** 2
+        return [line[i: i + size] for i in range(0, size * size, size)]
+
+    # Returns the box size (see Board) of the board on the specified puzzle line,
+    # based on its length.
+    @staticmethod
+    def get_box_size(line):
+        length = len(line.strip())
+        box_size = math.isqrt(math.isqrt(length))
+        if box_size < 2 or box_size ** 4 != length or box_size > 5:
+            raise BoardException(
+                f"Illegal number of cells in line: '{length}'. Nr. of cells must be 16, 81, 256 or 625.")
+        return box_size
+
+    # Solves the puzzle on the specified line (see line_to_rows) using the specified
+    # engine and heuristic (see Board.solve). Returns the solution as a line of 81
+    # digits (symbols), or None if the puzzle is invalid or could not be solved. If a solution
+    # cache (see SolutionCache) is specified, the puzzle is solved through it. If a
+    # timeout (in seconds) is specified, solving stops when it expires.
+    @staticmethod
+    def solve_line(line, engine=Board.ENGINE_PROPAGATION, heuristic=None, cache=None, timeout=None):
+        result = BatchSolver.solve_line_result(line, engine, heuristic, cache, timeout)
+        return None if result in BatchSolver.FAILED_RESULTS else result
+
+    # Solves the puzzle on the specified line, like solve_line. Returns the solution,
+    # or why there is none: RESULT_INVALID if the line is not a valid puzzle,
+    # RESULT_TIMEOUT if the timeout expired, or RESULT_UNSOLVED otherwise.
+    @staticmethod
+    def solve_line_result(line, engine=Board.ENGINE_PROPAGATION, heuristic=None, cache=None, timeout=None):
+        try:
+            board = Board(BatchSolver.line_to_rows(line), BatchSolver.get_box_size(line))
+        except SudokuException:
+            return BatchSolver.RESULT_INVALID
+        try:
+            if cache is not None:
+                result = cache.solve(board, heuristic, engine, timeout)
+            else:
+                result = board.solve(heuristic, engine, timeout=timeout)
+        except SudokuException:
+            return BatchSolver.RESULT_UNSOLVED
+        if isinstance(result, BudgetExhausted):
+            return BatchSolver.RESULT_TIMEOUT
+        return board.to_line() if board.is_solved() else BatchSolver.RESULT_UNSOLVED
+
+    # Solves the puzzle in the specified binary record (see BinaryFormat) using the
+    # specified engine and heuristic (see Board.solve). Returns the solution as a line
+    # of 81 digits, or None if the puzzle is invalid or could not be solved.
+    @staticmethod
+    def solve_record(record, engine=Board.ENGINE_PROPAGATION, heuristic=None):
+        try:
+            board = Board(record).solve(heuristic, engine)
+        except SudokuException:
+            return None
+        return board.to_line() if board.is_solved() else None
+
+    # Lazily solves the puzzles in the specified iterable of binary records (e.g. a
+    # BinaryCorpusReader), generating a solution (see solve_record) for every puzzle,
+    # in order.
+    @staticmethod
+    def solve_records(records, engine=Board.ENGINE_PROPAGATION, heuristic=None):
+        for record in records:
+            yield BatchSolver.solve_record(record, engine, heuristic)
+
+    # Lazily solves the puzzles in the specified iterable of lines (e.g. an open file),
+    # generating a solution (see solve_line) for every puzzle, in order. Empty lines
+    # and lines starting with '#' are skipped. Lines are read one at a time, so memory
+    # use does not depend on the number of puzzles.
+    @staticmethod
+    def solve_lines(lines, engine=Board.ENGINE_PROPAGATION, heuristic=None, cache=None):
+        for line in lines:
+            if BatchSolver.is_puzzle_line(line):
+                yield BatchSolver.solve_line(line, engine, heuristic, cache)
+
+    # Returns whether the specified line contains a puzzle (i.e. is not empty and not
+    # a comment starting with '#').
+    @staticmethod
+    def is_puzzle_line(line):
+        line = line.strip()
+        return line != '' and not line.startswith('#')
@@ -0,0 +1,38 @@
+from batch.batch_solver import BatchSolver
+from board.board import Board
+from board.topology import Topology
+from solver.solution_cache import SolutionCache
+
+
+# The settings of a worker process that solves puzzles for a pool (see
+# ParallelBatchSolver and SolverService). They are set once, when the worker
+# starts (see initialise), and used for all the puzzles the worker is going to solve.
+class BatchWorker(object):
+    __engine = Board.ENGINE_PROPAGATION
+    __heuristic = None
+    __cache = None
+    __timeout = None
+
+    # Initialises a worker process: sets the solving engine, heuristic, solution cache
+    # (if cache_size is specified) and timeout, and builds the shared topology.
+    @staticmethod
+    def initialise(engine, heuristic, cache_size=None, timeout=None):
+        BatchWorker.__engine = engine
+        BatchWorker.__heuristic = heuristic
+        BatchWorker.__cache = SolutionCache(cache_size) if cache_size else None
+        BatchWorker.__timeout = timeout
+        Topology.get()
+
+    # Solves the specified puzzle line with the settings of the worker process (see
+    # BatchSolver.solve_line).
+    @staticmethod
+    def solve_line(line):
+        return BatchSolver.solve_line(line, BatchWorker.__engine, BatchWorker.__heuristic,
+                                      BatchWorker.__cache, BatchWorker.__timeout)
+
+    # Solves the specified puzzle line with the settings of the worker process (see
+    # BatchSolver.solve_line_result).
+    @staticmethod
+    def solve_line_result(line):
+        return BatchSolver.solve_line_result(line, BatchWorker.__engine, BatchWorker.__heuristic,
+                                             BatchWorker.__cache, BatchWorker.__timeout)
@@ -0,0 +1,86 @@
+import mmap
+
+from board.binary_format import BinaryFormat
+from board.board_exception import BoardException
+
+
+# Reads a corpus in the binary format (see BinaryFormat) through a memory map. Records
+# are returned as memoryview slices of the map, so they are not copied, and only the
+# pages that are actually read are loaded. Record i is found directly, by its offset.
+# The reader must be closed (or used as a context manager) when done. Records (or
+# arrays on them) that are still in use then keep the map open until they are
+# released.
+class BinaryCorpusReader(object):
+
+    def __init__(self, path):
+        self.__file = open(path, "rb")
+        self.__map = None
+        self.__view = None
+        try:
+            try:
+                self.__map = mmap.mmap(self.__file.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                raise BoardException("Not a binary puzzle corpus: empty file.")
+            self.__view = memoryview(self.__map)
+            self.__format, self.__count = BinaryFormat.decode_header(self.__view[:BinaryFormat.HEADER_SIZE])
+            self.__record_size = BinaryFormat.get_record_size(self.__format)
+            if len(self.__map) < BinaryFormat.HEADER_SIZE + self.__count * self.__record_size:
+                raise BoardException("Binary puzzle corpus is truncated.")
+        except BaseException:
+            self.close()
+            raise
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __len__(self):
+        return self.__count
+
+    # Returns the record with the specified index (starting at 0), as a memoryview.
+    def __getitem__(self, index):
+        if index < 0:
+            index += self.__count
+        if not 0 <= index < self.__count:
+            raise IndexError(f"Record index out of range: {index}.")
+        offset = BinaryFormat.HEADER_SIZE + index * self.__record_size
+        return self.__view[offset: offset + self.__record_size]
+
+    def __iter__(self):
+        for index in range(self.__count):
+            yield self[index]
+
+    # Returns the format of the records (see BinaryFormat).
+    def get_format(self):
+        return self.__format
+
+    # Returns the records, all in one memoryview (e.g. to hand to numpy.frombuffer).
+    def get_records(self):
+        start = BinaryFormat.HEADER_SIZE
+        return self.__view[start: start + self.__count * self.__record_size]
+
+    # Closes the memory map and the file. The view is released first. If records are
+    # still in use, the map cannot be closed yet: it is closed when the last of them
+    # is released, so closing never fails (and never hides an exception raised in a
+    # with block).
+    def close(self):
+        try:
+            if self.__view is not None:
+                self.__view.release()
+            if self.__map is not None:
+                self.__map.close()
+        except BufferError:
+            pass
+        finally:
+            self.__view = None
+            self.__map = None
+            self.__file.close()
+
+    # Returns whether the file at the specified path is a binary puzzle corpus (i.e.
+    # starts with the magic number).
+    @staticmethod
+    def is_binary_corpus(path):
+        with open(path, "rb") as file:
+            return file.read(len(BinaryFormat.MAGIC)) == BinaryFormat.MAGIC
@@ -0,0 +1,117 @@
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from itertools import islice
+
+from batch.batch_solver import BatchSolver
+from batch.batch_worker import BatchWorker
+from board.board import Board
+
+
+# Solves batches of puzzles in parallel, in a pool of worker processes.
+# Since the time needed to solve a puzzle varies by orders of magnitude, the puzzles
+# are handed out in small chunks: a worker that is done takes the next chunk right
+# away, so no worker sits idle while another one grinds on a hard puzzle. The chunk
+# size adapts to the measured solving time, so that a chunk takes about
+# target_chunk_seconds. Only a bounded number of chunks is in progress at any time,
+# so memory use does not depend on the number of puzzles.
+# The workers are started once (see BatchWorker) and reused for all batches,
+# until close is called. If cache_size is specified, every worker keeps a solution
+# cache (see SolutionCache) of that size.
+class ParallelBatchSolver(object):
+
+    def __init__(self, processes=None, engine=Board.ENGINE_PROPAGATION, heuristic=None,
+                 target_chunk_seconds=0.05, max_chunk_size=64, cache_size=None):
+        self.__processes = processes or os.cpu_count() or 1
+        self.__target_chunk_seconds = target_chunk_seconds
+        self.__max_chunk_size = max_chunk_size
+        # The average solving time per puzzle, and the resulting chunk size
+        self.__seconds_per_puzzle = None
+        self.__chunk_size = 1
+        self.__executor = ProcessPoolExecutor(
+            max_workers=self.__processes,
+            initializer=BatchWorker.initialise,
+            initargs=(engine, heuristic, cache_size)
+        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    # Shuts down the worker processes.
+    def close(self):
+        self.__executor.shutdown()
+
+    # Lazily solves the puzzles in the specified iterable of lines (see
+    # BatchSolver.solve_lines), generating the solutions in the order of the puzzles.
+    def solve_lines(self, lines):
+        for index, solution in self.__solve(lines, True):
+            yield solution
+
+    # Lazily solves the puzzles in the specified iterable of lines (see
+    # BatchSolver.solve_lines), generating (index, solution) tuples as soon as the
+    # solutions are available, where index is the position of the puzzle (starting
+    # at 0, not counting skipped lines).
+    def solve_lines_unordered(self, lines):
+        return self.__solve(lines, False)
+
+    def __solve(self, lines, ordered):
+        puzzles = (line for line in lines if BatchSolver.is_puzzle_line(line))
+        # At most this number of chunks is in progress (or, if ordered, in progress
+        # or waiting for an earlier chunk)
+        window = 4 * self.__processes
+        running = {}
+        finished = {}
+        next_chunk = 0
+        next_to_yield = 0
+        next_index = 0
+        exhausted = False
+        while True:
+            while not exhausted and (next_chunk - next_to_yield if ordered else len(running)) < window:
+                chunk = list(islice(puzzles, self.__chunk_size))
+                if not chunk:
+                    exhausted = True
+                    break
+                future = self.__executor.submit(ParallelBatchSolver.solve_chunk, chunk)
+                running[future] = (next_chunk, next_index)
+                next_chunk += 1
+                next_index += len(chunk)
+            if not running:
+                return
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                chunk_number, first_index = running.pop(future)
+                solutions, seconds = future.result()
+                self.__adapt_chunk_size(len(solutions), seconds)
+                if ordered:
+                    finished[chunk_number] = (first_index, solutions)
+                else:
+                    for offset, solution in enumerate(solutions):
+                        yield first_index + offset, solution
+            while next_to_yield in finished:
+                first_index, solutions = finished.pop(next_to_yield)
+                for offset, solution in enumerate(solutions):
+                    yield first_index + offset, solution
+                next_to_yield += 1
+
+    # Updates the average solving time per puzzle with the specified measurement, and
+    # derives the size of the next chunks from it.
+    def __adapt_chunk_size(self, puzzle_count, seconds):
+        seconds_per_puzzle = seconds / puzzle_count
+        if self.__seconds_per_puzzle is None:
+            self.__seconds_per_puzzle = seconds_per_puzzle
+        else:
+            self.__seconds_per_puzzle = 0.8 * self.__seconds_per_puzzle + 0.2 * seconds_per_puzzle
+        chunk_size = int(self.__target_chunk_seconds / max(self.__seconds_per_puzzle, 1e-9))
+        self.__chunk_size = max(1, min(self.__max_chunk_size, chunk_size))
+
+    # Solves the specified chunk of puzzle lines in a worker process. Returns the list
+    # of solutions (see BatchSolver.solve_line) and the time it took in seconds.
+    @staticmethod
+    def solve_chunk(lines):
+        start = time.perf_counter()
+        solutions = [BatchWorker.solve_line(line) for line in lines]
+        return solutions, time.perf_counter() - start
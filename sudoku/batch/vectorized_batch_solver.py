@@ -0,0 +1,232 @@
+from itertools import islice
+
+from batch.batch_solver import BatchSolver
+from board.binary_format import BinaryFormat
+from board.board import Board
+from board.candidate_mask import CandidateMask
+from board.topology import Topology
+from solver.solver_exception import SolverException
+from sudoku_exception import SudokuException
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+# Solves batches of puzzles with numpy (an optional dependency). The puzzles of a
+# batch are held as an (N, 81) array of candidate masks (see CandidateMask), which is
+# propagated for all puzzles at once: every step is a handful of array operations on
+# the whole batch, instead of Python calls per cell and per unit. The steps are:
+# - naked singles: the value of a solved cell is removed from its peers (see
+#   SingleUnitSolver);
+# - hidden singles: a value that fits in only one cell of a unit is placed there
+#   (see HiddenSubsetSolver);
+# - locked candidates: a value that, within a block, only fits in one row (column)
+#   is removed from the rest of that row (column), and a value that, within a row
+#   (column), only fits in one block is removed from the rest of that block (see the
+#   block solvers).
+# The steps are repeated for the puzzles that changed, until none of them changes.
+# Only the puzzles that are still unsolved then are handed to Board.solve, one by one.
+class VectorizedBatchSolver(object):
+    ENGINE_VECTORIZED = "vectorized"
+
+    # The shared topology of the board
+    TOPOLOGY = Topology.get()
+
+    # The array tables, created on first use (see __get_tables)
+    __tables = None
+
+    # Lazily solves the puzzles in the specified iterable of lines (see
+    # BatchSolver.solve_lines), in batches of batch_size puzzles, generating the
+    # solutions in the order of the puzzles. The heuristic is used for the puzzles
+    # that cannot be solved by propagation.
+    @staticmethod
+    def solve_lines(lines, heuristic=None, batch_size=4096):
+        puzzles = (line for line in lines if BatchSolver.is_puzzle_line(line))
+        while True:
+            batch = list(islice(puzzles, batch_size))
+            if not batch:
+                return
+            yield from VectorizedBatchSolver.solve_batch(batch, heuristic)
+
+    # Solves the puzzles on the specified list of lines. Returns a list with the
+    # solution of every puzzle (see BatchSolver.solve_line).
+    @staticmethod
+    def solve_batch(lines, heuristic=None):
+        masks, valid = VectorizedBatchSolver.to_masks(lines)
+        return VectorizedBatchSolver.solve_masks(masks, valid, heuristic)
+
+    # Solves the puzzles of the specified binary corpus (a BinaryCorpusReader), in
+    # batches of batch_size puzzles, generating the solutions in the order of the
+    # puzzles. The records are converted to masks without parsing them one by one.
+    @staticmethod
+    def solve_corpus(reader, heuristic=None, batch_size=4096):
+        records = VectorizedBatchSolver.records_to_masks(reader.get_records(), reader.get_format())
+        for start in range(0, len(records), batch_size):
+            masks = records[start: start + batch_size]
+            valid = ((masks != 0) & (masks <= CandidateMask.ALL)).all(axis=1)
+            yield from VectorizedBatchSolver.solve_masks(masks, valid, heuristic)
+
+    # Solves the puzzles with the specified (N, 81) array of masks, of which only the
+    # puzzles that are valid (according to the specified boolean array) are solved.
+    # Returns a list with the solution of every puzzle (None if invalid or unsolved).
+    # The masks of invalid puzzles may be anything (e.g. a corrupt record), so they
+    # are cleared before they are looked up in the tables.
+    @staticmethod
+    def solve_masks(masks, valid, heuristic=None):
+        masks, valid = VectorizedBatchSolver.propagate(masks, valid)
+        masks = numpy.where(valid[:, None], masks, 0).astype(numpy.uint16)
+        popcount = VectorizedBatchSolver.__get_tables()[0]
+        solved = (popcount[masks] == 1).all(axis=1)
+
+        solutions = []
+        for i in range(len(masks)):
+            if not valid[i]:
+                solutions.append(None)
+            elif solved[i]:
+                solutions.append(VectorizedBatchSolver.to_line(masks[i]))
+            else:
+                solutions.append(VectorizedBatchSolver.__solve_scalar(masks[i], heuristic))
+        return solutions
+
+    # Converts the specified list of puzzle lines to an (N, 81) array of candidate
+    # masks. Returns the array, and a boolean array telling which lines are valid
+    # puzzles (the masks of invalid puzzles are all 0).
+    @staticmethod
+    def to_masks(lines):
+        VectorizedBatchSolver.__get_tables()
+        masks = numpy.zeros((len(lines), 81), dtype=numpy.uint16)
+        valid = numpy.ones(len(lines), dtype=bool)
+        for i, line in enumerate(lines):
+            line = line.strip().replace('0', '.')
+            if len(line) != 81 or not all([c == '.' or '1' <= c <= '9' for c in line]):
+                valid[i] = False
+                continue
+            masks[i] = [CandidateMask.ALL if c == '.' else CandidateMask.of(int(c)) for c in line]
+        return masks, valid
+
+    # Converts the specified buffer of binary records in the specified format (see
+    # BinaryFormat) to an (N, 81) array of candidate masks. Records in the masks
+    # format are not copied.
+    @staticmethod
+    def records_to_masks(records, record_format):
+        VectorizedBatchSolver.__get_tables()
+        if record_format == BinaryFormat.FORMAT_MASKS:
+            return numpy.frombuffer(records, dtype="<u2").reshape(-1, 81)
+        nibbles = numpy.frombuffer(records, dtype=numpy.uint8).reshape(-1, BinaryFormat.GIVENS_RECORD_SIZE)
+        values = numpy.stack([nibbles >> 4, nibbles & 0xF], axis=2).reshape(len(nibbles), -1)[:, :81]
+        # Values 1 to 9 map to their bit, 0 to all values, and anything else to 0 (invalid)
+        table = numpy.zeros(16, dtype=numpy.uint16)
+        table[0] = CandidateMask.ALL
+        table[1:10] = [CandidateMask.of(value) for value in range(1, 10)]
+        return table[values]
+
+    # Converts the specified array of 81 masks of solved cells to a line of 81 digits.
+    @staticmethod
+    def to_line(masks):
+        return ''.join([str(CandidateMask.LOWEST_VALUE[int(mask)]) for mask in masks])
+
+    # Propagates the specified (N, 81) array of candidate masks, of which only the
+    # puzzles that are valid (according to the specified boolean array) are solved.
+    # Returns the propagated masks, and the updated array of valid puzzles: a puzzle
+    # turns out to be invalid if a cell has no possible values left, if a value is not
+    # unique in a unit, or if a value has no place left in a unit.
+    @staticmethod
+    def propagate(masks, valid):
+        masks = masks.copy()
+        valid = valid.copy()
+        active = numpy.flatnonzero(valid)
+        while len(active) > 0:
+            before = masks[active]
+            after, failed = VectorizedBatchSolver.__step(before)
+            masks[active] = after
+            valid[active[failed]] = False
+            changed = (after != before).any(axis=1) & ~failed
+            active = active[changed]
+        return masks, valid
+
+    # Performs one propagation step on the specified (M, 81) array of masks. Returns
+    # the new masks and a boolean array telling which puzzles failed.
+    @staticmethod
+    def __step(masks):
+        popcount, units, peers, cell_units, bits = VectorizedBatchSolver.__get_tables()
+
+        # Naked singles
+        solved = popcount[masks] == 1
+        solved_masks = numpy.where(solved, masks, 0).astype(numpy.uint16)
+        used = numpy.bitwise_or.reduce(solved_masks[:, peers], axis=2)
+        failed = (solved & ((used & masks) != 0)).any(axis=1)
+        masks = numpy.where(solved, masks, masks & ~used).astype(numpy.uint16)
+
+        # Hidden singles: per unit and value, the number of cells the value fits in
+        places = (masks[:, units][..., None] & bits) != 0
+        counts = places.sum(axis=2)
+        failed |= (counts == 0).any(axis=(1, 2))
+        hidden = numpy.where(places & (counts == 1)[:, :, None, :], bits, 0)
+        hidden = numpy.bitwise_or.reduce(hidden, axis=3).reshape(len(masks), 243)
+        hidden = numpy.bitwise_or.reduce(hidden[:, cell_units], axis=2).astype(numpy.uint16)
+        failed |= (popcount[hidden] > 1).any(axis=1)
+        masks = numpy.where(hidden != 0, hidden, masks).astype(numpy.uint16)
+
+        # Locked candidates, in rows and (on the transposed grid) in columns
+        masks = VectorizedBatchSolver.__locked_candidates(masks)
+        masks = VectorizedBatchSolver.__locked_candidates(
+            masks.reshape(-1, 9, 9).transpose(0, 2, 1).reshape(-1, 81)
+        ).reshape(-1, 9, 9).transpose(0, 2, 1).reshape(-1, 81)
+
+        failed |= (masks == 0).any(axis=1)
+        return numpy.ascontiguousarray(masks), failed
+
+    # Applies locked candidates to the rows of the specified (M, 81) array of masks.
+    @staticmethod
+    def __locked_candidates(masks):
+        # The masks of the segments: (puzzle, band, row in band, stack, column in stack)
+        cells = masks.reshape(-1, 3, 3, 3, 3)
+        segments = numpy.bitwise_or.reduce(cells, axis=4)
+        # Values that, within a block, only fit in one row segment, are removed from
+        # the other segments of that row
+        others_in_block = numpy.roll(segments, 1, axis=2) | numpy.roll(segments, 2, axis=2)
+        pointing = segments & ~others_in_block
+        remove = numpy.roll(pointing, 1, axis=3) | numpy.roll(pointing, 2, axis=3)
+        # Values that, within a row, only fit in one segment, are removed from the
+        # other segments of that block
+        others_in_row = numpy.roll(segments, 1, axis=3) | numpy.roll(segments, 2, axis=3)
+        claiming = segments & ~others_in_row
+        remove |= numpy.roll(claiming, 1, axis=2) | numpy.roll(claiming, 2, axis=2)
+        return (cells & ~remove[..., None]).astype(numpy.uint16).reshape(-1, 81)
+
+    # Solves the puzzle with the specified (propagated) masks on a Board. Returns the
+    # solution, or None if the puzzle could not be solved.
+    @staticmethod
+    def __solve_scalar(masks, heuristic):
+        board = Board(None)
+        try:
+            board.restore(tuple([int(mask) for mask in masks]))
+            board.solve(heuristic)
+        except SudokuException:
+            return None
+        return board.to_line() if board.is_solved() else None
+
+    # Returns the array tables: the popcount of every mask, the cell indices of the
+    # units, the peers of every cell, the positions of every cell in the flattened
+    # (unit, cell in unit) array of its units, and the bit of every value.
+    @staticmethod
+    def __get_tables():
+        if numpy is None:
+            raise SolverException("The vectorized engine requires numpy, which is not installed.")
+        if VectorizedBatchSolver.__tables is None:
+            topology = VectorizedBatchSolver.TOPOLOGY
+            units = topology.get_units()
+            cell_units = [[] for _ in range(81)]
+            for unit_index, unit in enumerate(units):
+                for position, index in enumerate(unit):
+                    cell_units[index].append(9 * unit_index + position)
+            VectorizedBatchSolver.__tables = (
+                numpy.array([CandidateMask.POPCOUNT[mask] for mask in range(CandidateMask.ALL + 1)], dtype=numpy.uint8),
+                numpy.array(units, dtype=numpy.intp),
+                numpy.array([sorted(peers) for peers in topology.get_peers()], dtype=numpy.intp),
+                numpy.array(cell_units, dtype=numpy.intp),
+                numpy.array([CandidateMask.of(value) for value in range(1, 10)], dtype=numpy.uint16)
+            )
+        return VectorizedBatchSolver.__tables
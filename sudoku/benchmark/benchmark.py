@@ -0,0 +1,182 @@
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+from batch.batch_solver import BatchSolver
+from board.board import Board
+from percentile import Percentile
+from solver.solver_stats import SolverStats
+
+
+# Benchmark of the solver over the bundled puzzle corpora (see the corpora folder).
+# For every corpus it measures the throughput, the latency (p50, p99 and max), the
+# number of search nodes and the peak memory use of Board(...).solve(), and compares
+# the results to a stored baseline, to catch performance regressions.
+# Run it from the sudoku folder: python3 -m benchmark.benchmark --help
+class Benchmark(object):
+    DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+    CORPORA_DIRECTORY = os.path.join(DIRECTORY, "corpora")
+    BASELINE_FILE = os.path.join(DIRECTORY, "baseline.json")
+    CORPORA = ["easy", "seventeen_clue", "hardest"]
+
+    # Metrics that must not increase compared to the baseline, and measured metrics
+    # that should not increase or decrease (see compare). Only the exact metrics are
+    # gated on by default: timings and memory vary too much between runs and machines.
+    EXACT_METRICS = ["unsolved", "nodes_total"]
+    LOWER_IS_BETTER_METRICS = ["p50_ms", "p99_ms", "peak_memory_kb"]
+    HIGHER_IS_BETTER_METRICS = ["puzzles_per_second"]
+
+    # Returns the puzzle lines of the corpus with the specified name.
+    @staticmethod
+    def load_corpus(name):
+        with open(os.path.join(Benchmark.CORPORA_DIRECTORY, f"{name}.txt")) as corpus:
+            return [line.strip() for line in corpus if BatchSolver.is_puzzle_line(line)]
+
+    # Solves the specified puzzle lines (repeat times, for more stable timings) and
+    # returns the metrics as a dictionary.
+    @staticmethod
+    def run_corpus(puzzles, engine=Board.ENGINE_PROPAGATION, heuristic=None, repeat=1):
+        all_rows = [BatchSolver.line_to_rows(line) for line in puzzles]
+
+        latencies = []
+        nodes = []
+        unsolved = 0
+        for _ in range(repeat):
+            nodes = []
+            unsolved = 0
+            for rows in all_rows:
+                start = time.perf_counter()
+                board = Board(rows).solve(heuristic, engine)
+                latencies.append(time.perf_counter() - start)
+                nodes.append(board.get_node_count())
+                if not board.is_solved():
+                    unsolved += 1
+
+        # Memory is measured in a separate run, since tracing slows down solving
+        tracemalloc.start()
+        for rows in all_rows:
+            Board(rows).solve(heuristic, engine)
+        peak_memory = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        latencies.sort()
+        return {
+            "puzzles": len(all_rows),
+            "unsolved": unsolved,
+            "puzzles_per_second": round(len(latencies) / sum(latencies), 1),
+            "p50_ms": round(1000 * Percentile.of(latencies, 0.50), 3),
+            "p99_ms": round(1000 * Percentile.of(latencies, 0.99), 3),
+            "max_ms": round(1000 * latencies[-1], 3),
+            "nodes_total": sum(nodes),
+            "nodes_max": max(nodes),
+            "peak_memory_kb": round(peak_memory / 1024, 1)
+        }
+
+    # Solves the specified puzzle lines once, collecting statistics, and returns the
+    # statistics of all puzzles combined (a SolverStats).
+    @staticmethod
+    def collect_stats(puzzles, engine=Board.ENGINE_PROPAGATION, heuristic=None):
+        stats = SolverStats()
+        for line in puzzles:
+            board = Board(BatchSolver.line_to_rows(line)).solve(heuristic, engine, True)
+            stats.merge(board.get_stats())
+        return stats
+
+    # Compares the results of (the corpora of) one engine to the baseline of that
+    # engine. Returns a list of regressions, as messages; an empty list if there are
+    # none. Node counts and unsolved puzzles may not be worse at all. Measured metrics
+    # are only compared if a tolerance (a fraction) is specified: then they may be
+    # worse than the baseline by the tolerance.
+    @staticmethod
+    def compare(results, baseline, tolerance=None):
+        regressions = []
+        for corpus, metrics in results.items():
+            base = baseline.get(corpus)
+            if base is None:
+                continue
+            for metric in Benchmark.EXACT_METRICS:
+                if metrics[metric] > base[metric]:
+                    regressions.append(f"{corpus}: {metric} {metrics[metric]} > baseline {base[metric]}")
+            if tolerance is None:
+                continue
+            for metric in Benchmark.LOWER_IS_BETTER_METRICS:
+                if metrics[metric] > base[metric] * (1 + tolerance):
+                    regressions.append(f"{corpus}: {metric} {metrics[metric]} > baseline {base[metric]}")
+            for metric in Benchmark.HIGHER_IS_BETTER_METRICS:
+                if metrics[metric] < base[metric] / (1 + tolerance):
+                    regressions.append(f"{corpus}: {metric} {metrics[metric]} < baseline {base[metric]}")
+        return regressions
+
+    # Returns the changes of the measured metrics of the specified results compared to
+    # the baseline, as messages (for information only, see compare).
+    @staticmethod
+    def describe_changes(results, baseline):
+        changes = []
+        for corpus, metrics in results.items():
+            base = baseline.get(corpus)
+            if base is None:
+                continue
+            for metric in Benchmark.LOWER_IS_BETTER_METRICS + Benchmark.HIGHER_IS_BETTER_METRICS:
+                if base[metric]:
+                    change = round(100 * (metrics[metric] / base[metric] - 1))
+                    changes.append(f"{corpus}: {metric} {metrics[metric]} (baseline {base[metric]}, {change:+d}%)")
+        return changes
+
+    # Runs the benchmark from the command line. Returns the exit status: 1 if there
+    # are regressions compared to the baseline, or 0 otherwise.
+    @staticmethod
+    def main(arguments=None):
+        parser = argparse.ArgumentParser(description="Benchmarks the solver over the bundled puzzle corpora.")
+        parser.add_argument("--corpus", action="append", choices=Benchmark.CORPORA,
+                            help="the corpus to run (repeatable; default: all)")
+        parser.add_argument("--engine", choices=[Board.ENGINE_PROPAGATION, Board.ENGINE_DANCING_LINKS],
+                            default=Board.ENGINE_PROPAGATION, help="the solving engine (default: %(default)s)")
+        parser.add_argument("--repeat", type=int, default=3,
+                            help="the number of times to solve every corpus (default: %(default)s)")
+        parser.add_argument("--tolerance", type=float,
+                            help="also fail on timings and memory worse than the baseline by this fraction "
+                                 "(default: report them only)")
+        parser.add_argument("--baseline", default=Benchmark.BASELINE_FILE,
+                            help="the baseline file (default: benchmark/baseline.json)")
+        parser.add_argument("--stats", action="store_true",
+                            help="also report the work done by every solving strategy, per corpus")
+        parser.add_argument("--update-baseline", action="store_true",
+                            help="store the results as the new baseline for the engine, instead of comparing")
+        args = parser.parse_args(arguments)
+
+        results = {}
+        for corpus in args.corpus or Benchmark.CORPORA:
+            results[corpus] = Benchmark.run_corpus(Benchmark.load_corpus(corpus), args.engine, None, args.repeat)
+            print(f"{corpus:>15}: " + ", ".join(f"{key} {value}" for key, value in results[corpus].items()))
+            if args.stats:
+                print(Benchmark.collect_stats(Benchmark.load_corpus(corpus), args.engine).to_string())
+
+        baselines = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline) as baseline_file:
+                baselines = json.load(baseline_file)
+
+        if args.update_baseline:
+            baselines.setdefault(args.engine, {}).update(results)
+            with open(args.baseline, "w") as baseline_file:
+                json.dump(baselines, baseline_file, indent=2, sort_keys=True)
+                baseline_file.write("\n")
+            print(f"Baseline for engine '{args.engine}' updated.")
+            return 0
+
+        baseline = baselines.get(args.engine, {})
+        for change in Benchmark.describe_changes(results, baseline):
+            print(f"INFO {change}")
+        regressions = Benchmark.compare(results, baseline, args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if not regressions:
+            print("No regressions compared to the baseline.")
+        return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(Benchmark.main())
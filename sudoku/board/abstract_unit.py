@@ -1,43 +1,114 @@
+import time
 from abc import ABC, abstractmethod
+
 from board.board_exception import BoardException
+from board.candidate_mask import CandidateMask
+from board.cell_key import CellKey
+from board.topology import Topology
 
 
 # Abstract class Unit (inherits from ABC)
 class AbstractUnit(ABC):
-    def __init__(self, the_board, cell_keys):
-        AbstractUnit.__validate_cell_keys(cell_keys)
+    # The cell keys are either string keys ("x{x}y{y}") or cell indices (0 to 80).
+    # Units created by the board pass trusted=True along with a tuple of cell indices
+    # taken from the shared Topology of the board (of any size), which has been
+    # validated by construction. Other units are units of a 9 x 9 board.
+    def __init__(self, the_board, cell_keys, trusted=False):
+        if trusted:
+            self.__cell_indices = cell_keys
+            self.__topology = the_board.get_topology()
+        else:
+            AbstractUnit.__validate_cell_keys(cell_keys)
+            self.__cell_indices = tuple(CellKey.to_index(key) for key in cell_keys)
+            self.__topology = Topology.get()
         self.__board = the_board
-        self.__cell_keys = cell_keys
+        self.__cells = None
 
     # Returns the board in which this unit sits.
     def get_board(self):
         return self.__board
 
-    # Returns the keys referring to the cells in the unit as a list.
+    # Returns the topology of the board in which this unit sits.
+    def get_topology(self):
+        return self.__topology
+
+    # Returns the string keys referring to the cells in the unit as a list.
     def get_cell_keys(self):
-        return self.__cell_keys
+        return [CellKey.KEYS[index] for index in self.__cell_indices]
 
-    # Returns the cells in the unit as a list.
+    # Returns the indices of the cells in the unit as a tuple.
+    def get_cell_indices(self):
+        return self.__cell_indices
+
+    # Returns the cells in the unit as a list. The cells are looked up once, since
+    # the board never replaces its cell objects.
     def get_cells(self):
-        cells = []
-        for key in self.__cell_keys:
-            cells.append(self.__board.get_cell(key))
-        if len(cells) != 9:
-            raise BoardException(f"Illegal number of cells in unit: {len(cells)}.")
-        return cells
-
-    # Returns the cell represented by the specified key, if present in this unit.
-    # If not present in the unit, None is returned.
+        if self.__cells is None:
+            cells = [self.__board.get_cell(index) for index in self.__cell_indices]
+            if len(cells) != self.__topology.get_size():
+                raise BoardException(f"Illegal number of cells in unit: {len(cells)}.")
+            self.__cells = cells
+        return self.__cells
+
+    # Returns the cell represented by the specified key (string key or cell index),
+    # if present in this unit. If not present in the unit, None is returned. String
+    # keys only exist on 9 x 9 boards: a BoardException is raised for other sizes.
     def get_cell(self, key):
-        if key in self.__cell_keys:
+        if isinstance(key, int):
+            index = key
+        else:
+            size = self.__topology.get_size()
+            if size != 9:
+                raise BoardException(f"Not a valid cell key on a {size} x {size} board: {key}.")
+            if not CellKey.is_valid(key):
+                return None
+            index = CellKey.to_index(key)
+        if index in self.__cell_indices:
             return self.__board.get_cell(key)
         return None
 
-    # Attempts to solve the unit
+    # Returns the solvers (strategies) for the unit, as a list, from cheap to expensive.
     @abstractmethod
-    def solve(self):
+    def get_solvers(self):
         pass
 
+    # Attempts to solve the unit, running its solvers (see get_solvers) in order, or
+    # only those in the specified collection of solvers (if any). Returns True if any
+    # of its cells was changed, or False otherwise.
+    def solve(self, solvers=None):
+        updated = False
+        for solver in self.get_solvers():
+            if self.is_solved():
+                return updated
+            if solvers is None or solver in solvers:
+                updated = self.run_solver(solver) or updated
+        return updated
+
+    # Runs the specified solver on the unit. Returns True if any of its cells was
+    # changed, or False otherwise. If the board collects statistics (see
+    # Board.get_stats), the work done by the solver is recorded.
+    def run_solver(self, solver):
+        stats = self.__board.get_stats()
+        if stats is None:
+            return solver.solve(self)
+
+        cells = self.get_cells()
+        masks_before = [cell.get_mask() for cell in cells]
+        start = time.perf_counter()
+        try:
+            return solver.solve(self)
+        finally:
+            seconds = time.perf_counter() - start
+            eliminations = 0
+            placements = 0
+            for cell, mask_before in zip(cells, masks_before):
+                mask = cell.get_mask()
+                if mask != mask_before:
+                    eliminations += CandidateMask.POPCOUNT[mask_before] - CandidateMask.POPCOUNT[mask]
+                    if CandidateMask.POPCOUNT[mask] == 1:
+                        placements += 1
+            stats.record_strategy(solver, eliminations, placements, seconds)
+
     # Determines if a unit is solved, e.g. all its cells are solved.
     def is_solved(self):
         for cell in self.get_cells():
@@ -48,10 +119,16 @@ class AbstractUnit(ABC):
     # Determines if a value within a unit is solved, e.g. the unit contains a
     # cell that is solved with the specified value.
     def has_solved_cell_with_value(self, value):
+        return self.get_solved_mask() & CandidateMask.of(value) != 0
+
+    # Returns the mask of all values that are solved within the unit.
+    def get_solved_mask(self):
+        solved_mask = 0
         for cell in self.get_cells():
-            if cell.is_solved() and cell.has_possible_value(value):
-                return True
-        return False
+            mask = cell.get_mask()
+            if CandidateMask.POPCOUNT[mask] == 1:
+                solved_mask |= mask
+        return solved_mask
 
     # Validates the unit. Checks for any illegal characters or illegal combinations.
     def validate(self):
@@ -68,10 +145,6 @@ class AbstractUnit(ABC):
     def __validate_cell_keys(cell_keys):
         if len(cell_keys) != 9:
             raise BoardException(f"Not a valid unit: {cell_keys}.")
-        valid_keys = []
-        for x in range(1, 10):
-            for y in range(1, 10):
-                valid_keys.append(f"x{x}y{y}")
         for key in cell_keys:
-            if key not in valid_keys:
+            if not CellKey.is_valid(key):
                 raise BoardException(f"Not a valid unit; one or more keys not valid: {cell_keys}.")
@@ -0,0 +1,142 @@
+import struct
+
+from board.board_exception import BoardException
+from board.candidate_mask import CandidateMask
+
+
+# A compact binary format for corpora of puzzles: a header, followed by fixed-size
+# records, one per puzzle. There are two kinds of records:
+# - FORMAT_GIVENS: the givens of a puzzle at 4 bits per cell (0 for an unsolved
+#   cell), two cells per byte (the first cell in the high nibble): 41 bytes;
+# - FORMAT_MASKS: the possible values masks of all cells (see CandidateMask), as
+#   little-endian 16-bit integers: 162 bytes. This format can hold partially
+#   propagated puzzles.
+# The header holds the record format, the record size and the number of records, so
+# record i is found at offset HEADER_SIZE + i * record_size without reading the
+# records before it (see BinaryCorpusReader).
+class BinaryFormat(object):
+    MAGIC = b"SDKB"
+    VERSION = 1
+
+    FORMAT_GIVENS = 1
+    FORMAT_MASKS = 2
+
+    GIVENS_RECORD_SIZE = 41
+    MASKS_RECORD_SIZE = 162
+
+    # Magic, version, format, record size, number of records, reserved
+    HEADER = struct.Struct("<4sBBHII")
+    HEADER_SIZE = HEADER.size
+
+    __MASKS = struct.Struct("<81H")
+
+    # Returns the record size of the specified format.
+    @staticmethod
+    def get_record_size(record_format):
+        if record_format == BinaryFormat.FORMAT_GIVENS:
+            return BinaryFormat.GIVENS_RECORD_SIZE
+        if record_format == BinaryFormat.FORMAT_MASKS:
+            return BinaryFormat.MASKS_RECORD_SIZE
+        raise BoardException(f"Unknown record format: '{record_format}'.")
+
+    # Returns the header for the specified format and number of records.
+    @staticmethod
+    def encode_header(record_format, count):
+        record_size = BinaryFormat.get_record_size(record_format)
+        return BinaryFormat.HEADER.pack(BinaryFormat.MAGIC, BinaryFormat.VERSION, record_format, record_size, count, 0)
+
+    # Returns the format and the number of records from the specified header (the
+    # first HEADER_SIZE bytes of a corpus).
+    @staticmethod
+    def decode_header(header):
+        if len(header) < BinaryFormat.HEADER_SIZE:
+            raise BoardException("Not a binary puzzle corpus: header too short.")
+        magic, version, record_format, record_size, count, reserved = BinaryFormat.HEADER.unpack_from(header)
+        if magic != BinaryFormat.MAGIC:
+            raise BoardException("Not a binary puzzle corpus: illegal magic number.")
+        if version != BinaryFormat.VERSION:
+            raise BoardException(f"Unsupported binary puzzle corpus version: '{version}'.")
+        if record_size != BinaryFormat.get_record_size(record_format):
+            raise BoardException(f"Illegal record size: '{record_size}'.")
+        return record_format, count
+
+    # Returns the givens record of the specified puzzle line of 81 characters ('.' or
+    # '0' for an unsolved cell).
+    @staticmethod
+    def encode_givens(line):
+        line = line.strip()
+        if len(line) != 81:
+            raise BoardException(f"Illegal number of cells in line: '{len(line)}'. Nr. of cells must be 81.")
+        values = []
+        for value in line:
+            if value in ('.', '0'):
+                values.append(0)
+            elif '1' <= value <= '9':
+                values.append(int(value))
+            else:
+                raise BoardException(f"Illegal value for cell: '{value}'. "
+                                     "Only digits [1-9] or '.' (empty cell) are allowed.")
+        values.append(0)
+        return bytes([(values[i] << 4) | values[i + 1] for i in range(0, 82, 2)])
+
+    # Returns the values of the cells (0 for an unsolved cell) in the specified givens
+    # record, as a list ordered by cell index.
+    @staticmethod
+    def decode_givens(record):
+        values = []
+        for byte in record:
+            values.append(byte >> 4)
+            values.append(byte & 0xF)
+        return values[:81]
+
+    # Returns the masks record of the specified possible values masks (ordered by cell
+    # index, see Board.snapshot).
+    @staticmethod
+    def encode_masks(masks):
+        return BinaryFormat.__MASKS.pack(*masks)
+
+    # Returns the possible values masks in the specified masks record, as a tuple
+    # ordered by cell index.
+    @staticmethod
+    def decode_masks(record):
+        return BinaryFormat.__MASKS.unpack(record)
+
+    # Returns the possible values masks of the specified record (of either format), as
+    # a tuple ordered by cell index. The format is told by the size of the record.
+    @staticmethod
+    def to_masks(record):
+        if len(record) == BinaryFormat.GIVENS_RECORD_SIZE:
+            masks = []
+            for value in BinaryFormat.decode_givens(record):
+                if value > 9:
+                    raise BoardException(f"Illegal value for cell: '{value}'.")
+                masks.append(CandidateMask.of(value) if value else CandidateMask.ALL)
+            return tuple(masks)
+        if len(record) == BinaryFormat.MASKS_RECORD_SIZE:
+            masks = BinaryFormat.decode_masks(record)
+            for mask in masks:
+                if mask == 0 or mask > CandidateMask.ALL:
+                    raise BoardException(f"Illegal possible values mask for cell: '{mask}'.")
+            return masks
+        raise BoardException(f"Illegal record size: '{len(record)}'.")
+
+    # Writes a corpus in the specified format to the specified binary file (which
+    # must be seekable), with a record for every puzzle in the specified iterable: a
+    # puzzle line for FORMAT_GIVENS, or a sequence of 81 masks for FORMAT_MASKS.
+    # Returns the number of records written.
+    @staticmethod
+    def write(file, puzzles, record_format=FORMAT_GIVENS):
+        start = file.tell()
+        file.write(BinaryFormat.encode_header(record_format, 0))
+        count = 0
+        for puzzle in puzzles:
+            if record_format == BinaryFormat.FORMAT_GIVENS:
+                file.write(BinaryFormat.encode_givens(puzzle))
+            else:
+                file.write(BinaryFormat.encode_masks(puzzle))
+            count += 1
+        end = file.tell()
+        file.seek(start)
+        file.write(BinaryFormat.encode_header(record_format, count))
+        file.seek(end)
+        return count
@@ -1,111 +1,113 @@
 from board.abstract_unit import AbstractUnit
 from board.board_exception import BoardException
+from board.candidate_mask import CandidateMask
+from board.cell_key import CellKey
 from solver.bidirectional_block_solver import BidirectionalBlockSolver
+from solver.hidden_subset_solver import HiddenSubsetSolver
 from solver.horizontal_block_solver import HorizontalBlockSolver
 from solver.single_unit_solver import SingleUnitSolver
 from solver.vertical_block_solver import VerticalBlockSolver
 
 
-# Respresents a 3 x 3 block of cells on a 9 x 9 sudoku board.
+# Respresents a 3 x 3 block of cells on a 9 x 9 sudoku board (or a block of box size
+# x box size cells on a larger board).
 class BlockUnit(AbstractUnit):
-    # An ordered sequence of solvers, used by the solve method
-    # in the same order to solve this block unit
+    # The solvers for a block unit, from cheap to expensive. (During propagation, the
+    # board decides which of them run, and in which order; see StrategyScheduler.)
     SOLVER_SEQUENCE = [
         SingleUnitSolver,
+        HiddenSubsetSolver,
         HorizontalBlockSolver,
-        SingleUnitSolver,
         VerticalBlockSolver,
-        SingleUnitSolver,
-        BidirectionalBlockSolver,
-        SingleUnitSolver
+        BidirectionalBlockSolver
     ]
 
-    def __init__(self, the_board, cell_keys):
-        super().__init__(the_board, cell_keys)
+    # The solvers in the sequence that depend on the horizontal neighbour block units
+    # (and need to run again when those change), and likewise for the vertical ones.
+    HORIZONTAL_NEIGHBOUR_SOLVERS = frozenset([HorizontalBlockSolver, BidirectionalBlockSolver])
+    VERTICAL_NEIGHBOUR_SOLVERS = frozenset([VerticalBlockSolver, BidirectionalBlockSolver])
+
+    def __init__(self, the_board, cell_keys, trusted=False):
+        super().__init__(the_board, cell_keys, trusted)
 
         # Validate if the keys constitute a valid block
-        BlockUnit.__validate_block_keys(cell_keys)
+        if not trusted:
+            BlockUnit.__validate_block_keys(cell_keys)
 
-    # Attempts to solve the block unit. Returns True if any of its cells was
-    # changed, or False otherwise.
-    def solve(self):
-        updated = False
-        for solver in BlockUnit.SOLVER_SEQUENCE:
-            if self.is_solved():
-                return updated
-            updated = solver.solve(self)
-        return updated
+        # The index of the block on the board (0 to 8, row by row), and its neighbours
+        # (looked up in the shared topology once they are needed).
+        self.__block_index = self.get_topology().get_block_of_cell()[self.get_cell_indices()[0]]
+        self.__horizontal_neighbours = None
+        self.__vertical_neighbours = None
 
-    # Returns the two block units at the left and/or right from the current block unit.
-    # If the current unit is not a block unit, an empty list is returned.
+    # Returns the solvers for the block unit (see SOLVER_SEQUENCE).
+    def get_solvers(self):
+        return BlockUnit.SOLVER_SEQUENCE
+
+    # Returns the block units at the left and/or right from the current block unit (two
+    # on a 9 x 9 board).
     def get_horizontal_neighbours(self):
-        horizontal_neighbours = []
-        row_num_of_block_unit = self.get_cell_keys()[0][3:4]
-        for block_unit in self.get_board().get_block_units():
-            if block_unit != self and block_unit.get_cell_keys()[0][3:4] == row_num_of_block_unit:
-                horizontal_neighbours.append(block_unit)
-        if len(horizontal_neighbours) != 2:
-            raise BoardException("Unexpected number of horizontal neighbour block units.")
-        return horizontal_neighbours
+        if self.__horizontal_neighbours is None:
+            block_units = self.get_board().get_block_units()
+            self.__horizontal_neighbours = [
+                block_units[b] for b in self.get_topology().get_horizontal_neighbours()[self.__block_index]
+            ]
+        return self.__horizontal_neighbours
 
-    # Returns the two block units at on top and/or below the current block unit.
-    # If the current unit is not a block unit, an empty list is returned.
+    # Returns the block units at on top and/or below the current block unit (two on a
+    # 9 x 9 board).
     def get_vertical_neighbours(self):
-        vertical_neighbours = []
-        col_num_of_block_unit = self.get_cell_keys()[0][1:2]
-        for block_unit in self.get_board().get_block_units():
-            if block_unit != self and block_unit.get_cell_keys()[0][1:2] == col_num_of_block_unit:
-                vertical_neighbours.append(block_unit)
-        if len(vertical_neighbours) != 2:
-            raise BoardException("Unexpected number of vertical neighbour block units.")
-        return vertical_neighbours
+        if self.__vertical_neighbours is None:
+            block_units = self.get_board().get_block_units()
+            self.__vertical_neighbours = [
+                block_units[b] for b in self.get_topology().get_vertical_neighbours()[self.__block_index]
+            ]
+        return self.__vertical_neighbours
+
+    # Returns the index of the block on the board (0 to 8, row by row).
+    def get_block_index(self):
+        return self.__block_index
 
+    # Returns the index (0 to 2, or up to the box size - 1) of the only row within the block unit that contains
+    # cells with the specified possible value, or None if there is no such row.
     def get_distinct_row_containing_possible_val(self, value):
-        # Get the keys of all cells in the unit that have the specified possible value
-        keys = self.__get_keys_of_cells_with_value(value)
-        # Not found? Return None
-        if len(keys) == 0:
-            return None
-        # Found? Are they on the same row (based on the key)?
-        # Then the row index within the unit is returned, or None otherwise
-        for i in range(0, len(keys)):
-            if keys[i][2:4] != keys[0][2:4]:
-                return None
-        return (int(keys[0][3:4]) - 1) % 3
+        return self.__get_distinct_line_containing_possible_val(
+            value, self.get_topology().get_block_row_positions())
 
+    # Returns the index (0 to 2, or up to the box size - 1) of the only column within the block unit that contains
+    # cells with the specified possible value, or None if there is no such column.
     def get_distinct_column_containing_possible_val(self, value):
-        # Get the keys of all cells in the unit that have the specified possible value
-        keys = self.__get_keys_of_cells_with_value(value)
-        # Not found? Return None
-        if len(keys) == 0:
-            return None
-        # Found? Are they on the same row (based on the key)?
-        # Then the column index within the unit is returned, or None otherwise
-        for i in range(0, len(keys)):
-            if keys[i][0:2] != keys[0][0:2]:
-                return None
-        return (int(keys[0][1:2]) - 1) % 3
+        return self.__get_distinct_line_containing_possible_val(
+            value, self.get_topology().get_block_column_positions())
 
-    # Gathers all keys referring to cells containing the specified value as a possible value.
-    def __get_keys_of_cells_with_value(self, value):
-        keys = []
-        for key in self.get_cell_keys():
-            if self.get_cell(key).has_possible_value(value):
-                keys.append(key)
-        return keys
+    # Returns the index of the only line (given as lists of positions within the block,
+    # i.e. the intersections of the block with the rows or columns crossing it) that
+    # contains cells with the specified possible value, or None if there is no such line.
+    def __get_distinct_line_containing_possible_val(self, value, lines):
+        bit = CandidateMask.of(value)
+        cells = self.get_cells()
+        distinct_line = None
+        for line_index, positions in enumerate(lines):
+            for position in positions:
+                if cells[position].get_mask() & bit:
+                    if distinct_line is not None:
+                        return None
+                    distinct_line = line_index
+                    break
+        return distinct_line
 
     # Validate if the keys constitute a valid block
     @staticmethod
     def __validate_block_keys(cell_keys):
         for i in [0, 3, 6]:
             row_keys = cell_keys[i: i + 3]
-            y = row_keys[0][3:4]
+            y = CellKey.to_index(row_keys[0]) // 9
             for key in row_keys:
-                if key[3:4] != y:
+                if CellKey.to_index(key) // 9 != y:
                     raise BoardException(f"Not a valid block; cell keys in row do not align {row_keys}")
         for i in range(0, 3):
             column_keys = [cell_keys[i], cell_keys[i + 3], cell_keys[i + 6]]
-            x = column_keys[0][1:2]
+            x = CellKey.to_index(column_keys[0]) % 9
             for key in column_keys:
-                if key[1:2] != x:
+                if CellKey.to_index(key) % 9 != x:
                     raise BoardException(f"Not a valid block; cell keys in column do not align {column_keys}")
@@ -1,77 +1,151 @@
+from board.binary_format import BinaryFormat
 from board.block_unit import BlockUnit
 from board.board_exception import BoardException
+from board.candidate_mask import CandidateMask
 from board.cell import Cell
+from board.cell_key import CellKey
 from board.column_unit import ColumnUnit
 from board.row_unit import RowUnit
+from board.topology import Topology
+from board.zobrist_keys import ZobristKeys
 from solver.brute_force_board_solver import BruteForceBoardSolver
+from solver.budget_exhausted import BudgetExhausted
+from solver.budget_exhausted_exception import BudgetExhaustedException
+from solver.dancing_links_solver import DancingLinksSolver
+from solver.solve_budget import SolveBudget
+from solver.solver_stats import SolverStats
+from solver.strategy_scheduler import StrategyScheduler
+from sudoku_exception import SudokuException
 
 
 class Board(object):
+    # The solving engines (see solve)
+    ENGINE_PROPAGATION = "propagation"
+    ENGINE_DANCING_LINKS = "dancing_links"
 
     # Constructor accepting a list of nine rows, each consisting of 9 characters
     # in the set ['.', '1', '2', '3', '4', '5', '6', '7', '8', '9'], where '.'
     # represents an unsolved cell, and any digit represents a solved cell.
+    # Alternatively, a record in the binary format (bytes or a memoryview, see
+    # BinaryFormat) is accepted.
     # The input parameter is optional: when left empty, all cells will be unsolved.
-    def __init__(self, rows):
-        # Initialise cells
-        self.__cells = {}
-        for y in range(1, 10):
-            for x in range(1, 10):
-                self.__cells[f"x{x}y{y}"] = Cell()
-
-        # Initialise units (rows, columns and blocks)
-        self.__units = []
-        self.__create_row_units()
-        self.__create_column_units()
-        self.__create_block_units()
+    # For larger boards, specify the box size (the number of cells along a block side,
+    # from 2 to 5): a board of box size b has b * b rows of b * b characters, where the
+    # values are represented by their symbols (see CandidateMask.SYMBOLS), e.g. '1' to
+    # '9' and 'A' to 'G' on a 16 x 16 board (box size 4).
+    def __init__(self, rows, box_size=3):
+        if not isinstance(box_size, int) or not 2 <= box_size or box_size * box_size > CandidateMask.MAX_SIZE:
+            raise BoardException(f"Illegal box size: '{box_size}'. Box size must be in range 2 to 5.")
+        topology = Topology.get(box_size)
+        size = topology.get_size()
+        self.__topology = topology
+        self.__size = size
+
+        # The number of search nodes of the last solve (see get_node_count), and the
+        # statistics of the last solve, if collected (see get_stats)
+        self.__node_count = 0
+        self.__stats = None
+
+        # For every unit (in the order of the topology): the mask of the values of its
+        # solved cells, kept up to date while cells are solved (see on_cell_changed).
+        self.__used = [0] * (3 * size)
+
+        # The units waiting to be solved by propagate, in order, each mapped to the
+        # set of solvers to run on it (or None for all its solvers). The deferred units
+        # are solved once no more units are pending (see StrategyScheduler), each
+        # mapped to the set of deferred solvers.
+        self.__pending = {}
+        self.__deferred = {}
+        self.__scheduler = StrategyScheduler()
+
+        # Initialise cells, stored row by row (see CellKey for the index layout).
+        # The board listens to changes of the cells (see on_cell_changed).
+        self.__cells = [Cell(self, index, size) for index in range(size * size)]
+
+        # Initialise units (rows, columns and blocks) from the shared topology
+        self.__block_units = [BlockUnit(self, cell_indices, True) for cell_indices in topology.get_blocks()]
+        self.__units = [RowUnit(self, cell_indices, True) for cell_indices in topology.get_rows()]
+        self.__units += [ColumnUnit(self, cell_indices, True) for cell_indices in topology.get_columns()]
+        self.__units += self.__block_units
+        self.__units_of_cell = topology.get_units_of_cell()
 
         # Fill in the solved cells, based on the input parameter rows.
-        if rows:
-            if len(rows) != 9:
-                raise BoardException(f"Illegal number of rows: '{len(rows)}'. Nr. of rows must be 9.")
-            for y in range(0, 9):
+        if isinstance(rows, (bytes, bytearray, memoryview)):
+            if box_size != 3:
+                raise BoardException("Binary records are only supported for 9 x 9 boards.")
+            # Raises a BoardException if a value is not unique in its units
+            for index, mask in enumerate(BinaryFormat.to_masks(rows)):
+                if mask != CandidateMask.ALL:
+                    self.__cells[index].remove_mask(CandidateMask.ALL & ~mask)
+        elif rows:
+            if len(rows) != size:
+                raise BoardException(f"Illegal number of rows: '{len(rows)}'. Nr. of rows must be {size}.")
+            symbols = CandidateMask.SYMBOLS[:size]
+            for y in range(0, size):
                 row = rows[y]
-                if len(row) != 9:
-                    raise BoardException(f"Illegal number of cells in row: '{len(row)}'. Nr. of cells must be 9.")
+                if len(row) != size:
+                    raise BoardException(
+                        f"Illegal number of cells in row: '{len(row)}'. Nr. of cells must be {size}.")
                 row_values = list(row)
-                for x in range(0, 9):
+                for x in range(0, size):
                     value = row_values[x]
-                    if value not in ('.', '1', '2', '3', '4', '5', '6', '7', '8', '9'):
+                    if value != '.' and value not in symbols:
+                        if size == 9:
+                            raise BoardException(f"Illegal value for cell: '{value}'. "
+                                                 "Only digits [1-9] or '.' (empty cell) are allowed.")
                         raise BoardException(f"Illegal value for cell: '{value}'. "
-                                             "Only digits [1-9] or '.' (empty cell) are allowed.")
+                                             f"Only symbols [{symbols}] or '.' (empty cell) are allowed.")
                     if value != '.':
-                        self.set_cell_value(f"x{x + 1}y{y + 1}", value)
-                        self.validate()
+                        # Raises a BoardException if the value is not unique in its units
+                        self.set_cell_value(size * y + x, symbols.index(value) + 1)
+
+    # Returns the (shared) topology of the board.
+    def get_topology(self):
+        return self.__topology
+
+    # Returns the size of the board (the number of cells along a side).
+    def get_size(self):
+        return self.__size
+
+    # Returns the box size of the board (the number of cells along a block side).
+    def get_box_size(self):
+        return self.__topology.get_box_size()
 
     # Returns all block units on the board.
     def get_block_units(self):
-        block_units = []
-        for unit in self.__units:
-            if isinstance(unit, BlockUnit):
-                block_units.append(unit)
-        if len(block_units) != 9:
-            raise BoardException(f"Unexpected number of block units on the board: {len(block_units)}.")
-        return block_units
+        return self.__block_units
 
-    # Returns the cell with the specified key.
+    # Returns the cell with the specified key, which is either a cell index (0 to 80,
+    # or up to the number of cells - 1) or a string key ("x{x}y{y}", 9 x 9 boards only).
+    # Raises a BoardException for an index out of range (negative indices included),
+    # or a string key on a board of another size.
     def get_cell(self, key):
-        return self.__cells[key]
+        if isinstance(key, int):
+            if 0 <= key < len(self.__cells):
+                return self.__cells[key]
+            raise BoardException(f"Not a valid cell index: {key}.")
+        if self.__size != 9:
+            raise BoardException(f"Not a valid cell key on a {self.__size} x {self.__size} board: {key}.")
+        return self.__cells[CellKey.to_index(key)]
+
+    # Returns all cells on the board as a list, ordered by cell index.
+    def get_cells(self):
+        return self.__cells
 
     # Returns the first cell that is yet unsolved, or None if all the cells are solved.
     def get_first_unsolved_cell(self):
-        for cell in self.__cells.values():
+        for cell in self.__cells:
             if not cell.is_solved():
                 return cell
         return None
 
     # Sets a definitive value for the cell identified by the specified key.
     def set_cell_value(self, key, value):
-        self.__cells[key].set_value(value)
+        self.get_cell(key).set_value(value)
 
     # Determines if all the cells on the board are solved.
     def is_solved(self):
-        cells = list(self.__cells.values())
-        for cell in cells:
+        for cell in self.__cells:
             if not cell.is_solved():
                 return False
         return True
@@ -79,20 +153,170 @@ class Board(object):
     # Attempts to solve all the units (blocks, rows, columns) on the board.
     # Solving will be repeated as long as one or more cells are solved by the
     # attempts. If units are no longer able to solve themselves, a brute force
-    # board solver will make a recursive attempt to solve the board.
-    # Returns the updated/solved board.
+    # board solver will make an attempt to solve the board, branching as prescribed
+    # by the specified heuristic (see BruteForceBoardSolver).
+    # This is the ENGINE_PROPAGATION engine. Alternatively, the ENGINE_DANCING_LINKS
+    # engine solves the board as an exact cover problem (see DancingLinksSolver),
+    # which has a more predictable worst case; it ignores the heuristic.
+    # If collect_stats is True, statistics about the work done by the solving
+    # strategies are collected (see get_stats).
+    # The search can be limited by a timeout (in seconds), a maximum number of search
+    # nodes and a cancel token (see CancelToken); when any of these is exhausted, the
+    # search stops, and a BudgetExhausted result is returned instead of the board. It
+    # holds the board as far as it was solved by propagation, without any guesses.
+    # A transposition table (see TranspositionTable) can be shared between solves, to
+    # prune the dead ends found before (ENGINE_PROPAGATION only).
+    # The board is solved in place; returns the updated/solved board (self).
     # Raises a SudokuException if the board becomes invalid
-    def solve(self):
-        # Solve units separately
-        continue_solving_units = not self.is_solved()
-        while continue_solving_units:
-            updated = False
-            for unit in self.__units:
-                updated = unit.solve() or updated
-            continue_solving_units = updated and not self.is_solved()
-        self.validate()
-        # Solve the (rest of the) board by brute force
-        return BruteForceBoardSolver.solve(self)
+    def solve(self, heuristic=None, engine=ENGINE_PROPAGATION, collect_stats=False,
+              timeout=None, max_nodes=None, cancel_token=None, transposition_table=None):
+        self.__node_count = 0
+        self.__stats = SolverStats() if collect_stats else None
+        budget = None
+        if timeout is not None or max_nodes is not None or cancel_token is not None:
+            budget = SolveBudget(timeout, max_nodes, cancel_token)
+        if engine == Board.ENGINE_DANCING_LINKS:
+            try:
+                return DancingLinksSolver.solve(self, budget)
+            except BudgetExhaustedException as exception:
+                return BudgetExhausted(self, exception.get_reason(), self.__node_count)
+        if engine != Board.ENGINE_PROPAGATION:
+            raise BoardException(f"Unknown solving engine: '{engine}'.")
+        self.propagate()
+        if budget is None:
+            # Solve the (rest of the) board by brute force
+            return BruteForceBoardSolver.solve(self, heuristic, None, transposition_table)
+        snapshot = self.snapshot()
+        try:
+            return BruteForceBoardSolver.solve(self, heuristic, budget, transposition_table)
+        except BudgetExhaustedException as exception:
+            self.restore(snapshot, True)
+            return BudgetExhausted(self, exception.get_reason(), self.__node_count)
+
+    # Counts the solutions of the board, without solving it: the board itself is left
+    # unchanged. The search stops as soon as limit solutions are found (unless limit is
+    # None), so e.g. count_solutions(2) tells whether a puzzle has no solution, a
+    # unique solution, or more than one solution. The search nodes are counted (see
+    # get_node_count). Returns the number of solutions found (at most limit). A
+    # transposition table (see TranspositionTable) can be shared between searches.
+    def count_solutions(self, limit=None, heuristic=None, transposition_table=None):
+        self.__node_count = 0
+        self.__stats = None
+        board = self.clone()
+        try:
+            board.propagate()
+            count = BruteForceBoardSolver.count_solutions(board, limit, heuristic, transposition_table)
+        except SudokuException:
+            count = 0
+        self.__node_count = board.get_node_count()
+        return count
+
+    # Returns whether the board has exactly one solution (see count_solutions). Stops
+    # searching as soon as a second solution is found.
+    def has_unique_solution(self, heuristic=None, transposition_table=None):
+        return self.count_solutions(2, heuristic, transposition_table) == 1
+
+    # Solves the units (blocks, rows, columns) on the board, until they are no longer
+    # able to solve themselves, without any guessing. Only units that are affected by
+    # changed cells are solved, and only with the solvers that depend on those cells
+    # (see on_cell_changed); each change in turn schedules the units it affects.
+    # Raises a SudokuException if the board becomes invalid (which is detected while
+    # propagating, see on_cell_changed, so a full validate is not necessary).
+    # The solvers run on a unit, and their order, are decided by the strategy
+    # scheduler: expensive and unproductive solvers are deferred until the cheap ones
+    # have reached a fixpoint, but they do run eventually.
+    def propagate(self):
+        pending = self.__pending
+        deferred = self.__deferred
+        scheduler = self.__scheduler
+        while True:
+            while pending:
+                unit = next(iter(pending))
+                solvers = pending.pop(unit)
+                now, later = scheduler.select(unit, unit.get_solvers() if solvers is None else solvers)
+                self.__run_solvers(unit, now)
+                if later and not unit.is_solved():
+                    if unit in deferred:
+                        deferred[unit].update(later)
+                    else:
+                        deferred[unit] = set(later)
+            if not deferred:
+                return
+            unit = next(iter(deferred))
+            self.__run_solvers(unit, scheduler.order(deferred.pop(unit)))
+
+    # Runs the specified solvers on the specified unit, in order, and records their
+    # yield with the strategy scheduler.
+    def __run_solvers(self, unit, solvers):
+        scheduler = self.__scheduler
+        for solver in solvers:
+            if unit.is_solved():
+                return
+            scheduler.record(unit, solver, unit.run_solver(solver))
+
+    # Called by a cell on the board when its possible values have changed (old_mask
+    # holds the possible values before the change).
+    # If the cell became solved, its value is checked against the solved values in
+    # its units: raises a BoardException if the value is not unique.
+    # Schedules the units affected by the change to be solved (see propagate). These
+    # are the row, column and block of the cell (all solvers), and the neighbours of
+    # the block (only the solvers depending on neighbour block units).
+    def on_cell_changed(self, index, old_mask):
+        row, column, block = self.__units_of_cell[index]
+        mask = self.__cells[index].get_mask()
+        if CandidateMask.POPCOUNT[mask] == 1:
+            used = self.__used
+            if CandidateMask.POPCOUNT[old_mask] == 1:
+                # The value of a solved cell was replaced
+                used[row] &= ~old_mask
+                used[column] &= ~old_mask
+                used[block] &= ~old_mask
+            if (used[row] | used[column] | used[block]) & mask:
+                raise BoardException(f"Value {CandidateMask.LOWEST_VALUE[mask]} not unique in unit.")
+            used[row] |= mask
+            used[column] |= mask
+            used[block] |= mask
+        self.__schedule_units_of_cell(index)
+
+    # Schedules the units affected by a change of the cell with the specified index
+    # (see on_cell_changed).
+    def __schedule_units_of_cell(self, index):
+        row, column, block = self.__units_of_cell[index]
+        pending = self.__pending
+        pending[self.__units[row]] = None
+        pending[self.__units[column]] = None
+        block_unit = self.__units[block]
+        pending[block_unit] = None
+        for neighbour in block_unit.get_horizontal_neighbours():
+            self.__schedule(neighbour, BlockUnit.HORIZONTAL_NEIGHBOUR_SOLVERS)
+        for neighbour in block_unit.get_vertical_neighbours():
+            self.__schedule(neighbour, BlockUnit.VERTICAL_NEIGHBOUR_SOLVERS)
+
+    # Schedules the specified solvers to be run on the specified unit.
+    def __schedule(self, unit, solvers):
+        pending = self.__pending
+        if unit not in pending:
+            pending[unit] = set(solvers)
+        elif pending[unit] is not None:
+            pending[unit].update(solvers)
+
+    # Returns the number of search nodes (branches tried by the brute force board
+    # solver) during the last call to solve.
+    def get_node_count(self):
+        return self.__node_count
+
+    # Returns the statistics (a SolverStats) of the last call to solve, or None if
+    # statistics were not collected.
+    def get_stats(self):
+        return self.__stats
+
+    # Returns the strategy scheduler of the board (see propagate).
+    def get_scheduler(self):
+        return self.__scheduler
+
+    # Counts the specified number of search nodes (see get_node_count).
+    def count_search_nodes(self, count=1):
+        self.__node_count += count
 
     # Validates the board. Checks for any illegal characters or illegal combinations.
     def validate(self):
@@ -102,70 +326,76 @@ class Board(object):
     # Returns a string representation of the board.
     def to_string(self):
         string = ""
-        for y in range(1, 10):
-            for x in range(1, 10):
-                string += self.__cells[f"x{x}y{y}"].to_string()
-            if y < 9:
+        size = self.__size
+        for y in range(0, size):
+            for x in range(0, size):
+                string += self.__cells[size * y + x].to_string()
+            if y < size - 1:
                 string += "\n"
         return string
 
+    # Returns a single line representation of the board: 81 characters (one per cell),
+    # row by row, with the digit (symbol) of every solved cell, or a '.' for every
+    # unsolved cell.
+    def to_line(self):
+        return ''.join([cell.to_string()[1] for cell in self.__cells])
+
     # Returns a clone (deep copy) of this board.
     def clone(self):
-        rows = ['.........' for x in range(9)]
-        all_possible_values = [x for x in range(1, 10)]
-        clone = Board(rows)
-        for y in range(1, 10):
-            for x in range(1, 10):
-                key = f'x{x}y{y}'
-                current_cell_possible_values = self.__cells[key].get_possible_values()
-                removables = [x for x in all_possible_values if x not in current_cell_possible_values]
-                clone.__cells[key].remove_possible_values(removables)
-        clone.validate()
+        clone = Board(None, self.get_box_size())
+        clone.restore(self.snapshot())
         return clone
 
+    # Returns a snapshot of the state of the board: the possible values masks of all
+    # cells as a tuple, ordered by cell index. The snapshot can be passed to restore.
+    def snapshot(self):
+        return tuple([cell.get_mask() for cell in self.__cells])
+
+    # Restores the state of the board from the specified snapshot (see snapshot).
+    # The units affected by the restored cells are scheduled to be solved, unless the
+    # snapshot was taken right after propagating (propagated is True): then there is
+    # nothing left to solve, and any pending units are discarded.
+    def restore(self, snapshot, propagated=False):
+        if propagated:
+            for cell, mask in zip(self.__cells, snapshot):
+                cell.set_mask(mask)
+            self.__pending.clear()
+            self.__deferred.clear()
+        else:
+            for index, cell in enumerate(self.__cells):
+                if cell.get_mask() != snapshot[index]:
+                    cell.set_mask(snapshot[index])
+                    self.__schedule_units_of_cell(index)
+        self.__update_used()
+
+    # Recomputes the masks of solved values of all units (see on_cell_changed).
+    def __update_used(self):
+        used = [0] * (3 * self.__size)
+        for index, cell in enumerate(self.__cells):
+            mask = cell.get_mask()
+            if CandidateMask.POPCOUNT[mask] == 1:
+                row, column, block = self.__units_of_cell[index]
+                used[row] |= mask
+                used[column] |= mask
+                used[block] |= mask
+        self.__used = used
+
+    # Returns the fingerprint of the state of the board: a 64-bit Zobrist hash of the
+    # possible values of all cells (see ZobristKeys). Boards (of the same size) with
+    # the same possible values have the same fingerprint, and boards with different
+    # possible values almost certainly have different fingerprints. The fingerprint is
+    # computed when asked for, so solving without a transposition table (see
+    # TranspositionTable) does not pay for it.
+    def get_fingerprint(self):
+        return ZobristKeys.fingerprint(self.snapshot())
+
     # Returns whether two boards are equal (all cells have the same possible values)
     def equals(self, other):
-        for y in range(1, 10):
-            for x in range(1, 10):
-                self_pos_vals = self.get_cell(f'x{x}y{y}').get_possible_values()
-                other_pos_vals = other.get_cell(f'x{x}y{y}').get_possible_values()
-                if len(self_pos_vals) != len(other_pos_vals):
-                    return False
-                for i in range(0, len(self_pos_vals)):
-                    if self_pos_vals[i] != other_pos_vals[i]:
-                        return False
+        for index, cell in enumerate(self.__cells):
+            if cell.get_mask() != other.get_cell(index).get_mask():
+                return False
         return True
 
     # Prints a board representation to the console.
     def print(self):
         print(self.to_string())
-
-    # Creates all block units on the board.
-    def __create_block_units(self):
-        y = 1
-        while y < 10:
-            x = 1
-            while x < 10:
-                cell_keys = []
-                for _y in range(y, y + 3):
-                    for _x in range(x, x + 3):
-                        cell_keys.append(f"x{_x}y{_y}")
-                self.__units.append(BlockUnit(self, cell_keys))
-                x += 3
-            y += 3
-
-    # Creates all row units on the board.
-    def __create_row_units(self):
-        for y in range(1, 10):
-            cell_keys = []
-            for x in range(1, 10):
-                cell_keys.append(f"x{x}y{y}")
-            self.__units.append(RowUnit(self, cell_keys))
-
-    # Creates all column units on the board.
-    def __create_column_units(self):
-        for x in range(1, 10):
-            cell_keys = []
-            for y in range(1, 10):
-                cell_keys.append(f"x{x}y{y}")
-            self.__units.append(ColumnUnit(self, cell_keys))
@@ -0,0 +1,63 @@
+# A table of a property of masks (e.g. the number of bits set), computed on first use
+# and then looked up (as fast as in a tuple). The properties of the masks of 9 x 9
+# boards are computed up front; those of larger masks (of larger boards) are cached
+# while the table holds fewer than max_size entries, and computed every time after.
+class MaskTable(dict):
+
+    def __init__(self, function, max_size=1 << 17):
+        super().__init__()
+        self.__function = function
+        self.__max_size = max_size
+
+    def __missing__(self, mask):
+        result = self.__function(mask)
+        if len(self) < self.__max_size:
+            self[mask] = result
+        return result
+
+
+# Helper class for the bitmask representation of the possible values of a cell.
+# Value v (1 to 9, or up to the board size for larger boards) is represented by bit
+# (v - 1), so a cell with all possible values of a 9 x 9 board has mask 0b111111111,
+# and a solved cell has exactly one bit set.
+class CandidateMask(object):
+    # Mask containing all possible values 1 to 9.
+    ALL = 0x1FF
+
+    # The symbols of the values, for boards up to 25 x 25 (value v has symbol
+    # SYMBOLS[v - 1]).
+    SYMBOLS = "123456789ABCDEFGHIJKLMNOP"
+    MAX_SIZE = len(SYMBOLS)
+
+    # Number of bits set (i.e. number of possible values) for every mask.
+    POPCOUNT = MaskTable(int.bit_count)
+
+    # Lowest value in every mask (or 0 for the empty mask).
+    LOWEST_VALUE = MaskTable(lambda mask: (mask & -mask).bit_length())
+
+    # Sorted tuple of the values in every mask.
+    VALUES = MaskTable(lambda mask: tuple(v for v in range(1, mask.bit_length() + 1) if mask & (1 << (v - 1))))
+
+    # Returns the mask representing the single specified value.
+    @staticmethod
+    def of(value):
+        return 1 << (value - 1)
+
+    # Returns the mask representing all the specified values.
+    @staticmethod
+    def of_values(values):
+        mask = 0
+        for value in values:
+            mask |= 1 << (value - 1)
+        return mask
+
+    # Returns the mask containing all possible values of a board of the specified size
+    # (the number of cells along a side).
+    @staticmethod
+    def full(size):
+        return (1 << size) - 1
+
+
+for table in (CandidateMask.POPCOUNT, CandidateMask.LOWEST_VALUE, CandidateMask.VALUES):
+    for mask in range(CandidateMask.ALL + 1):
+        table[mask]
@@ -1,69 +1,101 @@
 from board.board_exception import BoardException
+from board.candidate_mask import CandidateMask
 
 
 class Cell(object):
 
-    def __init__(self):
-        self.__possible_values = []
-        for i in range(1, 10):
-            self.__possible_values.append(i)
+    # The optional listener is notified of every change of the possible values of the
+    # cell, through its method on_cell_changed(index, old_mask), with the specified
+    # cell index and the mask of possible values before the change. The size is the
+    # size of the board (the cell's possible values are 1 to size).
+    def __init__(self, listener=None, index=None, size=9):
+        # The possible values of the cell as a bitmask (see CandidateMask).
+        self.__size = size
+        self.__all = CandidateMask.full(size)
+        self.__mask = self.__all
+        self.__listener = listener
+        self.__index = index
 
     # Validates the cell, e.g. checks the (number of) possible values.
     def validate(self):
-        length = len(self.__possible_values)
-        if length < 1 or length > 9:
+        length = CandidateMask.POPCOUNT[self.__mask & self.__all]
+        if length < 1 or length > self.__size:
             raise BoardException(f"Number of possible values for this cell is incorrect ({length}).")
-        for possible_value in self.__possible_values:
-            if possible_value not in range(1, 10):
-                raise BoardException(f"Value {possible_value} is not a valid value for this cell.")
+        if self.__mask & ~self.__all:
+            raise BoardException(f"Mask {self.__mask:b} contains values that are not valid for this cell.")
 
     # Returns if the specified value is a possible solution for the cell.
     def has_possible_value(self, value):
-        return value in self.__possible_values
+        return 1 <= value <= self.__size and self.__mask & (1 << (value - 1)) != 0
 
     # Returns if the possible values for the cell.
     def get_possible_values(self):
-        return self.__possible_values
+        return list(CandidateMask.VALUES[self.__mask])
+
+    # Returns the possible values for the cell as a bitmask.
+    def get_mask(self):
+        return self.__mask
+
+    # Overwrites the possible values with the specified mask, as previously returned by
+    # get_mask (e.g. to restore a board snapshot). The mask is not validated, and the
+    # listener is not notified.
+    def set_mask(self, mask):
+        self.__mask = mask
+
+    # Removes the values in the specified mask from the possible values (if present).
+    # Returns True if any value was removed, or False otherwise.
+    def remove_mask(self, mask):
+        old_mask = self.__mask
+        remaining = old_mask & ~mask
+        if remaining == old_mask:
+            return False
+        if remaining == 0:
+            raise BoardException("Unexpected program error: attempting to remove a value from a solved cell.")
+        self.__mask = remaining
+        if self.__listener is not None:
+            self.__listener.on_cell_changed(self.__index, old_mask)
+        return True
 
     # Removes the specified value from the list of possible values (if it exists).
     # Returns True on success, or False otherwise.
     def remove_possible_value(self, value):
-        if value in self.__possible_values:
-            if len(self.__possible_values) == 1:
-                raise BoardException("Unexpected program error: attempting to remove a value from a solved cell.")
-            self.__possible_values.remove(value)
-            return True
-        return False
+        if not self.has_possible_value(value):
+            return False
+        return self.remove_mask(CandidateMask.of(value))
 
     # Removes the specified values from the list of possible values (if present).
     # Returns the number of removed values."""
     def remove_possible_values(self, values):
-        removed = 0
-        for value in values:
-            if self.remove_possible_value(value):
-                removed += 1
-        return removed
+        mask = self.__mask & CandidateMask.of_values([v for v in values if 1 <= v <= self.__size])
+        if self.remove_mask(mask):
+            return CandidateMask.POPCOUNT[mask]
+        return 0
 
     # Sets a definitive value for the cell.
     def set_value(self, value):
         int_value = int(value)
-        if int_value < 1 or int_value > 9:
-            raise BoardException("Cell can only contain values in range 1 to 9.")
-        self.__possible_values = [int(value)]
+        if int_value < 1 or int_value > self.__size:
+            raise BoardException(f"Cell can only contain values in range 1 to {self.__size}.")
+        old_mask = self.__mask
+        mask = CandidateMask.of(int_value)
+        if mask != old_mask:
+            self.__mask = mask
+            if self.__listener is not None:
+                self.__listener.on_cell_changed(self.__index, old_mask)
 
     # Determines if the cell is solved, e.g. has a single definitive value.
     def is_solved(self):
-        return len(self.__possible_values) == 1
+        return CandidateMask.POPCOUNT[self.__mask] == 1
 
     # Returns the solution for this cell, or None if the cell is not (yet) solved.
     def get_solution(self):
         if self.is_solved():
-            return self.__possible_values[0]
+            return CandidateMask.LOWEST_VALUE[self.__mask]
         return None
 
     # Returns a string representation of the cell.
     def to_string(self):
         if self.is_solved():
-            return f" {self.__possible_values[0]} "
+            return f" {CandidateMask.SYMBOLS[CandidateMask.LOWEST_VALUE[self.__mask] - 1]} "
         else:
             return " . "
@@ -0,0 +1,30 @@
+from board.board_exception import BoardException
+
+
+# Conversion between the string keys "x{x}y{y}" (x and y in range 1 to 9) and the
+# flat cell indices 0 to 80 (row by row, top left to bottom right) that the board
+# uses internally. The string keys are only kept for backwards compatibility.
+class CellKey(object):
+    # The string key for every cell index.
+    KEYS = tuple(f"x{index % 9 + 1}y{index // 9 + 1}" for index in range(81))
+
+    # The cell index for every string key.
+    INDICES = {key: index for index, key in enumerate(KEYS)}
+
+    # Returns the cell index for the specified key, which is either a string key
+    # or a cell index already. Raises a BoardException for an unknown key.
+    @staticmethod
+    def to_index(key):
+        if isinstance(key, int):
+            if 0 <= key < 81:
+                return key
+        elif key in CellKey.INDICES:
+            return CellKey.INDICES[key]
+        raise BoardException(f"Not a valid cell key: {key}.")
+
+    # Returns whether the specified key is a valid string key or cell index.
+    @staticmethod
+    def is_valid(key):
+        if isinstance(key, int):
+            return 0 <= key < 81
+        return key in CellKey.INDICES
@@ -1,25 +1,33 @@
 from board.abstract_unit import AbstractUnit
 from board.board_exception import BoardException
+from board.cell_key import CellKey
+from solver.hidden_subset_solver import HiddenSubsetSolver
 from solver.single_unit_solver import SingleUnitSolver
 
 
 # Respresents a column of 9 cells on a 9 x 9 sudoku board.
 class ColumnUnit(AbstractUnit):
-    def __init__(self, the_board, cell_keys):
-        super().__init__(the_board, cell_keys)
+    # The solvers for a column unit, from cheap to expensive
+    SOLVER_SEQUENCE = [
+        SingleUnitSolver,
+        HiddenSubsetSolver
+    ]
+
+    def __init__(self, the_board, cell_keys, trusted=False):
+        super().__init__(the_board, cell_keys, trusted)
         # Validate if the keys constitute a valid column
-        ColumnUnit.__validate_column_keys(cell_keys)
+        if not trusted:
+            ColumnUnit.__validate_column_keys(cell_keys)
 
-    # Attempts to solve the row unit. Returns True if any of its cells was
-    # changed, or False otherwise.
-    def solve(self):
-        return SingleUnitSolver.solve(self)
+    # Returns the solvers for the column unit (see SOLVER_SEQUENCE).
+    def get_solvers(self):
+        return ColumnUnit.SOLVER_SEQUENCE
 
     # Validate if the keys constitute a valid column
     @staticmethod
     def __validate_column_keys(cell_keys):
-        x = cell_keys[0][1:2]
+        x = CellKey.to_index(cell_keys[0]) % 9
         for key in cell_keys:
-            if key[1:2] != x:
+            if CellKey.to_index(key) % 9 != x:
                 raise BoardException(f"Not a valid column; cell keys do not align: {cell_keys}.")
 
@@ -0,0 +1,132 @@
+# The static topology of a sudoku board: the cell indices of all units (rows,
+# columns and blocks), the units and peers of every cell, the neighbours of
+# every block and the intersections of blocks with rows and columns.
+# Cell indices are laid out row by row (see CellKey). A topology is built once
+# per box size and shared by all boards; it is immutable (tuples only).
+class Topology(object):
+    # Cache of topologies by box size (see get)
+    __topologies = {}
+
+    def __init__(self, box_size):
+        size = box_size * box_size
+        self.__box_size = box_size
+        self.__size = size
+        self.__rows = tuple(
+            tuple(size * y + x for x in range(size)) for y in range(size)
+        )
+        self.__columns = tuple(
+            tuple(size * y + x for y in range(size)) for x in range(size)
+        )
+        self.__blocks = tuple(
+            tuple(
+                size * (box_size * by + y) + box_size * bx + x
+                for y in range(box_size) for x in range(box_size)
+            )
+            for by in range(box_size) for bx in range(box_size)
+        )
+
+        # For every cell: the index of its row, column and block
+        self.__row_of_cell = tuple(index // size for index in range(size * size))
+        self.__column_of_cell = tuple(index % size for index in range(size * size))
+        self.__block_of_cell = tuple(
+            box_size * (index // size // box_size) + index % size // box_size for index in range(size * size)
+        )
+
+        # All units in a fixed order: rows, columns, blocks. For every cell: the
+        # indices (in that order) of the three units it belongs to.
+        self.__units = self.__rows + self.__columns + self.__blocks
+        self.__units_of_cell = tuple(
+            (self.__row_of_cell[index], size + self.__column_of_cell[index], 2 * size + self.__block_of_cell[index])
+            for index in range(size * size)
+        )
+
+        # For every cell: all other cells sharing a unit with it
+        self.__peers = tuple(
+            tuple(sorted(
+                (set(self.__rows[self.__row_of_cell[index]])
+                 | set(self.__columns[self.__column_of_cell[index]])
+                 | set(self.__blocks[self.__block_of_cell[index]]))
+                - {index}
+            ))
+            for index in range(size * size)
+        )
+
+        # For every block: the blocks to its left/right and above/below it
+        self.__horizontal_neighbours = tuple(
+            tuple(b for b in range(size) if b != block and b // box_size == block // box_size)
+            for block in range(size)
+        )
+        self.__vertical_neighbours = tuple(
+            tuple(b for b in range(size) if b != block and b % box_size == block % box_size)
+            for block in range(size)
+        )
+
+        # For every block: the positions (within the block) of the cells in every
+        # block row, and in every block column.
+        self.__block_row_positions = tuple(
+            tuple(box_size * r + c for c in range(box_size)) for r in range(box_size)
+        )
+        self.__block_column_positions = tuple(
+            tuple(box_size * r + c for r in range(box_size)) for c in range(box_size)
+        )
+
+    # Returns the (shared) topology for boards with the specified box size.
+    @staticmethod
+    def get(box_size=3):
+        topology = Topology.__topologies.get(box_size)
+        if topology is None:
+            topology = Topology(box_size)
+            Topology.__topologies[box_size] = topology
+        return topology
+
+    # Returns the box size (the number of cells along a block side).
+    def get_box_size(self):
+        return self.__box_size
+
+    # Returns the board size (the number of cells along a board side).
+    def get_size(self):
+        return self.__size
+
+    # Returns the cell indices of all rows.
+    def get_rows(self):
+        return self.__rows
+
+    # Returns the cell indices of all columns.
+    def get_columns(self):
+        return self.__columns
+
+    # Returns the cell indices of all blocks, row by row.
+    def get_blocks(self):
+        return self.__blocks
+
+    # Returns the cell indices of all units: rows, columns and blocks (in that order).
+    def get_units(self):
+        return self.__units
+
+    # Returns, for every cell, the indices (see get_units) of its row, column and block.
+    def get_units_of_cell(self):
+        return self.__units_of_cell
+
+    # Returns, for every cell, the block index of the cell.
+    def get_block_of_cell(self):
+        return self.__block_of_cell
+
+    # Returns, for every cell, the indices of all other cells sharing a unit with it.
+    def get_peers(self):
+        return self.__peers
+
+    # Returns, for every block, the indices of the blocks at its left and right.
+    def get_horizontal_neighbours(self):
+        return self.__horizontal_neighbours
+
+    # Returns, for every block, the indices of the blocks above and below it.
+    def get_vertical_neighbours(self):
+        return self.__vertical_neighbours
+
+    # Returns the positions within a block of the cells in each of its rows.
+    def get_block_row_positions(self):
+        return self.__block_row_positions
+
+    # Returns the positions within a block of the cells in each of its columns.
+    def get_block_column_positions(self):
+        return self.__block_column_positions
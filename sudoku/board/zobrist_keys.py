@@ -0,0 +1,57 @@
+import math
+import random
+
+from board.candidate_mask import MaskTable
+
+
+# The Zobrist keys for fingerprinting the state of a board (see Board.get_fingerprint):
+# a random 64-bit key for every possible value of every cell. The key of a cell's mask
+# is the XOR of the keys of its values, and the fingerprint of a board is the XOR of
+# the keys of all its cells' masks. The fingerprint is computed from the masks when
+# it is needed (see fingerprint), so boards pay nothing for it while solving.
+# The keys are generated from a fixed seed, once per board size, and shared by all
+# boards of that size, so fingerprints can be compared between boards (and searches).
+class ZobristKeys(object):
+    # Cache of the keys by board size (see get)
+    __keys = {}
+
+    # Returns the keys for boards of the specified size: for every cell index, a table
+    # (see MaskTable) of the key of every mask.
+    @staticmethod
+    def get(size=9):
+        keys = ZobristKeys.__keys.get(size)
+        if keys is None:
+            keys = tuple(
+                ZobristKeys.__create_table(values)
+                for values in ZobristKeys.__create_value_keys(size)
+            )
+            ZobristKeys.__keys[size] = keys
+        return keys
+
+    # Returns the fingerprint of the specified masks (ordered by cell index), computed
+    # from scratch.
+    @staticmethod
+    def fingerprint(masks):
+        keys = ZobristKeys.get(math.isqrt(len(masks)))
+        fingerprint = 0
+        for index, mask in enumerate(masks):
+            fingerprint ^= keys[index][mask]
+        return fingerprint
+
+    # Returns, for every cell, the keys of the values 1 to size (at positions 0 to
+    # size - 1).
+    @staticmethod
+    def __create_value_keys(size):
+        generator = random.Random(size)
+        return [[generator.getrandbits(64) for _ in range(size)] for _ in range(size * size)]
+
+    # Returns the table of the keys of the masks of a cell, given the keys of its values.
+    @staticmethod
+    def __create_table(values):
+        def key(mask):
+            result = 0
+            for position, value_key in enumerate(values):
+                if mask & (1 << position):
+                    result ^= value_key
+            return result
+        return MaskTable(key, 1 << 10)
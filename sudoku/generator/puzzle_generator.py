@@ -0,0 +1,154 @@
+import random
+
+from board.board import Board
+from board.candidate_mask import CandidateMask
+from board.topology import Topology
+from solver.dancing_links_solver import DancingLinksSolver
+from sudoku_exception import SudokuException
+
+
+# Generates random puzzles with a unique solution. A puzzle is made by solving an
+# empty board with dancing links, with the values tried in a random order, which
+# gives a random complete grid, and then removing clues (in a random order) for as
+# long as the solution stays unique. Without a target number of clues, the result is
+# minimal: removing any other clue (or group of clues, see below) would make the
+# solution ambiguous.
+#
+# A clue can be removed if the puzzle without it has no solution with another value
+# in its cell. For every group of clues to remove, the possible values of the cells
+# are derived once from the remaining clues (the values of the peer clues are
+# removed), and shared by the checks of all cells of the group. A check is trivial
+# if no other value is left in the cell; otherwise an exact cover search (see
+# DancingLinksSolver) looks for one solution with another value in the cell. Most
+# checks near the end fail, i.e. find another solution, and dancing links finds one
+# several times faster than propagating the board and searching.
+#
+# With a symmetry other than SYMMETRY_NONE, clues are removed in groups of cells that
+# map onto each other, so the puzzle has the specified symmetry.
+class PuzzleGenerator(object):
+    # The shared topology of the board
+    TOPOLOGY = Topology.get()
+
+    SYMMETRY_NONE = "none"
+    # Symmetric under rotation by 180 degrees
+    SYMMETRY_ROTATIONAL = "rotational"
+    # Symmetric under reflection in the vertical middle line
+    SYMMETRY_MIRROR = "mirror"
+    # Symmetric under reflection in the main diagonal
+    SYMMETRY_DIAGONAL = "diagonal"
+
+    __SYMMETRIES = {
+        SYMMETRY_NONE: lambda x, y: (x, y),
+        SYMMETRY_ROTATIONAL: lambda x, y: (8 - x, 8 - y),
+        SYMMETRY_MIRROR: lambda x, y: (8 - x, y),
+        SYMMETRY_DIAGONAL: lambda x, y: (y, x)
+    }
+
+    # Creates a generator with the specified symmetry and target number of clues (None
+    # for minimal puzzles), using a random.Random with the specified seed.
+    def __init__(self, symmetry=SYMMETRY_NONE, target_clues=None, seed=None, max_attempts=10):
+        if symmetry not in PuzzleGenerator.__SYMMETRIES:
+            raise SudokuException(f"Unknown symmetry: '{symmetry}'.")
+        self.__random = random.Random(seed)
+        self.__target_clues = target_clues
+        self.__max_attempts = max_attempts
+        self.__board = Board(None)
+        self.__empty = self.__board.snapshot()
+        self.__orbits = PuzzleGenerator.__create_orbits(PuzzleGenerator.__SYMMETRIES[symmetry])
+
+    # Generates a puzzle. Returns a tuple (puzzle, solution) of lines of 81 characters
+    # (see BatchSolver.line_to_rows). If there is a target number of clues, clues are
+    # only removed until the target is reached; if a puzzle cannot be reduced to the
+    # target, new puzzles are generated, up to max_attempts, and the one with the
+    # fewest clues is returned.
+    def generate(self):
+        best = None
+        for attempt in range(self.__max_attempts):
+            solution = self.generate_grid()
+            clues = self.__remove_clues(solution)
+            if best is None or len(clues) < len(best[0]):
+                best = (clues, solution)
+            if self.__target_clues is None or len(clues) <= self.__target_clues:
+                break
+        clues, solution = best
+        puzzle = ''.join([str(value) if index in clues else '.' for index, value in enumerate(solution)])
+        return puzzle, ''.join([str(value) for value in solution])
+
+    # Generates a random complete grid. Returns the values of its cells, ordered by
+    # cell index.
+    def generate_grid(self):
+        board = self.__board
+        board.restore(self.__empty, True)
+        DancingLinksSolver.solve(board, random=self.__random)
+        return [CandidateMask.LOWEST_VALUE[cell.get_mask()] for cell in board.get_cells()]
+
+    # Removes clues from the specified complete grid, for as long as the solution stays
+    # unique, and the target number of clues is not reached. Returns the set of cell
+    # indices of the remaining clues.
+    def __remove_clues(self, solution):
+        clues = set(range(81))
+        orbits = list(self.__orbits)
+        self.__random.shuffle(orbits)
+        for orbit in orbits:
+            if self.__target_clues is not None and len(clues) <= self.__target_clues:
+                break
+            remaining = clues - set(orbit)
+            masks = PuzzleGenerator.__get_masks(solution, remaining)
+            # Any other solution differs from this one in one of the removed cells
+            if not any([self.__has_solution(solution, masks, index) for index in orbit]):
+                clues = remaining
+        return clues
+
+    # Returns the possible values masks of the puzzle with the specified clues (of the
+    # specified solution), ordered by cell index: the value of every clue, and the
+    # values not taken by a peer clue for every other cell.
+    @staticmethod
+    def __get_masks(solution, clues):
+        units_of_cell = PuzzleGenerator.TOPOLOGY.get_units_of_cell()
+        used = [0] * 27
+        for index in clues:
+            row, column, block = units_of_cell[index]
+            mask = CandidateMask.of(solution[index])
+            used[row] |= mask
+            used[column] |= mask
+            used[block] |= mask
+        masks = []
+        for index in range(81):
+            if index in clues:
+                masks.append(CandidateMask.of(solution[index]))
+            else:
+                row, column, block = units_of_cell[index]
+                masks.append(CandidateMask.ALL & ~(used[row] | used[column] | used[block]))
+        return masks
+
+    # Returns whether the puzzle with the specified possible values masks (see
+    # __get_masks) has a solution with another value in the cell with the specified
+    # index.
+    def __has_solution(self, solution, masks, excluded_index):
+        mask = masks[excluded_index] & ~CandidateMask.of(solution[excluded_index])
+        if mask == 0:
+            return False
+        masks = list(masks)
+        masks[excluded_index] = mask
+        # The masks are only loaded onto the board to build the matrix: the board is
+        # not propagated (hence restored as propagated, so nothing is scheduled)
+        board = self.__board
+        board.restore(tuple(masks), True)
+        return next(DancingLinksSolver.create_matrix(board).solutions(), None) is not None
+
+    # Divides the cell indices into groups of cells that map onto each other under
+    # the specified symmetry.
+    @staticmethod
+    def __create_orbits(symmetry):
+        orbits = []
+        seen = set()
+        for index in range(81):
+            if index not in seen:
+                orbit = []
+                x, y = index % 9, index // 9
+                while 9 * y + x not in orbit:
+                    orbit.append(9 * y + x)
+                    x, y = symmetry(x, y)
+                seen.update(orbit)
+                orbits.append(tuple(orbit))
+        return orbits
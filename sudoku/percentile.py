@@ -0,0 +1,11 @@
+import math
+
+
+# Percentiles of measured values, shared by the benchmark and the solver service.
+class Percentile(object):
+
+    # Returns the value at the specified fraction of the sorted values (nearest rank).
+    @staticmethod
+    def of(sorted_values, fraction):
+        rank = max(1, math.ceil(fraction * len(sorted_values)))
+        return sorted_values[min(rank, len(sorted_values)) - 1]
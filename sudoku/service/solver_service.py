@@ -0,0 +1,318 @@
+import asyncio
+import json
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from batch.batch_solver import BatchSolver
+from batch.batch_worker import BatchWorker
+from board.board import Board
+from percentile import Percentile
+
+
+# A local service that solves puzzles for clients connecting over a Unix socket or
+# TCP (see start). The protocol is line based: a client sends puzzles, one line per
+# puzzle (see BatchSolver.line_to_rows), and receives one line per puzzle, in the
+# same order: the solution, or one of the RESPONSE_* constants. The line "stats"
+# is answered with the statistics of the service as JSON (see get_stats).
+# Concurrent puzzles (of one or more clients) are grouped into micro-batches: a batch
+# is closed when it holds max_batch_size puzzles, or max_batch_delay seconds after its
+# first puzzle arrived. When many puzzles are waiting, the batches are made smaller,
+# so that the puzzles are spread over all workers. The batches are solved in a pool of
+# worker processes, which are started (and warmed up) once, when the service starts.
+# The service applies backpressure: at most max_queue_size puzzles wait for a batch,
+# and at most two batches per worker are in progress. When the queue is full, the
+# service stops reading from the clients until there is room again, so the clients
+# are slowed down instead of the service running out of memory.
+class SolverService(object):
+    # The responses to puzzles that are not solved
+    RESPONSE_INVALID = BatchSolver.RESULT_INVALID
+    RESPONSE_UNSOLVED = BatchSolver.RESULT_UNSOLVED
+    RESPONSE_TIMEOUT = BatchSolver.RESULT_TIMEOUT
+    RESPONSE_ERROR = "error"
+    RESPONSES = (RESPONSE_INVALID, RESPONSE_UNSOLVED, RESPONSE_TIMEOUT, RESPONSE_ERROR)
+
+    # The command returning the statistics
+    COMMAND_STATS = "stats"
+
+    # The number of most recent latencies the latency statistics are based on
+    LATENCY_WINDOW = 1000
+
+    def __init__(self, processes=None, engine=Board.ENGINE_PROPAGATION, heuristic=None, timeout=None,
+                 max_batch_size=16, max_batch_delay=0.002, max_queue_size=1024):
+        self.__processes = processes or os.cpu_count() or 1
+        self.__engine = engine
+        self.__heuristic = heuristic
+        self.__timeout = timeout
+        self.__max_batch_size = max_batch_size
+        self.__max_batch_delay = max_batch_delay
+        self.__max_queue_size = max_queue_size
+
+        # Created by start, in the event loop of the service
+        self.__executor = None
+        self.__queue = None
+        self.__batch_slots = None
+        self.__batcher = None
+        self.__server = None
+        self.__batch_tasks = set()
+        self.__closed = False
+
+        # Statistics (see get_stats)
+        self.__counts = {
+            "requests": 0,
+            "solved": 0,
+            SolverService.RESPONSE_INVALID: 0,
+            SolverService.RESPONSE_UNSOLVED: 0,
+            SolverService.RESPONSE_TIMEOUT: 0,
+            SolverService.RESPONSE_ERROR: 0,
+        }
+        self.__batches = 0
+        self.__batched_puzzles = 0
+        self.__in_flight = 0
+        self.__latencies = deque(maxlen=SolverService.LATENCY_WINDOW)
+
+    # Starts the service at the specified address: "HOST:PORT" for TCP (port 0 picks
+    # a free port, see get_address), or the path of a Unix socket. The worker
+    # processes are started and warmed up before the service accepts connections.
+    async def start(self, address):
+        self.__executor = ProcessPoolExecutor(
+            max_workers=self.__processes,
+            initializer=BatchWorker.initialise,
+            initargs=(self.__engine, self.__heuristic, None, self.__timeout)
+        )
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*[
+            loop.run_in_executor(self.__executor, SolverService.warm_up) for _ in range(self.__processes)
+        ])
+
+        self.__queue = asyncio.Queue(self.__max_queue_size)
+        # At most two batches per worker are in progress (see __batch_requests)
+        self.__batch_slots = asyncio.Semaphore(2 * self.__processes)
+        self.__batcher = asyncio.create_task(self.__batch_requests())
+        host, port = SolverService.parse_address(address)
+        if port is None:
+            self.__server = await asyncio.start_unix_server(self.__handle_connection, host)
+        else:
+            self.__server = await asyncio.start_server(self.__handle_connection, host, port)
+        return self
+
+    # Serves until the service is closed (or the task is cancelled).
+    async def serve_forever(self):
+        try:
+            await self.__server.serve_forever()
+        except asyncio.CancelledError:
+            pass
+        finally:
+            await self.close()
+
+    # Stops accepting connections and puzzles, fails the puzzles that are still
+    # waiting (in the queue, or in the batch being built), and shuts down the worker
+    # processes.
+    async def close(self):
+        self.__closed = True
+        if self.__server is not None:
+            self.__server.close()
+            await self.__server.wait_closed()
+            self.__server = None
+        if self.__batcher is not None:
+            self.__batcher.cancel()
+            try:
+                await self.__batcher
+            except asyncio.CancelledError:
+                pass
+            self.__batcher = None
+        self.__fail_queued()
+        if self.__batch_tasks:
+            await asyncio.gather(*self.__batch_tasks, return_exceptions=True)
+        if self.__executor is not None:
+            self.__executor.shutdown()
+            self.__executor = None
+
+    # Returns the number of worker processes.
+    def get_processes(self):
+        return self.__processes
+
+    # Returns the address the service listens on: (host, port) for TCP, or the path
+    # of the Unix socket.
+    def get_address(self):
+        return self.__server.sockets[0].getsockname()
+
+    # Returns the statistics of the service as a dictionary: the number of puzzles
+    # waiting in the queue and being solved, the number of requests per outcome, the
+    # number of batches and their mean size, and the latency percentiles (in ms) of
+    # the most recent requests (see LATENCY_WINDOW), from arrival to response.
+    def get_stats(self):
+        latencies = sorted(self.__latencies)
+        stats = {
+            "queue_depth": self.__queue.qsize() if self.__queue is not None else 0,
+            "max_queue_size": self.__max_queue_size,
+            "in_flight": self.__in_flight,
+            "processes": self.__processes,
+        }
+        stats.update(self.__counts)
+        stats["batches"] = self.__batches
+        stats["mean_batch_size"] = round(self.__batched_puzzles / self.__batches, 2) if self.__batches else 0
+        for name, fraction in (("p50", 0.50), ("p99", 0.99)):
+            stats[f"latency_{name}_ms"] = round(1000 * Percentile.of(latencies, fraction), 3) \
+                if latencies else 0
+        stats["latency_max_ms"] = round(1000 * latencies[-1], 3) if latencies else 0
+        return stats
+
+    # Queues the specified puzzle line to be solved, waiting while the queue is full.
+    # Returns a future of the response (see solve). Once the service is closed, the
+    # response is RESPONSE_ERROR.
+    async def submit(self, line):
+        future = asyncio.get_running_loop().create_future()
+        self.__counts["requests"] += 1
+        if self.__closed:
+            SolverService.__fail([(line, future, time.perf_counter())])
+            return future
+        await self.__queue.put((line, future, time.perf_counter()))
+        if self.__closed:
+            # Closed while waiting for room: nothing is left to take it from the queue
+            self.__fail_queued()
+        return future
+
+    # Solves the specified puzzle line. Returns the solution as a line, or one of the
+    # RESPONSE_* constants if the puzzle was not solved.
+    async def solve(self, line):
+        return await (await self.submit(line))
+
+    # Handles a client connection: reads the requests line by line, and writes the
+    # responses in the same order, as soon as they are available. Reading waits while
+    # the queue is full, or while too many responses of the client are outstanding.
+    async def __handle_connection(self, reader, writer):
+        responses = asyncio.Queue(self.__max_batch_size)
+        writer_task = asyncio.create_task(self.__write_responses(responses, writer))
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                request = line.decode(errors="replace").strip()
+                if not request:
+                    continue
+                if request == SolverService.COMMAND_STATS:
+                    await responses.put(SolverService.COMMAND_STATS)
+                else:
+                    await responses.put(await self.submit(request))
+        except ConnectionError:
+            pass
+        finally:
+            await responses.put(None)
+            await writer_task
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    # Writes the responses of a client connection, in order, until the None sentinel.
+    # The statistics are taken when they are written, i.e. after the responses to
+    # the earlier requests. If the client is gone, the remaining responses are
+    # discarded.
+    async def __write_responses(self, responses, writer):
+        connected = True
+        while True:
+            future = await responses.get()
+            if future is None:
+                return
+            if future == SolverService.COMMAND_STATS:
+                response = json.dumps(self.get_stats())
+            else:
+                response = await future
+            if connected:
+                try:
+                    writer.write((response + "\n").encode())
+                    await writer.drain()
+                except ConnectionError:
+                    connected = False
+
+    # Groups the queued puzzles into batches, and hands them to the worker processes.
+    # When cancelled (see close), the puzzles of the batch being built are failed.
+    async def __batch_requests(self):
+        loop = asyncio.get_running_loop()
+        queue = self.__queue
+        slots = 2 * self.__processes
+        while True:
+            batch = []
+            try:
+                batch.append(await queue.get())
+                deadline = loop.time() + self.__max_batch_delay
+                batch_size = max(1, min(self.__max_batch_size, -(-(queue.qsize() + 1) // slots)))
+                while len(batch) < batch_size:
+                    if queue.empty():
+                        remaining = deadline - loop.time()
+                        if remaining <= 0:
+                            break
+                        try:
+                            batch.append(await asyncio.wait_for(queue.get(), remaining))
+                        except asyncio.TimeoutError:
+                            break
+                    else:
+                        batch.append(queue.get_nowait())
+                await self.__batch_slots.acquire()
+            except asyncio.CancelledError:
+                SolverService.__fail(batch)
+                raise
+            task = asyncio.create_task(self.__solve_batch(batch))
+            self.__batch_tasks.add(task)
+            task.add_done_callback(self.__batch_tasks.discard)
+
+    # Solves the specified batch of (line, future, start time) requests in a worker
+    # process, and sets the responses of the futures.
+    async def __solve_batch(self, batch):
+        self.__batches += 1
+        self.__batched_puzzles += len(batch)
+        self.__in_flight += len(batch)
+        try:
+            lines = [line for line, future, start in batch]
+            try:
+                responses = await asyncio.get_running_loop().run_in_executor(
+                    self.__executor, SolverService.solve_batch, lines)
+            except Exception:
+                responses = [SolverService.RESPONSE_ERROR] * len(batch)
+            now = time.perf_counter()
+            for (line, future, start), response in zip(batch, responses):
+                self.__counts[response if response in SolverService.RESPONSES else "solved"] += 1
+                self.__latencies.append(now - start)
+                if not future.done():
+                    future.set_result(response)
+        finally:
+            self.__in_flight -= len(batch)
+            self.__batch_slots.release()
+
+    # Fails the puzzles that are waiting in the queue.
+    def __fail_queued(self):
+        while self.__queue is not None and not self.__queue.empty():
+            SolverService.__fail([self.__queue.get_nowait()])
+
+    # Sets RESPONSE_ERROR as the response of the specified (line, future, start time)
+    # requests that have no response yet.
+    @staticmethod
+    def __fail(requests):
+        for line, future, start in requests:
+            if not future.done():
+                future.set_result(SolverService.RESPONSE_ERROR)
+
+    # Returns the (host, port) of the specified "HOST:PORT" address, or (path, None)
+    # for the path of a Unix socket.
+    @staticmethod
+    def parse_address(address):
+        host, separator, port = address.rpartition(":")
+        if separator and port.isdigit():
+            return host or "127.0.0.1", int(port)
+        return address, None
+
+    # Warms up a worker process, by solving an empty board (see start).
+    @staticmethod
+    def warm_up():
+        Board(None).solve()
+
+    # Solves the specified batch of puzzle lines in a worker process. Returns the
+    # response for every puzzle: the solution, or one of the RESPONSE_* constants
+    # (see BatchWorker.solve_line_result).
+    @staticmethod
+    def solve_batch(lines):
+        return [BatchWorker.solve_line_result(line) for line in lines]
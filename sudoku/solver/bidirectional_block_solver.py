@@ -1,3 +1,4 @@
+from board.candidate_mask import CandidateMask
 from solver.solver_exception import SolverException
 
 
@@ -16,21 +17,23 @@ class BidirectionalBlockSolver(object):
         # Get block units above and below the current block unit
         vertical_neighbours = unit.get_vertical_neighbours()
 
-        for value in range(1, 10):
+        cells = unit.get_cells()
+        box_size = unit.get_topology().get_box_size()
+        for value in range(1, len(cells) + 1):
             # If the unit contains a solved cell with the current value, continue to the next value.
-            if unit.has_solved_cell_with_value(value):
+            # (Re-evaluated for every value, since solving a cell below changes the solved mask.)
+            if unit.get_solved_mask() & CandidateMask.of(value):
                 continue
 
-            r1_pos = horizontal_neighbours[0].get_distinct_row_containing_possible_val(value)
-            r2_pos = horizontal_neighbours[1].get_distinct_row_containing_possible_val(value)
-            c1_pos = vertical_neighbours[0].get_distinct_column_containing_possible_val(value)
-            c2_pos = vertical_neighbours[1].get_distinct_column_containing_possible_val(value)
+            # The rows (columns) within the neighbours that are the only ones containing
+            # the value
+            rn_pos = [n.get_distinct_row_containing_possible_val(value) for n in horizontal_neighbours]
+            cn_pos = [n.get_distinct_column_containing_possible_val(value) for n in vertical_neighbours]
 
             # Determine the index of the cell we can solve, based on the info above.
-            # Using list comprehension to which position is not in [r1_pos, r2_pos]
-            # (or [c1_pos, c2_pos])
-            r_pos = [x for x in [0, 1, 2] if x not in [r1_pos, r2_pos]]
-            c_pos = [x for x in [0, 1, 2] if x not in [c1_pos, c2_pos]]
+            # Using list comprehension to which position is not in rn_pos (or cn_pos)
+            r_pos = [x for x in range(box_size) if x not in rn_pos]
+            c_pos = [x for x in range(box_size) if x not in cn_pos]
 
             # See if some finetuning is necessary: if we do not have a distinct row (r_pos
             # contains > 1 element) and a distinct col (c_pos contains > 1 element), we might
@@ -48,8 +51,8 @@ class BidirectionalBlockSolver(object):
                 for r in r_pos_copy:
                     all_in_block_row_solved = True
                     for c in c_pos_copy:
-                        idx = 3 * r + c
-                        if not unit.get_cells()[idx].is_solved():
+                        idx = box_size * r + c
+                        if not cells[idx].is_solved():
                             all_in_block_row_solved = False
                     if all_in_block_row_solved:
                         r_pos.remove(r)
@@ -59,8 +62,8 @@ class BidirectionalBlockSolver(object):
                 for c in c_pos_copy:
                     all_in_block_col_solved = True
                     for r in r_pos_copy:
-                        idx = 3 * r + c
-                        if not unit.get_cells()[idx].is_solved():
+                        idx = box_size * r + c
+                        if not cells[idx].is_solved():
                             all_in_block_col_solved = False
                     if all_in_block_col_solved:
                         c_pos.remove(c)
@@ -69,13 +72,16 @@ class BidirectionalBlockSolver(object):
             # solvable cell. If not, continue to the next value.
             if len(r_pos) != 1 or len(c_pos) != 1:
                 continue
-            idx = 3 * r_pos[0] + c_pos[0]
+            idx = box_size * r_pos[0] + c_pos[0]
 
             # Solve the cell on index idx (and raise an error if that cell was previously solved;
-            # this should NEVER be the case).
-            if unit.get_cells()[idx].is_solved():
+            # this should NEVER be the case). If the value is no longer possible in that cell,
+            # the value has no place left in the unit: the board is invalid.
+            if cells[idx].is_solved():
                 raise SolverException("Unexpected program error: attempting to solve a previously solved cell.")
-            unit.get_cells()[idx].set_value(value)
+            if not cells[idx].has_possible_value(value):
+                raise SolverException(f"Value {value} has no place left in the block.")
+            cells[idx].set_value(value)
             updated = True
 
         return updated
@@ -1,30 +1,139 @@
-from solver.solver_exception import SolverException
+from board.zobrist_keys import ZobristKeys
+from solver.degree_heuristic import DegreeHeuristic
 from sudoku_exception import SudokuException
 
 
 class BruteForceBoardSolver(object):
+    # The branching heuristic used when none is specified. A heuristic is a class
+    # with a static method select_branches(board), returning a list of (cell index,
+    # value) tuples, one for every branch to try (see e.g. DegreeHeuristic).
+    DEFAULT_HEURISTIC = DegreeHeuristic
 
-    # Attempts to solve the specified board by brute force. Returns the resulting board.
+    # Attempts to solve the specified propagated board by brute force, branching as
+    # prescribed by the specified heuristic. Every branch tried counts as a search node
+    # on the board (see Board.get_node_count). The board is solved in place; if no
+    # solution is found, it is restored to its initial state. Returns the board.
+    # If a budget (see SolveBudget) is specified, it is checked before every search
+    # node; when it is exhausted, a BudgetExhaustedException is raised, leaving the
+    # board as it was at that node.
+    # If a transposition table is specified, branches reaching a known dead end are
+    # pruned, and the dead ends found are recorded (see TranspositionTable).
+    # The search is a depth-first search without recursion: the stack holds a frame
+    # for every guess on the current path, with the snapshot of the board before the
+    # guess (see Board.snapshot), its fingerprint and the branches still to try. The
+    # depth of the search is therefore not limited by the recursion limit, and memory
+    # use grows by one snapshot per level.
     @staticmethod
-    def solve(board):
+    def solve(board, heuristic=None, budget=None, table=None):
+        if heuristic is None:
+            heuristic = BruteForceBoardSolver.DEFAULT_HEURISTIC
         if board.is_solved():
             return board
+        if table is not None and table.is_dead_end(board.get_fingerprint()):
+            return board
+
+        # The board is initially valid (and propagated)
+        stats = board.get_stats()
+        stack = [BruteForceBoardSolver.__create_frame(board, heuristic, table)]
+        while stack:
+            snapshot, fingerprint, branches = stack[-1]
+            branch = next(branches, None)
+            if branch is None:
+                # All branches failed: the guess leading here was wrong, so we restore
+                # the board from before that guess, and move on to the next one
+                stack.pop()
+                if table is not None:
+                    table.add_dead_end(fingerprint)
+                if stack:
+                    if stats is not None:
+                        stats.count_backtrack()
+                    board.restore(stack[-1][0], True)
+                continue
 
-        # The board is initially valid
-        # We work with a clone so we don't disturb the initial board
-        cloned_board = board.clone()
-        # We're trying every possible value in the first unsolved cell we encounter
-        first_unsolved_cell = cloned_board.get_first_unsolved_cell()
-        wild_guesses = first_unsolved_cell.get_possible_values()[:]
-        for wild_guess in wild_guesses:
-            # Our attempt may invalidate the board (Exception)
-            # In that case, move on to the next 'wild guess'
+            index, wild_guess = branch
+            if budget is not None:
+                budget.check(board.get_node_count())
+            board.count_search_nodes()
+            if stats is not None:
+                stats.count_guess()
+            # Our attempt may invalidate the board (Exception), or lead to a known
+            # dead end. In that case, move on to the next 'wild guess'
             try:
-                first_unsolved_cell.set_value(wild_guess)
-                result = cloned_board.solve()
-                if result.is_solved():
-                    return result
+                board.set_cell_value(index, wild_guess)
+                board.propagate()
             except SudokuException:
+                if stats is not None:
+                    stats.count_backtrack()
+                board.restore(snapshot, True)
                 continue
+            if board.is_solved():
+                return board
+            if table is not None and table.is_dead_end(board.get_fingerprint()):
+                if stats is not None:
+                    stats.count_backtrack()
+                board.restore(snapshot, True)
+                continue
+            stack.append(BruteForceBoardSolver.__create_frame(board, heuristic, table))
 
         return board
+
+    # Counts the solutions of the specified propagated board by brute force, branching
+    # as prescribed by the specified heuristic, but stops as soon as limit solutions
+    # are found (unless limit is None). Every branch tried counts as a search node on
+    # the board. The board is restored to its initial state. Returns the number of
+    # solutions found (at most limit). Like solve, the search uses an explicit stack
+    # instead of recursion, and a transposition table if specified.
+    @staticmethod
+    def count_solutions(board, limit=None, heuristic=None, table=None):
+        if heuristic is None:
+            heuristic = BruteForceBoardSolver.DEFAULT_HEURISTIC
+        if board.is_solved():
+            return 1
+        if table is not None and table.is_dead_end(board.get_fingerprint()):
+            return 0
+
+        # The branches of the heuristics are disjoint, so every solution is found once.
+        # Every frame also holds the number of solutions found before it, to tell
+        # whether it is a dead end.
+        count = 0
+        initial_snapshot = board.snapshot()
+        stack = [BruteForceBoardSolver.__create_frame(board, heuristic, table) + (count,)]
+        while stack and (limit is None or count < limit):
+            snapshot, fingerprint, branches, count_before = stack[-1]
+            branch = next(branches, None)
+            if branch is None:
+                stack.pop()
+                if table is not None and count == count_before:
+                    table.add_dead_end(fingerprint)
+                if stack:
+                    board.restore(stack[-1][0], True)
+                continue
+
+            index, wild_guess = branch
+            board.count_search_nodes()
+            try:
+                board.set_cell_value(index, wild_guess)
+                board.propagate()
+            except SudokuException:
+                board.restore(snapshot, True)
+                continue
+            if board.is_solved():
+                count += 1
+                board.restore(snapshot, True)
+                continue
+            if table is not None and table.is_dead_end(board.get_fingerprint()):
+                board.restore(snapshot, True)
+                continue
+            stack.append(BruteForceBoardSolver.__create_frame(board, heuristic, table) + (count,))
+
+        board.restore(initial_snapshot, True)
+        return count
+
+    # Returns a search frame for the specified (propagated) board: its snapshot, its
+    # fingerprint (only if a transposition table is specified, None otherwise) and an
+    # iterator over the branches to try.
+    @staticmethod
+    def __create_frame(board, heuristic, table):
+        snapshot = board.snapshot()
+        fingerprint = ZobristKeys.fingerprint(snapshot) if table is not None else None
+        return snapshot, fingerprint, iter(heuristic.select_branches(board))
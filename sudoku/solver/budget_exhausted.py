@@ -0,0 +1,25 @@
+# The result of a solve that was interrupted because its budget was exhausted (see
+# Board.solve and SolveBudget), instead of the solved board.
+class BudgetExhausted(object):
+
+    def __init__(self, board, reason, node_count):
+        self.__board = board
+        self.__reason = reason
+        self.__node_count = node_count
+
+    # Returns the board, as far as it was solved by propagation (without guesses).
+    def get_board(self):
+        return self.__board
+
+    # Returns the reason why the budget was exhausted (one of the SolveBudget.REASON_*
+    # constants).
+    def get_reason(self):
+        return self.__reason
+
+    # Returns the number of search nodes tried before the budget was exhausted.
+    def get_node_count(self):
+        return self.__node_count
+
+    # Returns False: the board was not solved within the budget.
+    def is_solved(self):
+        return False
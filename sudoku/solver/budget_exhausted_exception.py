@@ -0,0 +1,12 @@
+# Raised by a SolveBudget to interrupt the search when the budget is exhausted. This
+# is deliberately not a SudokuException: the brute force board solver treats those
+# as dead ends of a branch, whereas this one must end the whole search.
+class BudgetExhaustedException(Exception):
+
+    def __init__(self, reason):
+        super().__init__(f"Solve budget exhausted: {reason}.")
+        self.__reason = reason
+
+    # Returns the reason why the budget was exhausted (see SolveBudget).
+    def get_reason(self):
+        return self.__reason
@@ -0,0 +1,15 @@
+# A token for cancelling a solve from outside (e.g. from another thread, or from a
+# service that lost its client): the solver checks the token at every search node
+# (see SolveBudget), and stops as soon as it is cancelled.
+class CancelToken(object):
+
+    def __init__(self):
+        self.__cancelled = False
+
+    # Cancels the solves using this token.
+    def cancel(self):
+        self.__cancelled = True
+
+    # Returns whether the token has been cancelled.
+    def is_cancelled(self):
+        return self.__cancelled
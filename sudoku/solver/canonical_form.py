@@ -0,0 +1,146 @@
+from itertools import permutations, product
+
+
+# The canonical form of a 9 x 9 puzzle (given as a line of 81 characters, with '.'
+# for an empty cell) under the symmetry group of sudoku: relabelling of the digits,
+# transposition, permutation of the bands (and stacks), and permutation of the rows
+# (and columns) within a band (stack). Equivalent puzzles have the same canonical
+# form, and a solution of the canonical form can be transformed back into a solution
+# of the puzzle (see to_original).
+#
+# The canonical form is the lexicographically smallest line, with the digits
+# relabelled in order of appearance, over a subset of the transformations that is
+# itself defined by the symmetries: bands are ordered by an invariant signature
+# (derived from the numbers of clues in rows and columns), rows within a band by
+# their signatures, and likewise for stacks and columns. Only rows, columns, bands
+# and stacks with equal signatures are tried in all orders. If that still leaves
+# more than MAX_TRANSFORMATIONS transformations (for very symmetrical puzzles, like
+# the empty board), no canonical form is determined.
+class CanonicalForm(object):
+    MAX_TRANSFORMATIONS = 2000
+
+    # Returns the canonical form of the specified puzzle line as a tuple (canonical
+    # line, transformation), or None if there are too many transformations to try,
+    # or if the line is not a 9 x 9 puzzle. The transformation is needed to transform
+    # solutions (see to_canonical and to_original).
+    @staticmethod
+    def of(line):
+        if len(line) != 81:
+            return None
+        orientations = []
+        count = 0
+        for transposed in (False, True):
+            grid = line if not transposed else ''.join([line[9 * c + r] for r in range(9) for c in range(9)])
+            row_orders = CanonicalForm.__line_orders(grid, False)
+            column_orders = CanonicalForm.__line_orders(grid, True)
+            count += len(row_orders) * len(column_orders)
+            if count > CanonicalForm.MAX_TRANSFORMATIONS:
+                return None
+            orientations.append((transposed, row_orders, column_orders))
+
+        best_line = None
+        best_positions = None
+        for transposed, row_orders, column_orders in orientations:
+            for rows in row_orders:
+                for columns in column_orders:
+                    if transposed:
+                        positions = [9 * c + r for r in rows for c in columns]
+                    else:
+                        positions = [9 * r + c for r in rows for c in columns]
+                    relabelled = CanonicalForm.__relabel(line, positions)
+                    if best_line is None or relabelled < best_line:
+                        best_line = relabelled
+                        best_positions = positions
+
+        # The digits, mapped to their canonical labels in order of appearance; absent
+        # digits get the remaining labels.
+        labels = {}
+        for position in best_positions:
+            digit = line[position]
+            if digit != '.' and digit not in labels:
+                labels[digit] = str(len(labels) + 1)
+        for digit in "123456789":
+            if digit not in labels:
+                labels[digit] = str(len(labels) + 1)
+        return best_line, (tuple(best_positions), labels)
+
+    # Transforms the specified solution (a line of 81 digits) of a puzzle into the
+    # solution of its canonical form, using the transformation returned by of.
+    @staticmethod
+    def to_canonical(solution, transformation):
+        positions, labels = transformation
+        return ''.join([labels[solution[position]] for position in positions])
+
+    # Transforms the specified solution of the canonical form of a puzzle into the
+    # solution of the puzzle itself, using the transformation returned by of.
+    @staticmethod
+    def to_original(canonical_solution, transformation):
+        positions, labels = transformation
+        digits = {label: digit for digit, label in labels.items()}
+        solution = [''] * 81
+        for i, position in enumerate(positions):
+            solution[position] = digits[canonical_solution[i]]
+        return ''.join(solution)
+
+    # Returns the line with the specified positions (in that order), relabelling the
+    # digits in order of appearance.
+    @staticmethod
+    def __relabel(line, positions):
+        labels = {'.': '.'}
+        relabelled = []
+        for position in positions:
+            digit = line[position]
+            label = labels.get(digit)
+            if label is None:
+                label = str(len(labels))
+                labels[digit] = label
+            relabelled.append(label)
+        return ''.join(relabelled)
+
+    # Returns all admissible orders of the rows (or columns, if columns is True) of
+    # the specified grid line, as tuples of 9 row (column) indices. Bands (stacks)
+    # are sorted by their signatures, and so are the rows (columns) within a band
+    # (stack); elements with equal signatures are tried in all orders.
+    @staticmethod
+    def __line_orders(grid, columns):
+        if columns:
+            lines = [[9 * r + c for r in range(9)] for c in range(9)]
+            crossing = [[9 * r + c for c in range(9)] for r in range(9)]
+        else:
+            lines = [[9 * r + c for c in range(9)] for r in range(9)]
+            crossing = [[9 * r + c for r in range(9)] for c in range(9)]
+        crossing_counts = [sum([grid[i] != '.' for i in cells]) for cells in crossing]
+
+        # The signature of a line: its number of clues, and the (sorted) numbers of
+        # clues in the crossing lines through its clues
+        signatures = []
+        for cells in lines:
+            filled = [k for k, i in enumerate(cells) if grid[i] != '.']
+            signatures.append((len(filled), tuple(sorted([crossing_counts[k] for k in filled]))))
+
+        # Within every band: the admissible orders of its lines
+        band_orders = []
+        band_signatures = []
+        for band in range(3):
+            members = [3 * band + k for k in range(3)]
+            band_orders.append(CanonicalForm.__tied_orders(members, signatures))
+            band_signatures.append(tuple(sorted([signatures[m] for m in members])))
+
+        orders = []
+        for bands in CanonicalForm.__tied_orders([0, 1, 2], band_signatures):
+            for lines_in_bands in product(*[band_orders[band] for band in bands]):
+                orders.append(sum(lines_in_bands, ()))
+        return orders
+
+    # Returns all orders of the specified members, sorted by their signatures, where
+    # members with equal signatures are permuted in all possible ways.
+    @staticmethod
+    def __tied_orders(members, signatures):
+        ordered = sorted(members, key=lambda m: signatures[m])
+        groups = []
+        for member in ordered:
+            if groups and signatures[groups[-1][0]] == signatures[member]:
+                groups[-1].append(member)
+            else:
+                groups.append([member])
+        return [sum(combination, ()) for combination in product(*[list(permutations(g)) for g in groups])]
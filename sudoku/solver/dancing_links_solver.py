@@ -0,0 +1,59 @@
+from board.candidate_mask import CandidateMask
+from solver.exact_cover_matrix import ExactCoverMatrix
+
+
+class DancingLinksSolver(object):
+    # Attempts to solve the specified board by encoding it as an exact cover problem
+    # and solving that with dancing links (see ExactCoverMatrix). For a 9 x 9 board,
+    # the matrix has 324 columns (every cell has one value, and every row, column and
+    # block has every value once) and a row for every possible value of every cell (up
+    # to 729); for a board of size n, that is 4 * n * n columns and up to n ** 3 rows.
+    # The search nodes are counted on the board (see Board.get_node_count).
+    # The board is solved in place; if no solution exists, it is left unchanged.
+    # Returns the board. If a budget (see SolveBudget) is specified and exhausted, a
+    # BudgetExhaustedException is raised, leaving the board unchanged. If a
+    # random.Random is specified, a random solution is found (see create_matrix).
+    @staticmethod
+    def solve(board, budget=None, random=None):
+        if board.is_solved():
+            return board
+
+        size = board.get_size()
+        matrix = DancingLinksSolver.create_matrix(board, random)
+        try:
+            solution = next(matrix.solutions(budget), None)
+        finally:
+            board.count_search_nodes(matrix.get_node_count())
+        if solution is not None:
+            for row_id in solution:
+                board.get_cell(row_id // size).set_value(row_id % size + 1)
+        return board
+
+    # Returns the exact cover matrix for the specified board. The row id of the
+    # candidate value v for the cell with index i is size * i + (v - 1) (9 * i + (v - 1)
+    # for a 9 x 9 board). If a random.Random is specified, the rows are added in a
+    # random order, so the values of a cell are tried in a random order.
+    @staticmethod
+    def create_matrix(board, random=None):
+        size = board.get_size()
+        cell_count = size * size
+        units_of_cell = board.get_topology().get_units_of_cell()
+        rows = []
+        for index, cell in enumerate(board.get_cells()):
+            row, column, block = units_of_cell[index]
+            block -= 2 * size
+            column -= size
+            for value in CandidateMask.VALUES[cell.get_mask()]:
+                v = value - 1
+                rows.append((size * index + v, (
+                    index,
+                    cell_count + size * row + v,
+                    2 * cell_count + size * column + v,
+                    3 * cell_count + size * block + v
+                )))
+        if random is not None:
+            random.shuffle(rows)
+        matrix = ExactCoverMatrix(4 * cell_count)
+        for row_id, columns in rows:
+            matrix.add_row(row_id, columns)
+        return matrix
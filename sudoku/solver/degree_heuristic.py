@@ -0,0 +1,31 @@
+from board.candidate_mask import CandidateMask
+
+
+class DegreeHeuristic(object):
+
+    # Returns the branches for the brute force board solver as a list of (cell index,
+    # value) tuples: every possible value of the unsolved cell with the fewest possible
+    # values. Ties are broken by the degree of the cells, i.e. the number of unsolved
+    # peers, preferring the most constraining cell. Returns an empty list if all cells
+    # are solved.
+    @staticmethod
+    def select_branches(board):
+        cells = board.get_cells()
+        counts = [CandidateMask.POPCOUNT[cell.get_mask()] for cell in cells]
+        best_count = min([count for count in counts if count > 1], default=None)
+        if best_count is None:
+            return []
+        peers = board.get_topology().get_peers()
+        best_index = None
+        best_degree = -1
+        for index, count in enumerate(counts):
+            if count == best_count:
+                degree = 0
+                for peer in peers[index]:
+                    if counts[peer] > 1:
+                        degree += 1
+                if degree > best_degree:
+                    best_index = index
+                    best_degree = degree
+        mask = cells[best_index].get_mask()
+        return [(best_index, value) for value in CandidateMask.VALUES[mask]]
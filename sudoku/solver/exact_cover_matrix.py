@@ -0,0 +1,137 @@
+# A sparse 0/1 matrix for solving exact cover problems with Knuth's Algorithm X,
+# implemented with dancing links: every 1 in the matrix is a node, linked to its
+# neighbours in the same row (left/right) and the same column (up/down), and
+# covering/uncovering a column only relinks nodes. The links are kept in flat
+# integer lists (node 0 is the root, nodes 1 to n the column headers).
+class ExactCoverMatrix(object):
+
+    def __init__(self, column_count):
+        nodes = column_count + 1
+        self.__left = [i - 1 for i in range(nodes)]
+        self.__left[0] = column_count
+        self.__right = [i + 1 for i in range(nodes)]
+        self.__right[column_count] = 0
+        self.__up = list(range(nodes))
+        self.__down = list(range(nodes))
+        self.__column = list(range(nodes))
+        self.__row = [None] * nodes
+        self.__size = [0] * nodes
+        self.__column_count = column_count
+        self.__node_count = 0
+
+    # Adds a row, identified by the specified row id, that has a 1 in each of the
+    # specified columns (0 to column_count - 1).
+    def add_row(self, row_id, columns):
+        first = None
+        for column in columns:
+            header = column + 1
+            node = len(self.__column)
+            self.__column.append(header)
+            self.__row.append(row_id)
+            # Link the node at the bottom of the column
+            self.__up.append(self.__up[header])
+            self.__down.append(header)
+            self.__down[self.__up[header]] = node
+            self.__up[header] = node
+            self.__size[header] += 1
+            # Link the node at the end of the row
+            if first is None:
+                first = node
+                self.__left.append(node)
+                self.__right.append(node)
+            else:
+                self.__left.append(self.__left[first])
+                self.__right.append(first)
+                self.__right[self.__left[first]] = node
+                self.__left[first] = node
+
+    # Returns the number of search nodes (rows tried) so far.
+    def get_node_count(self):
+        return self.__node_count
+
+    # Generates the exact covers of the matrix, each as a list of row ids. The
+    # search always branches on the column with the fewest remaining rows. Stop
+    # iterating to end the search early (the matrix cannot be searched again then).
+    # If a budget (see SolveBudget) is specified, it is checked before every search
+    # node (raising a BudgetExhaustedException when it is exhausted).
+    def solutions(self, budget=None):
+        return self.__search([], budget)
+
+    def __search(self, partial, budget):
+        right = self.__right
+        left = self.__left
+        down = self.__down
+        size = self.__size
+        if right[0] == 0:
+            yield list(partial)
+            return
+
+        # Choose the column with the fewest rows
+        best = right[0]
+        column = right[best]
+        while column != 0:
+            if size[column] < size[best]:
+                best = column
+            column = right[column]
+        if size[best] == 0:
+            return
+
+        self.__cover(best)
+        row_node = down[best]
+        while row_node != best:
+            if budget is not None:
+                budget.check(self.__node_count)
+            self.__node_count += 1
+            partial.append(self.__row[row_node])
+            node = right[row_node]
+            while node != row_node:
+                self.__cover(self.__column[node])
+                node = right[node]
+            yield from self.__search(partial, budget)
+            node = left[row_node]
+            while node != row_node:
+                self.__uncover(self.__column[node])
+                node = left[node]
+            partial.pop()
+            row_node = down[row_node]
+        self.__uncover(best)
+
+    # Removes the column and all rows having a 1 in it from the matrix.
+    def __cover(self, header):
+        left = self.__left
+        right = self.__right
+        up = self.__up
+        down = self.__down
+        column = self.__column
+        size = self.__size
+        right[left[header]] = right[header]
+        left[right[header]] = left[header]
+        row_node = down[header]
+        while row_node != header:
+            node = right[row_node]
+            while node != row_node:
+                down[up[node]] = down[node]
+                up[down[node]] = up[node]
+                size[column[node]] -= 1
+                node = right[node]
+            row_node = down[row_node]
+
+    # Reverts __cover (columns must be uncovered in reverse order of covering).
+    def __uncover(self, header):
+        left = self.__left
+        right = self.__right
+        up = self.__up
+        down = self.__down
+        column = self.__column
+        size = self.__size
+        row_node = up[header]
+        while row_node != header:
+            node = left[row_node]
+            while node != row_node:
+                size[column[node]] += 1
+                down[up[node]] = node
+                up[down[node]] = node
+                node = left[node]
+            row_node = up[row_node]
+        right[left[header]] = header
+        left[right[header]] = header
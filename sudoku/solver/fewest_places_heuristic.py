@@ -0,0 +1,35 @@
+from board.candidate_mask import CandidateMask
+from solver.minimum_remaining_values_heuristic import MinimumRemainingValuesHeuristic
+
+
+class FewestPlacesHeuristic(object):
+
+    # Returns the branches for the brute force board solver as a list of (cell index,
+    # value) tuples. Besides branching on the possible values of the unsolved cell with
+    # the fewest possible values (see MinimumRemainingValuesHeuristic), this heuristic
+    # considers branching on the places for a value within a unit: if a unit has an
+    # unsolved value that fits in fewer cells than the best cell has possible values,
+    # the branches put that value in each of those cells instead. Returns an empty list
+    # if all cells are solved.
+    @staticmethod
+    def select_branches(board):
+        branches = MinimumRemainingValuesHeuristic.select_branches(board)
+        if len(branches) <= 2:
+            return branches
+
+        cells = board.get_cells()
+        masks = [cell.get_mask() for cell in cells]
+        all_mask = CandidateMask.full(board.get_size())
+        for unit in board.get_topology().get_units():
+            solved_mask = 0
+            for index in unit:
+                if CandidateMask.POPCOUNT[masks[index]] == 1:
+                    solved_mask |= masks[index]
+            for value in CandidateMask.VALUES[all_mask & ~solved_mask]:
+                bit = CandidateMask.of(value)
+                places = [index for index in unit if masks[index] & bit]
+                if len(places) < len(branches):
+                    branches = [(index, value) for index in places]
+                    if len(branches) <= 2:
+                        return branches
+        return branches
@@ -0,0 +1,15 @@
+from board.candidate_mask import CandidateMask
+
+
+class FirstUnsolvedCellHeuristic(object):
+
+    # Returns the branches for the brute force board solver as a list of (cell index,
+    # value) tuples: every possible value of the first unsolved cell on the board.
+    # Returns an empty list if all cells are solved.
+    @staticmethod
+    def select_branches(board):
+        for index, cell in enumerate(board.get_cells()):
+            mask = cell.get_mask()
+            if CandidateMask.POPCOUNT[mask] > 1:
+                return [(index, value) for value in CandidateMask.VALUES[mask]]
+        return []
@@ -0,0 +1,67 @@
+from board.candidate_mask import CandidateMask
+from solver.solver_exception import SolverException
+
+
+class HiddenSubsetSolver(object):
+
+    # Attempts to solve the specified unit internally, by finding hidden subsets: n
+    # values that, within the unit, only fit in the same n cells. Those cells cannot
+    # contain any other value, so the other values are removed from them. The
+    # simplest case is the hidden single: a value that fits in only one cell. Subsets
+    # of up to half the unsolved values are looked for: a hidden subset of more values
+    # is a naked subset of the other cells (see SingleUnitSolver), which has the same
+    # eliminations.
+    # Returns True if any cell was changed, or False otherwise.
+    @staticmethod
+    def solve(unit):
+        cells = unit.get_cells()
+
+        # For every unsolved value: the positions of the cells it fits in, as a mask
+        unsolved_mask = CandidateMask.full(len(cells)) & ~unit.get_solved_mask()
+        places = {}
+        for position, cell in enumerate(cells):
+            mask = cell.get_mask()
+            if CandidateMask.POPCOUNT[mask] > 1:
+                for value in CandidateMask.VALUES[mask & unsolved_mask]:
+                    places[value] = places.get(value, 0) | (1 << position)
+        if len(places) != CandidateMask.POPCOUNT[unsolved_mask]:
+            missing = CandidateMask.VALUES[unsolved_mask & ~CandidateMask.of_values(places)]
+            raise SolverException(f"Value {missing[0]} does not fit in any cell of the unit.")
+
+        updated = False
+        values = sorted(places, key=lambda v: CandidateMask.POPCOUNT[places[v]])
+        max_size = len(values) // 2
+        for subset, subset_places in HiddenSubsetSolver.__find_subsets(values, places, max_size):
+            subset_mask = CandidateMask.of_values(subset)
+            for position, cell in enumerate(cells):
+                if subset_places & (1 << position):
+                    updated = cell.remove_mask(cell.get_mask() & ~subset_mask) or updated
+        return updated
+
+    # Returns the hidden subsets of at most max_size of the specified values, as a list
+    # of (values, places) tuples.
+    @staticmethod
+    def __find_subsets(values, places, max_size):
+        subsets = []
+        HiddenSubsetSolver.__extend(values, places, max_size, 0, [], 0, subsets)
+        return subsets
+
+    # Extends the specified subset of values, with the specified union of places, by
+    # the values from start onwards, adding every hidden subset found to subsets.
+    # Values are added one by one, as long as the union of their places still has room
+    # for the values yet to be added.
+    @staticmethod
+    def __extend(values, places, max_size, start, subset, subset_places, subsets):
+        for i in range(start, len(values)):
+            value = values[i]
+            union = subset_places | places[value]
+            count = CandidateMask.POPCOUNT[union]
+            if count > max_size:
+                continue
+            extended = subset + [value]
+            if count < len(extended):
+                raise SolverException(f"Values {extended} do not fit in the cells of the unit.")
+            if count == len(extended):
+                subsets.append((extended, union))
+            elif len(extended) < max_size:
+                HiddenSubsetSolver.__extend(values, places, max_size, i + 1, extended, union, subsets)
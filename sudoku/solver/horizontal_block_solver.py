@@ -1,3 +1,6 @@
+from board.candidate_mask import CandidateMask
+
+
 class HorizontalBlockSolver(object):
 
     # Attempts to solve the specified unit by comparing it to its horizontal neighbour
@@ -11,18 +14,16 @@ class HorizontalBlockSolver(object):
         # Get block units left and right from teh current block unit
         horizontal_neighbours = unit.get_horizontal_neighbours()
 
-        for value in range(1, 10):
-            # If the unit contains a solved cell with the current value, continue to the next value.
-            if unit.has_solved_cell_with_value(value):
-                continue
-
-            for n in range(0, 2):
-                rn_pos = horizontal_neighbours[n].get_distinct_row_containing_possible_val(value)
+        cells = unit.get_cells()
+        row_positions = unit.get_topology().get_block_row_positions()
+        # Only the values that are not solved within the unit
+        unsolved_mask = CandidateMask.full(len(cells)) & ~unit.get_solved_mask()
+        for value in CandidateMask.VALUES[unsolved_mask]:
+            bit = CandidateMask.of(value)
+            for neighbour in horizontal_neighbours:
+                rn_pos = neighbour.get_distinct_row_containing_possible_val(value)
                 if rn_pos is not None:
-                    for i in range(rn_pos * 3, rn_pos * 3 + 3):
-                        cell = unit.get_cells()[i]
-                        if cell.has_possible_value(value):
-                            cell.remove_possible_value(value)
-                            updated = True
+                    for i in row_positions[rn_pos]:
+                        updated = cells[i].remove_mask(bit) or updated
 
         return updated
@@ -0,0 +1,23 @@
+from board.candidate_mask import CandidateMask
+
+
+class MinimumRemainingValuesHeuristic(object):
+
+    # Returns the branches for the brute force board solver as a list of (cell index,
+    # value) tuples: every possible value of the (first) unsolved cell with the fewest
+    # possible values. Returns an empty list if all cells are solved.
+    @staticmethod
+    def select_branches(board):
+        best_index = None
+        best_count = board.get_size() + 1
+        for index, cell in enumerate(board.get_cells()):
+            count = CandidateMask.POPCOUNT[cell.get_mask()]
+            if 1 < count < best_count:
+                best_index = index
+                best_count = count
+                if count == 2:
+                    break
+        if best_index is None:
+            return []
+        mask = board.get_cell(best_index).get_mask()
+        return [(best_index, value) for value in CandidateMask.VALUES[mask]]
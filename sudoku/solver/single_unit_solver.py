@@ -1,39 +1,72 @@
-from collections import defaultdict
+from board.candidate_mask import CandidateMask
+from solver.solver_exception import SolverException
 
 
 class SingleUnitSolver(object):
 
-    # Attempts to solve the specified unit internally.
+    # Attempts to solve the specified unit internally, by finding naked subsets: n
+    # cells that, together, only have n possible values. Those values must go in
+    # these cells, so they are removed from the other cells of the unit. The simplest
+    # case is the naked single: a solved cell. The cells of a subset need not have
+    # the same possible values, e.g. the cells {1, 2}, {2, 3} and {1, 3} form a naked
+    # triple. Subsets of up to half the unsolved cells are looked for: a naked subset
+    # of more cells is a hidden subset of the other values in the other cells (see
+    # HiddenSubsetSolver), which has the same eliminations.
     # Returns True if any cell was changed, or False otherwise.
     @staticmethod
     def solve(unit):
         updated = False
-        for n in range(1, 9):
-            # Gather cells with n possible values, and store them in a
-            # 2D-dictionary. The outer key of the dictionary is based
-            # on the combination of the (n) possible values, and the
-            # inner key is the cell key on the board.
-            outer_dict = defaultdict(dict)
-            for key in unit.get_cell_keys():
-                cell = unit.get_cell(key)
-                values = cell.get_possible_values()
-                if len(values) == n:
-                    outer_key = ''.join([str(v) for v in values])
-                    outer_dict[outer_key][key] = cell
+        cells = unit.get_cells()
 
-            # Now, we have the cells with n possible values grouped
-            # together. If there are exactly n cells with the exact
-            # same combination of possible values, we can be sure that
-            # no other cell in the unit will have either of these values
-            # as a solution. We can therefore remove them from those
-            # other cells' possible values.
-            for inner_dict in outer_dict.values():
-                if len(inner_dict.values()) == n:
-                    for cell_key in unit.get_cell_keys():
-                        if cell_key not in inner_dict.keys():
-                            for cell_with_removable_values in inner_dict.values():
-                                size_before = len(unit.get_cell(cell_key).get_possible_values())
-                                unit.get_cell(cell_key).remove_possible_values(cell_with_removable_values.get_possible_values())
-                                size_after = len(unit.get_cell(cell_key).get_possible_values())
-                                updated = updated or (size_before > size_after)
+        # The values of the solved cells are removed from the other cells
+        solved_mask = 0
+        unsolved = []
+        for cell in cells:
+            mask = cell.get_mask()
+            if CandidateMask.POPCOUNT[mask] == 1:
+                solved_mask |= mask
+            else:
+                unsolved.append(cell)
+        if solved_mask:
+            for cell in unsolved:
+                updated = cell.remove_mask(solved_mask) or updated
+            unsolved = [cell for cell in unsolved if not cell.is_solved()]
+
+        # The cells with the fewest possible values are tried first, and the values of
+        # every subset found are removed from the cells outside it
+        unsolved.sort(key=lambda c: CandidateMask.POPCOUNT[c.get_mask()])
+        masks = [cell.get_mask() for cell in unsolved]
+        max_size = len(masks) // 2
+        for subset_mask, subset_cells in SingleUnitSolver.__find_subsets(masks, max_size):
+            for i, cell in enumerate(unsolved):
+                if not subset_cells & (1 << i):
+                    updated = cell.remove_mask(subset_mask) or updated
         return updated
+
+    # Returns the naked subsets of at most max_size of the specified masks, as a list
+    # of (values mask, cells) tuples, where cells is a mask of the positions of the
+    # masks in the subset.
+    @staticmethod
+    def __find_subsets(masks, max_size):
+        subsets = []
+        SingleUnitSolver.__extend(masks, max_size, 0, 0, 0, 0, subsets)
+        return subsets
+
+    # Extends the subset of size masks, with the specified union of values and the
+    # specified cells, by the masks from start onwards, adding every naked subset found
+    # to subsets. Masks are added one by one, as long as their union still has room
+    # for the masks yet to be added.
+    @staticmethod
+    def __extend(masks, max_size, start, size, subset_mask, subset_cells, subsets):
+        for i in range(start, len(masks)):
+            union = subset_mask | masks[i]
+            count = CandidateMask.POPCOUNT[union]
+            if count > max_size:
+                continue
+            cells = subset_cells | (1 << i)
+            if count < size + 1:
+                raise SolverException(f"{size + 1} cells of the unit share only {count} possible values.")
+            if count == size + 1:
+                subsets.append((union, cells))
+            elif size + 1 < max_size:
+                SingleUnitSolver.__extend(masks, max_size, i + 1, size + 1, union, cells, subsets)
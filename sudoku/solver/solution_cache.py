@@ -0,0 +1,66 @@
+from collections import OrderedDict
+
+from board.board import Board
+from board.candidate_mask import CandidateMask
+from solver.canonical_form import CanonicalForm
+
+
+# A cache of solutions, in front of Board.solve. Puzzles are stored in their
+# canonical form (see CanonicalForm), so a puzzle that is equivalent to an earlier
+# one (i.e. has relabelled digits, is transposed, or has permuted bands, stacks,
+# rows or columns) is a hit: the cached solution is transformed back to the
+# puzzle. At most max_size solutions are kept; when the cache is full, the least
+# recently used one is evicted. Only solved puzzles are cached.
+class SolutionCache(object):
+
+    def __init__(self, max_size=10000):
+        self.__max_size = max_size
+        self.__solutions = OrderedDict()
+        self.__hits = 0
+        self.__misses = 0
+
+    # Solves the specified board, like Board.solve, unless the solution of an
+    # equivalent puzzle is in the cache. Returns the (solved) board, or a
+    # BudgetExhausted if the timeout (in seconds, see Board.solve) expired.
+    def solve(self, board, heuristic=None, engine=Board.ENGINE_PROPAGATION, timeout=None):
+        canonical_form = CanonicalForm.of(board.to_line())
+        if canonical_form is None:
+            # Too symmetrical to determine the canonical form: solve without the cache
+            self.__misses += 1
+            return board.solve(heuristic, engine, timeout=timeout)
+
+        canonical_line, transformation = canonical_form
+        canonical_solution = self.__solutions.get(canonical_line)
+        if canonical_solution is not None:
+            self.__hits += 1
+            self.__solutions.move_to_end(canonical_line)
+            solution = CanonicalForm.to_original(canonical_solution, transformation)
+            board.restore(tuple([CandidateMask.of(int(digit)) for digit in solution]), True)
+            return board
+
+        self.__misses += 1
+        result = board.solve(heuristic, engine, timeout=timeout)
+        if board.is_solved():
+            self.__solutions[canonical_line] = CanonicalForm.to_canonical(board.to_line(), transformation)
+            if len(self.__solutions) > self.__max_size:
+                self.__solutions.popitem(last=False)
+        return result
+
+    def get_max_size(self):
+        return self.__max_size
+
+    # Returns the number of solutions in the cache.
+    def get_size(self):
+        return len(self.__solutions)
+
+    def get_hits(self):
+        return self.__hits
+
+    def get_misses(self):
+        return self.__misses
+
+    # Removes all solutions from the cache, and resets the counters.
+    def clear(self):
+        self.__solutions.clear()
+        self.__hits = 0
+        self.__misses = 0
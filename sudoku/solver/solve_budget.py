@@ -0,0 +1,31 @@
+import time
+
+from solver.budget_exhausted_exception import BudgetExhaustedException
+
+
+# The budget of a solve (see Board.solve): a timeout in seconds, a maximum number of
+# search nodes and a cancel token (see CancelToken), each of which is optional. The
+# solvers check the budget at every search node; checking is cheap, since it only
+# compares a few numbers.
+class SolveBudget(object):
+    # The reasons for exhausting the budget (see BudgetExhaustedException)
+    REASON_TIMEOUT = "timeout"
+    REASON_MAX_NODES = "max_nodes"
+    REASON_CANCELLED = "cancelled"
+
+    # Creates a budget; the timeout starts now.
+    def __init__(self, timeout=None, max_nodes=None, cancel_token=None):
+        self.__deadline = None if timeout is None else time.monotonic() + timeout
+        self.__max_nodes = max_nodes
+        self.__cancel_token = cancel_token
+
+    # Checks the budget before the search node following the specified number of
+    # search nodes. Raises a BudgetExhaustedException if the solve was cancelled, if
+    # the maximum number of search nodes is reached, or if the timeout has expired.
+    def check(self, node_count):
+        if self.__cancel_token is not None and self.__cancel_token.is_cancelled():
+            raise BudgetExhaustedException(SolveBudget.REASON_CANCELLED)
+        if self.__max_nodes is not None and node_count >= self.__max_nodes:
+            raise BudgetExhaustedException(SolveBudget.REASON_MAX_NODES)
+        if self.__deadline is not None and time.monotonic() >= self.__deadline:
+            raise BudgetExhaustedException(SolveBudget.REASON_TIMEOUT)
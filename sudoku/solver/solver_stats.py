@@ -0,0 +1,93 @@
+# Statistics about the work done while solving a board (see Board.solve): for every
+# solving strategy (unit solver) the number of invocations, eliminated possible
+# values, placed (solved) cells and the time spent, and for the brute force board
+# solver the number of guesses and backtracks.
+class SolverStats(object):
+
+    def __init__(self):
+        # For every strategy name: [invocations, eliminations, placements, seconds]
+        self.__strategies = {}
+        self.__guesses = 0
+        self.__backtracks = 0
+
+    # Records an invocation of the specified strategy (a solver class).
+    def record_strategy(self, strategy, eliminations, placements, seconds):
+        counters = self.__strategies.get(strategy.__name__)
+        if counters is None:
+            counters = [0, 0, 0, 0.0]
+            self.__strategies[strategy.__name__] = counters
+        counters[0] += 1
+        counters[1] += eliminations
+        counters[2] += placements
+        counters[3] += seconds
+
+    # Counts a guess of the brute force board solver.
+    def count_guess(self):
+        self.__guesses += 1
+
+    # Counts a backtrack (a guess that turned out to be wrong) of the brute force board solver.
+    def count_backtrack(self):
+        self.__backtracks += 1
+
+    # Returns the names of the strategies that were invoked.
+    def get_strategy_names(self):
+        return list(self.__strategies.keys())
+
+    # Returns the number of invocations of the strategy with the specified name.
+    def get_invocations(self, name):
+        return self.__strategies[name][0] if name in self.__strategies else 0
+
+    # Returns the number of possible values eliminated by the strategy with the specified name.
+    def get_eliminations(self, name):
+        return self.__strategies[name][1] if name in self.__strategies else 0
+
+    # Returns the number of cells solved by the strategy with the specified name.
+    def get_placements(self, name):
+        return self.__strategies[name][2] if name in self.__strategies else 0
+
+    # Returns the time in seconds spent in the strategy with the specified name.
+    def get_seconds(self, name):
+        return self.__strategies[name][3] if name in self.__strategies else 0.0
+
+    # Returns the number of guesses of the brute force board solver.
+    def get_guesses(self):
+        return self.__guesses
+
+    # Returns the number of backtracks of the brute force board solver.
+    def get_backtracks(self):
+        return self.__backtracks
+
+    # Adds the statistics of the specified other SolverStats to these statistics.
+    def merge(self, other):
+        for name in other.get_strategy_names():
+            counters = self.__strategies.setdefault(name, [0, 0, 0, 0.0])
+            counters[0] += other.get_invocations(name)
+            counters[1] += other.get_eliminations(name)
+            counters[2] += other.get_placements(name)
+            counters[3] += other.get_seconds(name)
+        self.__guesses += other.get_guesses()
+        self.__backtracks += other.get_backtracks()
+
+    # Returns the statistics as a dictionary.
+    def to_dict(self):
+        return {
+            "strategies": {
+                name: {
+                    "invocations": counters[0],
+                    "eliminations": counters[1],
+                    "placements": counters[2],
+                    "seconds": counters[3]
+                }
+                for name, counters in self.__strategies.items()
+            },
+            "guesses": self.__guesses,
+            "backtracks": self.__backtracks
+        }
+
+    # Returns a string representation of the statistics (a table).
+    def to_string(self):
+        lines = [f"{'strategy':<26}{'invocations':>12}{'eliminations':>14}{'placements':>12}{'ms':>10}"]
+        for name, counters in self.__strategies.items():
+            lines.append(f"{name:<26}{counters[0]:>12}{counters[1]:>14}{counters[2]:>12}{1000 * counters[3]:>10.1f}")
+        lines.append(f"guesses: {self.__guesses}, backtracks: {self.__backtracks}")
+        return "\n".join(lines)
@@ -0,0 +1,68 @@
+from solver.bidirectional_block_solver import BidirectionalBlockSolver
+
+
+# Decides which solvers (strategies) to run on a unit during propagation (see
+# Board.propagate), and in which order. There are two tiers:
+# - the cheap tier, which runs right away, the most productive solvers first (by
+#   their recent yield on the whole board);
+# - the deferred tier, which only runs when the cheap tier has reached a fixpoint,
+#   i.e. no more units are waiting for a cheap solver.
+# Expensive solvers (EXPENSIVE_SOLVERS) are always deferred. Cheap solvers are
+# deferred on a unit once they have been unproductive on that unit BACKOFF times in
+# a row, until they are productive again. Deferred solvers still run eventually, so
+# propagation reaches the same fixpoint as when running all solvers right away.
+class StrategyScheduler(object):
+    # The solvers that are expensive compared to the others
+    EXPENSIVE_SOLVERS = frozenset([BidirectionalBlockSolver])
+    # The number of unproductive runs in a row after which a solver is deferred on a unit
+    BACKOFF = 2
+    # The weight of the latest run in the (exponential moving) average yield of a solver
+    YIELD_WEIGHT = 0.05
+
+    def __init__(self):
+        # For every solver: the average yield (the fraction of productive runs)
+        self.__yield = {}
+        # For every unit: the number of unproductive runs in a row of its solvers
+        self.__misses = {}
+
+    # Divides the specified solvers to run on the specified unit into the ones to run
+    # right away (a list, in the order to run them), and the ones to defer (a list).
+    def select(self, unit, solvers):
+        now = []
+        later = []
+        misses = self.__misses.get(unit)
+        for solver in solvers:
+            if solver in StrategyScheduler.EXPENSIVE_SOLVERS or (misses and misses.get(solver, 0) >= StrategyScheduler.BACKOFF):
+                later.append(solver)
+            else:
+                now.append(solver)
+        return self.order(now), later
+
+    # Returns the specified solvers as a list, ordered by their average yield, the most
+    # productive solvers first.
+    def order(self, solvers):
+        solvers = list(solvers)
+        if len(solvers) > 1:
+            yields = self.__yield
+            solvers.sort(key=lambda solver: -yields.get(solver, 1.0))
+        return solvers
+
+    # Records the outcome of running the specified solver on the specified unit
+    # (updated is True if it changed any cell).
+    def record(self, unit, solver, updated):
+        weight = StrategyScheduler.YIELD_WEIGHT
+        self.__yield[solver] = (1 - weight) * self.__yield.get(solver, 1.0) + (weight if updated else 0.0)
+        misses = self.__misses.get(unit)
+        if misses is None:
+            misses = self.__misses[unit] = {}
+        misses[solver] = 0 if updated else misses.get(solver, 0) + 1
+
+    # Returns the average yield of the specified solver (1.0 if it never ran).
+    def get_yield(self, solver):
+        return self.__yield.get(solver, 1.0)
+
+    # Returns whether the specified solver is deferred on the specified unit, because
+    # it has been unproductive.
+    def is_backed_off(self, unit, solver):
+        misses = self.__misses.get(unit)
+        return misses is not None and misses.get(solver, 0) >= StrategyScheduler.BACKOFF
@@ -0,0 +1,53 @@
+from collections import OrderedDict
+
+
+# A table of board states that are known to have no solution (dead ends), identified
+# by their fingerprint (see Board.get_fingerprint). The brute force board solver
+# records every propagated state whose branches all failed, and prunes a branch as
+# soon as it reaches a recorded state, instead of searching it again.
+# Within a single search no state is reached twice (the branches of a heuristic are
+# disjoint), so the table pays off when it is shared by searches that reach the same
+# states, e.g. the many searches on similar puzzles while generating a puzzle (see
+# PuzzleGenerator) or counting solutions. Whether a state has a solution depends on
+# the state only, so the dead ends found in one search are valid in any other.
+# At most max_size dead ends are kept; when the table is full, the least recently
+# used one is evicted.
+class TranspositionTable(object):
+
+    def __init__(self, max_size=100000):
+        self.__max_size = max_size
+        self.__dead_ends = OrderedDict()
+        self.__hits = 0
+
+    # Records the state with the specified fingerprint as a dead end.
+    def add_dead_end(self, fingerprint):
+        dead_ends = self.__dead_ends
+        dead_ends[fingerprint] = None
+        dead_ends.move_to_end(fingerprint)
+        if len(dead_ends) > self.__max_size:
+            dead_ends.popitem(last=False)
+
+    # Returns whether the state with the specified fingerprint is a known dead end.
+    def is_dead_end(self, fingerprint):
+        dead_ends = self.__dead_ends
+        if fingerprint not in dead_ends:
+            return False
+        self.__hits += 1
+        dead_ends.move_to_end(fingerprint)
+        return True
+
+    def get_max_size(self):
+        return self.__max_size
+
+    # Returns the number of dead ends in the table.
+    def get_size(self):
+        return len(self.__dead_ends)
+
+    # Returns the number of branches pruned because they reached a known dead end.
+    def get_hits(self):
+        return self.__hits
+
+    # Removes all dead ends from the table, and resets the counter.
+    def clear(self):
+        self.__dead_ends.clear()
+        self.__hits = 0
@@ -1,3 +1,6 @@
+from board.candidate_mask import CandidateMask
+
+
 class VerticalBlockSolver(object):
 
     # Attempts to solve the specified unit by comparing it to its vertical neighbour
@@ -11,18 +14,16 @@ class VerticalBlockSolver(object):
         # Get block units above and below the current block unit
         vertical_neighbours = unit.get_vertical_neighbours()
 
-        for value in range(1, 10):
-            # If the unit contains a solved cell with the current value, continue to the next value.
-            if unit.has_solved_cell_with_value(value):
-                continue
-
-            for n in range(0, 2):
-                cn_pos = vertical_neighbours[n].get_distinct_column_containing_possible_val(value)
+        cells = unit.get_cells()
+        column_positions = unit.get_topology().get_block_column_positions()
+        # Only the values that are not solved within the unit
+        unsolved_mask = CandidateMask.full(len(cells)) & ~unit.get_solved_mask()
+        for value in CandidateMask.VALUES[unsolved_mask]:
+            bit = CandidateMask.of(value)
+            for neighbour in vertical_neighbours:
+                cn_pos = neighbour.get_distinct_column_containing_possible_val(value)
                 if cn_pos is not None:
-                    for i in [cn_pos, cn_pos + 3, cn_pos + 6]:
-                        cell = unit.get_cells()[i]
-                        if cell.has_possible_value(value):
-                            cell.remove_possible_value(value)
-                            updated = True
+                    for i in column_positions[cn_pos]:
+                        updated = cells[i].remove_mask(bit) or updated
 
         return updated
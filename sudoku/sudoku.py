@@ -1,167 +1,297 @@
+import argparse
+import asyncio
 import random
+import sys
 
+from batch.batch_solver import BatchSolver
+from batch.binary_corpus_reader import BinaryCorpusReader
+from batch.parallel_batch_solver import ParallelBatchSolver
+from batch.vectorized_batch_solver import VectorizedBatchSolver
+from board.binary_format import BinaryFormat
 from board.board import Board
+from generator.puzzle_generator import PuzzleGenerator
+from service.solver_service import SolverService
+from solver.solution_cache import SolutionCache
 from sudoku_exception import SudokuException
 
-board = None
-
-choice = '0'
-while choice not in ['1', '2', '3']:
-    print("\n\n*** SUDOKU ***\n")
-    print("You can either choose to have the program solve a predefined board")
-    print("or you can enter a board manually.\n")
-    print("Pick a number from the menu:\n")
-    print("\t[1] Solve a predefined board")
-    print("\t[2] Let me enter a board manually")
-    print("\t[3] Get me out of here!\n")
-    choice = input("Enter your choice: ")
-    if choice == '3':
-        print("\nBye! See you soon!")
-        quit()
-
-if choice == '1':
-    # Only one preset for now ...
-    presets = [
-        [
-            '....1....',
-            '...257...',
-            '.........',
-            '2.4...7.5',
-            '...5.9...',
-            '3.8...2.1',
-            '.........',
-            '...762...',
-            '....8....'
-#        ], [
-#            '.7.1.....',
-#            '.......5.',
-#            '..6...4.3',
-#            '.........',
-#            '5...4.82.',
-#            '..963...4',
-#            '...32....',
-#            '28.7.....',
-#            '65......9'
-#            #        ], [
-##            '.57....68',
-#            '683......',
-#            '1..896...',
-#            '..846..9.',
-#            '74.9..35.',
-#            '3...17.46',
-#            '4...5..8.',
-#            '2.918.573',
-#            '.35.72...'
-#        ], [
-#            '....9..16',
-#            '..7..6.42',
-#            '..8..7...',
-#            '135...9..',
-#            '...18.5..',
-#            '........7',
-#            '3567....1',
-#            '..9....3.',
-#            '8...3....'
-#        ], [
-#            '......234',
-#            '........5',
-#            '.....1789',
-#            '1........',
-#            '.........',
-#            '.........',
-#            '257......',
-#            '3.9......',
-#            '4.6......'
-#        ], [
-#            '......234',
-#            '........5',
-#            '..5...789',
-#            '1........',
-#            '.........',
-#            '.........',
-#            '257......',
-#            '3.9......',
-#            '4.6......'
-#        ], [
-#            '......1..',
-#            '.........',
-#            '.........',
-#            '.........',
-#            '.........',
-#            '........3',
-#            '1........',
-#            '.........',
-#            '......234'
-#        ], [
-#            '...567234',
-#            '...349...',
-#            '...2..567',
-#            '632......',
-#            '.58......',
-#            '.94......',
-#            '2.5......',
-#            '3.6......',
-#            '4.7......'
-#        ], [
-#            '3........',
-#            '4........',
-#            '5........',
-#            '6........',
-#            '7........',
-#            '8.9......',
-#            '...9.....',
-#            '.........',
-#            '...345678'
+
+# Starts the specified solver service at the specified address (see
+# SolverService.start), and serves until interrupted.
+async def serve(service, address):
+    await service.start(address)
+    print(f"Serving on {service.get_address()}, with {service.get_processes()} worker process(es).", flush=True)
+    await service.serve_forever()
+
+
+# Runs the program: parses the command line, and either runs one of the non-interactive
+# modes, or shows the interactive menu. The program only runs when started as a
+# script, not when imported (e.g. by the worker processes of ParallelBatchSolver and
+# SolverService, which import the main module under the spawn start method).
+def main():
+    parser = argparse.ArgumentParser(description="Solves sudoku puzzles. Without options, an interactive menu is shown.")
+    parser.add_argument("--batch", nargs="?", const="-", metavar="FILE",
+                        help="solve the puzzles in FILE (or on stdin), one line of 81 characters per puzzle "
+                             "(or 256 and 625 characters for 16 x 16 and 25 x 25 puzzles, using the symbols 1-9 and "
+                             "A-P), and write the solutions to stdout, one line per puzzle (an empty line if unsolved); "
+                             "FILE may also be a binary corpus (see --pack), which is solved in one process")
+    parser.add_argument("--pack", metavar="OUT",
+                        help="in batch mode, write the puzzles to OUT in the compact binary format, instead of "
+                             "solving them")
+    parser.add_argument("--engine", choices=[Board.ENGINE_PROPAGATION, Board.ENGINE_DANCING_LINKS,
+                                             VectorizedBatchSolver.ENGINE_VECTORIZED],
+                        default=Board.ENGINE_PROPAGATION,
+                        help="the solving engine to use (default: %(default)s); the vectorized engine requires numpy")
+    parser.add_argument("--processes", type=int, default=1, metavar="N",
+                        help="in batch mode, the number of worker processes to solve the puzzles in (default: 1)")
+    parser.add_argument("--cache-size", type=int, default=0, metavar="N",
+                        help="in batch mode, cache the solutions of up to N puzzles (per process), so that puzzles "
+                             "equivalent to an earlier one (e.g. with relabelled digits) are not solved again")
+    parser.add_argument("--generate", type=int, metavar="N",
+                        help="generate N random puzzles with a unique solution, and write them to stdout, "
+                             "one line of 81 characters per puzzle")
+    parser.add_argument("--symmetry", choices=[PuzzleGenerator.SYMMETRY_NONE, PuzzleGenerator.SYMMETRY_ROTATIONAL,
+                                               PuzzleGenerator.SYMMETRY_MIRROR, PuzzleGenerator.SYMMETRY_DIAGONAL],
+                        default=PuzzleGenerator.SYMMETRY_NONE,
+                        help="when generating, the symmetry of the clues (default: %(default)s)")
+    parser.add_argument("--clues", type=int, metavar="K",
+                        help="when generating, stop removing clues at K clues (default: remove as many as possible)")
+    parser.add_argument("--serve", metavar="ADDRESS",
+                        help="run a solver service at ADDRESS (HOST:PORT, or the path of a Unix socket), answering "
+                             "puzzles sent one per line with their solutions; send 'stats' for the statistics")
+    parser.add_argument("--timeout", type=float, metavar="SECONDS",
+                        help="when serving, stop solving a puzzle after SECONDS (answered with 'timeout')")
+    args = parser.parse_args()
+    if args.engine == VectorizedBatchSolver.ENGINE_VECTORIZED and args.cache_size > 0:
+        parser.error("the vectorized engine cannot be used with --cache-size")
+
+    # Non-interactive: serve puzzles until interrupted.
+    if args.serve is not None:
+        if args.engine == VectorizedBatchSolver.ENGINE_VECTORIZED:
+            parser.error("the vectorized engine cannot be used with --serve")
+        service = SolverService(args.processes, args.engine, timeout=args.timeout)
+        try:
+            asyncio.run(serve(service, args.serve))
+        except KeyboardInterrupt:
+            pass
+        return
+
+    # Non-interactive: generate puzzles to stdout.
+    if args.generate is not None:
+        generator = PuzzleGenerator(args.symmetry, args.clues)
+        for i in range(args.generate):
+            puzzle, solution = generator.generate()
+            print(puzzle)
+        return
+
+    # Non-interactive: convert the puzzles from the file (or stdin) to a binary corpus.
+    if args.batch is not None and args.pack is not None:
+        puzzles = sys.stdin if args.batch == "-" else open(args.batch)
+        try:
+            with open(args.pack, "wb") as corpus:
+                lines = (line for line in puzzles if BatchSolver.is_puzzle_line(line))
+                count = BinaryFormat.write(corpus, lines)
+            print(f"{count} puzzles written to {args.pack}.")
+        finally:
+            if puzzles is not sys.stdin:
+                puzzles.close()
+        return
+
+    # Non-interactive: solve the puzzles of a binary corpus, writing the solutions to stdout.
+    if args.batch is not None and args.batch != "-" and BinaryCorpusReader.is_binary_corpus(args.batch):
+        with BinaryCorpusReader(args.batch) as reader:
+            if args.engine == VectorizedBatchSolver.ENGINE_VECTORIZED:
+                solutions = VectorizedBatchSolver.solve_corpus(reader)
+            else:
+                solutions = BatchSolver.solve_records(reader, args.engine)
+            for solution in solutions:
+                print(solution or "")
+            solutions = None
+        return
+
+    # Non-interactive: stream the puzzles from the file (or stdin) to stdout.
+    if args.batch is not None:
+        puzzles = sys.stdin if args.batch == "-" else open(args.batch)
+        parallel_batch_solver = None
+        try:
+            if args.engine == VectorizedBatchSolver.ENGINE_VECTORIZED:
+                solutions = VectorizedBatchSolver.solve_lines(puzzles)
+            elif args.processes > 1:
+                parallel_batch_solver = ParallelBatchSolver(args.processes, args.engine, cache_size=args.cache_size)
+                solutions = parallel_batch_solver.solve_lines(puzzles)
+            else:
+                cache = SolutionCache(args.cache_size) if args.cache_size > 0 else None
+                solutions = BatchSolver.solve_lines(puzzles, args.engine, cache=cache)
+            for solution in solutions:
+                print(solution or "")
+        finally:
+            if parallel_batch_solver is not None:
+                parallel_batch_solver.close()
+            if puzzles is not sys.stdin:
+                puzzles.close()
+        return
+
+    board = None
+
+    choice = '0'
+    while choice not in ['1', '2', '3']:
+        print("\n\n*** SUDOKU ***\n")
+        print("You can either choose to have the program solve a predefined board")
+        print("or you can enter a board manually.\n")
+        print("Pick a number from the menu:\n")
+        print("\t[1] Solve a predefined board")
+        print("\t[2] Let me enter a board manually")
+        print("\t[3] Get me out of here!\n")
+        choice = input("Enter your choice: ")
+        if choice == '3':
+            print("\nBye! See you soon!")
+            return
+
+    if choice == '1':
+        # Only one preset for now ...
+        presets = [
+            [
+                '....1....',
+                '...257...',
+                '.........',
+                '2.4...7.5',
+                '...5.9...',
+                '3.8...2.1',
+                '.........',
+                '...762...',
+                '....8....'
+    #        ], [
+    #            '.7.1.....',
+    #            '.......5.',
+    #            '..6...4.3',
+    #            '.........',
+    #            '5...4.82.',
+    #            '..963...4',
+    #            '...32....',
+    #            '28.7.....',
+    #            '65......9'
+    #            #        ], [
+    ##            '.57....68',
+    #            '683......',
+    #            '1..896...',
+    #            '..846..9.',
+    #            '74.9..35.',
+    #            '3...17.46',
+    #            '4...5..8.',
+    #            '2.918.573',
+    #            '.35.72...'
+    #        ], [
+    #            '....9..16',
+    #            '..7..6.42',
+    #            '..8..7...',
+    #            '135...9..',
+    #            '...18.5..',
+    #            '........7',
+    #            '3567....1',
+    #            '..9....3.',
+    #            '8...3....'
+    #        ], [
+    #            '......234',
+    #            '........5',
+    #            '.....1789',
+    #            '1........',
+    #            '.........',
+    #            '.........',
+    #            '257......',
+    #            '3.9......',
+    #            '4.6......'
+    #        ], [
+    #            '......234',
+    #            '........5',
+    #            '..5...789',
+    #            '1........',
+    #            '.........',
+    #            '.........',
+    #            '257......',
+    #            '3.9......',
+    #            '4.6......'
+    #        ], [
+    #            '......1..',
+    #            '.........',
+    #            '.........',
+    #            '.........',
+    #            '.........',
+    #            '........3',
+    #            '1........',
+    #            '.........',
+    #            '......234'
+    #        ], [
+    #            '...567234',
+    #            '...349...',
+    #            '...2..567',
+    #            '632......',
+    #            '.58......',
+    #            '.94......',
+    #            '2.5......',
+    #            '3.6......',
+    #            '4.7......'
+    #        ], [
+    #            '3........',
+    #            '4........',
+    #            '5........',
+    #            '6........',
+    #            '7........',
+    #            '8.9......',
+    #            '...9.....',
+    #            '.........',
+    #            '...345678'
+            ]
         ]
-    ]
-
-    # Pick a random preset ...
-    rows = presets[random.randint(0, len(presets) - 1)]
-    # Create a new Sudoku board
-    board = Board(rows)
-
-if choice == '2':
-    print("Enter initial board settings, row by row.")
-    print("Enter the digit of a cell, or a '.' for an empty cell.")
-    print("Every row contains 9 cells, and the board contains 9 rows.")
-    print("For example, a row might be entered as: ..5..6.8.")
-    print("Or an initial board as: ")
-    print("\t.7.1.....")
-    print("\t.......5.")
-    print("\t..6...4.3")
-    print("\t.........")
-    print("\t5...4.82.")
-    print("\t..963...4")
-    print("\t...32....")
-    print("\t28.7.....")
-    print("\t65......9\n")
-
-    # Let user enter the initial settings of the board, and update the board
-    # An exception is raised when illegal input is detected.
-    rows = []
-    for row_index in range(0, 9):
-        row = input(f"Enter row {row_index + 1}: ")
-        rows.append(row)
-    # Create a new Sudoku board
-    board = Board(rows)
-
-# Print the initial board.
-print('-' * 27)
-board.print()
-
-# Try to solve the sudoku and print the result
-try:
-    board = board.solve()
-    if board.is_solved():
-        print("\nYay!! Solved it!!")
-    else:
-        print("\nSorry, too hard to solve ... :(")
-except SudokuException as se:
-    print("\nOops! The board became invalid. (Was the initial setting okay?)")
-    choice = input("Show error details? [y/n]: ")
-    if choice in ['y', 'Y']:
-        print(se)
-print('-' * 27)
-board.print()
-print('-' * 27)
 
+        # Pick a random preset ...
+        rows = presets[random.randint(0, len(presets) - 1)]
+        # Create a new Sudoku board
+        board = Board(rows)
+
+    if choice == '2':
+        print("Enter initial board settings, row by row.")
+        print("Enter the digit of a cell, or a '.' for an empty cell.")
+        print("Every row contains 9 cells, and the board contains 9 rows.")
+        print("For example, a row might be entered as: ..5..6.8.")
+        print("Or an initial board as: ")
+        print("\t.7.1.....")
+        print("\t.......5.")
+        print("\t..6...4.3")
+        print("\t.........")
+        print("\t5...4.82.")
+        print("\t..963...4")
+        print("\t...32....")
+        print("\t28.7.....")
+        print("\t65......9\n")
+
+        # Let user enter the initial settings of the board, and update the board
+        # An exception is raised when illegal input is detected.
+        rows = []
+        for row_index in range(0, 9):
+            row = input(f"Enter row {row_index + 1}: ")
+            rows.append(row)
+        # Create a new Sudoku board
+        board = Board(rows)
+
+    # Print the initial board.
+    print('-' * 27)
+    board.print()
+
+    # Try to solve the sudoku and print the result
+    try:
+        board = board.solve()
+        if board.is_solved():
+            print("\nYay!! Solved it!!")
+        else:
+            print("\nSorry, too hard to solve ... :(")
+    except SudokuException as se:
+        print("\nOops! The board became invalid. (Was the initial setting okay?)")
+        choice = input("Show error details? [y/n]: ")
+        if choice in ['y', 'Y']:
+            print(se)
+    print('-' * 27)
+    board.print()
+    print('-' * 27)
+
+
+if __name__ == '__main__':
+    main()
@@ -47,11 +47,11 @@ class TestAbstractUnit(unittest.TestCase):
             Mock(), Mock(), Mock(),
             Mock(), Mock(), Mock()
         ]
-        # The args_list in the order in which we expect the get_cells method to be called
+        # The args_list (cell indices) in the order in which we expect the get_cell method to be called
         expected_call_args_list = [
-            call("x1y9",), call("x2y9",), call("x3y9",),
-            call("x4y9",), call("x5y9",), call("x6y9", ),
-            call("x7y9",), call("x8y9",), call("x9y9",),
+            call(72,), call(73,), call(74,),
+            call(75,), call(76,), call(77,),
+            call(78,), call(79,), call(80,),
         ]
 
         # Configure a Board mock who's method get_cells returns the list of cell mocks above
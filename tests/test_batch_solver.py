@@ -0,0 +1,56 @@
+import unittest
+
+from batch.batch_solver import BatchSolver
+from board.board import Board
+from board.board_exception import BoardException
+
+
+class TestBatchSolver(unittest.TestCase):
+
+    __puzzle = "1....7.9..3..2...8..96..5....53..9...1..8...26....4...3......1..4......7..7...3.."
+    __solution = "162857493534129678789643521475312986913586742628794135356478219241935867897261354"
+
+    def test_line_to_rows(self):
+        rows = BatchSolver.line_to_rows("0" * 80 + "9\n")
+        self.assertEqual(len(rows), 9)
+        self.assertEqual(rows[0], ".........")
+        self.assertEqual(rows[8], "........9")
+        with self.assertRaises(BoardException):
+            BatchSolver.line_to_rows("123")
+        rows = BatchSolver.line_to_rows("." * 255 + "G")
+        self.assertEqual(len(rows), 16)
+        self.assertEqual(rows[15], "." * 15 + "G")
+        self.assertEqual(BatchSolver.get_box_size("." * 625), 5)
+
+    def test_solve_line(self):
+        self.assertEqual(BatchSolver.solve_line(self.__puzzle), self.__solution)
+        self.assertEqual(BatchSolver.solve_line(self.__puzzle, Board.ENGINE_DANCING_LINKS), self.__solution)
+        # A 16 x 16 puzzle (the empty board)
+        solution = BatchSolver.solve_line("." * 256)
+        self.assertEqual(len(solution), 256)
+        self.assertEqual(solution[:16], "123456789ABCDEFG")
+        # Invalid puzzles
+        self.assertIsNone(BatchSolver.solve_line("123"))
+        self.assertIsNone(BatchSolver.solve_line("11" + "." * 79))
+
+    def test_solve_line_result(self):
+        self.assertEqual(BatchSolver.solve_line_result(self.__puzzle), self.__solution)
+        self.assertEqual(BatchSolver.solve_line_result("123"), BatchSolver.RESULT_INVALID)
+        self.assertEqual(BatchSolver.solve_line_result("11" + "." * 79), BatchSolver.RESULT_INVALID)
+        # Valid, but without a solution: the last cell of the first row can only be a 9
+        self.assertEqual(BatchSolver.solve_line_result("12345678." + "........9" + "." * 63),
+                         BatchSolver.RESULT_UNSOLVED)
+        self.assertEqual(BatchSolver.solve_line_result(self.__puzzle, timeout=0), BatchSolver.RESULT_TIMEOUT)
+        self.assertIsNone(BatchSolver.solve_line(self.__puzzle, timeout=0))
+
+    def test_solve_lines(self):
+        lines = iter(["# comment\n", self.__puzzle + "\n", "\n", "bad\n", self.__puzzle])
+        solutions = BatchSolver.solve_lines(lines)
+        # Solutions are generated lazily, one line at a time
+        self.assertEqual(next(solutions), self.__solution)
+        self.assertEqual(next(lines), "\n")
+        self.assertEqual(list(solutions), [None, self.__solution])
+
+
+if __name__ == '__main__':
+    unittest.main()
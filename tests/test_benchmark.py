@@ -0,0 +1,51 @@
+import unittest
+
+from benchmark.benchmark import Benchmark
+
+
+class TestBenchmark(unittest.TestCase):
+
+    def test_load_corpus(self):
+        for corpus in Benchmark.CORPORA:
+            puzzles = Benchmark.load_corpus(corpus)
+            self.assertTrue(len(puzzles) > 0)
+            for puzzle in puzzles:
+                self.assertEqual(len(puzzle), 81)
+
+    def test_run_corpus(self):
+        metrics = Benchmark.run_corpus(Benchmark.load_corpus("easy")[:2])
+        self.assertEqual(metrics["puzzles"], 2)
+        self.assertEqual(metrics["unsolved"], 0)
+        self.assertEqual(metrics["nodes_total"], 0)
+        self.assertTrue(metrics["puzzles_per_second"] > 0)
+        self.assertTrue(metrics["p50_ms"] <= metrics["p99_ms"] <= metrics["max_ms"])
+
+    def test_compare(self):
+        baseline = {"easy": {"unsolved": 0, "nodes_total": 10, "p50_ms": 1.0, "p99_ms": 2.0,
+                             "peak_memory_kb": 100.0, "puzzles_per_second": 500.0}}
+        results = {"easy": {"unsolved": 0, "nodes_total": 10, "p50_ms": 1.2, "p99_ms": 2.2,
+                            "peak_memory_kb": 100.0, "puzzles_per_second": 450.0}}
+        self.assertEqual(Benchmark.compare(results, baseline, 0.3), [])
+        results["easy"]["nodes_total"] = 11
+        results["easy"]["p99_ms"] = 3.0
+        # Timings are only compared with a tolerance
+        self.assertEqual(Benchmark.compare(results, baseline), ["easy: nodes_total 11 > baseline 10"])
+        self.assertEqual(Benchmark.compare(results, baseline, 0.3), [
+            "easy: nodes_total 11 > baseline 10",
+            "easy: p99_ms 3.0 > baseline 2.0"
+        ])
+
+    def test_describe_changes(self):
+        baseline = {"easy": {"p50_ms": 1.0, "p99_ms": 2.0, "peak_memory_kb": 100.0, "puzzles_per_second": 500.0}}
+        results = {"easy": {"p50_ms": 1.2, "p99_ms": 2.0, "peak_memory_kb": 130.0, "puzzles_per_second": 450.0},
+                   "hardest": {"p50_ms": 1.0, "p99_ms": 2.0, "peak_memory_kb": 100.0, "puzzles_per_second": 500.0}}
+        self.assertEqual(Benchmark.describe_changes(results, baseline), [
+            "easy: p50_ms 1.2 (baseline 1.0, +20%)",
+            "easy: p99_ms 2.0 (baseline 2.0, +0%)",
+            "easy: peak_memory_kb 130.0 (baseline 100.0, +30%)",
+            "easy: puzzles_per_second 450.0 (baseline 500.0, -10%)"
+        ])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,44 @@
+import unittest
+
+from board.board import Board
+from board.candidate_mask import CandidateMask
+from solver.bidirectional_block_solver import BidirectionalBlockSolver
+from solver.solver_exception import SolverException
+
+
+class TestBidirectionalBlockSolver(unittest.TestCase):
+
+    # Returns a board on which 1 only fits in the first row of the middle top block,
+    # the second row of the top right block, the first column of the middle left
+    # block and the second column of the bottom left block. In the top left block,
+    # 1 must then go in the cell in its third row and third column (index 20).
+    @staticmethod
+    def __create_board():
+        board = Board(None)
+        masks = list(board.snapshot())
+        for index in range(81):
+            x, y = index % 9, index // 9
+            if (y < 3 <= x < 6 and y != 0) or (y < 3 and x >= 6 and y != 1) \
+                    or (3 <= y < 6 and x < 3 and x != 0) or (y >= 6 and x < 3 and x != 1):
+                masks[index] &= ~CandidateMask.of(1)
+        board.restore(tuple(masks), True)
+        return board
+
+    def test_solve(self):
+        board = self.__create_board()
+        self.assertTrue(BidirectionalBlockSolver.solve(board.get_block_units()[0]))
+        self.assertEqual(board.get_cell(20).get_mask(), CandidateMask.of(1))
+
+    def test_solve_value_not_possible(self):
+        board = self.__create_board()
+        masks = list(board.snapshot())
+        masks[20] &= ~CandidateMask.of(1)
+        board.restore(tuple(masks), True)
+        # 1 has no place left in the top left block: the cell must not be solved with it
+        with self.assertRaises(SolverException):
+            BidirectionalBlockSolver.solve(board.get_block_units()[0])
+        self.assertFalse(board.get_cell(20).has_possible_value(1))
+
+
+if __name__ == '__main__':
+    unittest.main()
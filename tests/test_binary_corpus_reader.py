@@ -0,0 +1,69 @@
+import gc
+import os
+import tempfile
+import unittest
+import warnings
+
+from batch.batch_solver import BatchSolver
+from batch.binary_corpus_reader import BinaryCorpusReader
+from board.binary_format import BinaryFormat
+from board.board_exception import BoardException
+
+
+class TestBinaryCorpusReader(unittest.TestCase):
+
+    __puzzle = "1....7.9..3..2...8..96..5....53..9...1..8...26....4...3......1..4......7..7...3.."
+    __solution = "162857493534129678789643521475312986913586742628794135356478219241935867897261354"
+
+    def setUp(self):
+        handle, self.__path = tempfile.mkstemp(suffix=".bin")
+        with os.fdopen(handle, "wb") as file:
+            BinaryFormat.write(file, [self.__puzzle, "11" + "." * 79, self.__puzzle])
+
+    def tearDown(self):
+        os.remove(self.__path)
+
+    def test_read(self):
+        self.assertTrue(BinaryCorpusReader.is_binary_corpus(self.__path))
+        with BinaryCorpusReader(self.__path) as reader:
+            self.assertEqual(len(reader), 3)
+            self.assertEqual(reader.get_format(), BinaryFormat.FORMAT_GIVENS)
+            record = reader[-1]
+            # Records are slices of the memory map, not copies
+            self.assertIsInstance(record, memoryview)
+            self.assertEqual(bytes(record), BinaryFormat.encode_givens(self.__puzzle))
+            record.release()
+            with self.assertRaises(IndexError):
+                reader[3]
+            self.assertEqual(list(BatchSolver.solve_records(reader)), [self.__solution, None, self.__solution])
+
+    def test_not_a_corpus(self):
+        with open(self.__path, "wb") as file:
+            file.write(self.__puzzle.encode())
+        self.assertFalse(BinaryCorpusReader.is_binary_corpus(self.__path))
+        with self.assertRaises(BoardException):
+            BinaryCorpusReader(self.__path)
+
+    def test_not_a_corpus_releases_file(self):
+        with open(self.__path, "wb") as file:
+            file.write(self.__puzzle.encode())
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter("always")
+            with self.assertRaises(BoardException):
+                BinaryCorpusReader(self.__path)
+            gc.collect()
+        self.assertFalse([warning for warning in caught if issubclass(warning.category, ResourceWarning)])
+
+    def test_close_with_records_in_use(self):
+        with self.assertRaises(IndexError):
+            with BinaryCorpusReader(self.__path) as reader:
+                record = reader[0]
+                # Closing (on the way out) does not hide the exception
+                reader[3]
+        # The record stays readable until it is released
+        self.assertEqual(bytes(record), BinaryFormat.encode_givens(self.__puzzle))
+        record.release()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+import io
+import unittest
+
+from board.binary_format import BinaryFormat
+from board.board import Board
+from board.board_exception import BoardException
+from board.candidate_mask import CandidateMask
+
+
+class TestBinaryFormat(unittest.TestCase):
+
+    __puzzle = "1....7.9..3..2...8..96..5....53..9...1..8...26....4...3......1..4......7..7...3.."
+
+    def test_givens(self):
+        record = BinaryFormat.encode_givens(self.__puzzle)
+        self.assertEqual(len(record), BinaryFormat.GIVENS_RECORD_SIZE)
+        self.assertEqual(record[0], 0x10)
+        values = BinaryFormat.decode_givens(record)
+        self.assertEqual(''.join([str(value) if value else '.' for value in values]), self.__puzzle)
+        with self.assertRaises(BoardException):
+            BinaryFormat.encode_givens("123")
+        with self.assertRaises(BoardException):
+            BinaryFormat.encode_givens("x" * 81)
+
+    def test_masks(self):
+        masks = tuple([CandidateMask.ALL] * 80 + [CandidateMask.of_values([1, 2])])
+        record = BinaryFormat.encode_masks(masks)
+        self.assertEqual(len(record), BinaryFormat.MASKS_RECORD_SIZE)
+        self.assertEqual(BinaryFormat.decode_masks(record), masks)
+        self.assertEqual(BinaryFormat.to_masks(record), masks)
+        with self.assertRaises(BoardException):
+            BinaryFormat.to_masks(BinaryFormat.encode_masks([0] * 81))
+        with self.assertRaises(BoardException):
+            BinaryFormat.to_masks(b"123")
+
+    def test_header(self):
+        header = BinaryFormat.encode_header(BinaryFormat.FORMAT_MASKS, 7)
+        self.assertEqual(len(header), BinaryFormat.HEADER_SIZE)
+        self.assertEqual(BinaryFormat.decode_header(header), (BinaryFormat.FORMAT_MASKS, 7))
+        with self.assertRaises(BoardException):
+            BinaryFormat.decode_header(b"XXXX" + header[4:])
+        with self.assertRaises(BoardException):
+            BinaryFormat.encode_header(3, 7)
+
+    def test_write(self):
+        file = io.BytesIO()
+        self.assertEqual(BinaryFormat.write(file, [self.__puzzle, self.__puzzle]), 2)
+        data = file.getvalue()
+        self.assertEqual(len(data), BinaryFormat.HEADER_SIZE + 2 * BinaryFormat.GIVENS_RECORD_SIZE)
+        self.assertEqual(BinaryFormat.decode_header(data), (BinaryFormat.FORMAT_GIVENS, 2))
+
+    def test_board_from_record(self):
+        rows = [self.__puzzle[i: i + 9] for i in range(0, 81, 9)]
+        board = Board(rows)
+        self.assertEqual(Board(BinaryFormat.encode_givens(self.__puzzle)).snapshot(), board.snapshot())
+        # A propagated board, from the masks format
+        board.propagate()
+        record = memoryview(BinaryFormat.encode_masks(board.snapshot()))
+        self.assertEqual(Board(record).snapshot(), board.snapshot())
+        self.assertTrue(Board(record).solve().is_solved())
+        # Duplicate values are detected
+        with self.assertRaises(BoardException):
+            Board(BinaryFormat.encode_givens("11" + "." * 79))
+
+
+if __name__ == '__main__':
+    unittest.main()
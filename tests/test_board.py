@@ -1,7 +1,19 @@
+import inspect
+import sys
 import unittest
+from unittest.mock import patch
 
+from board.abstract_unit import AbstractUnit
+from board.block_unit import BlockUnit
 from board.board import Board
 from board.board_exception import BoardException
+from board.column_unit import ColumnUnit
+from board.row_unit import RowUnit
+from solver.degree_heuristic import DegreeHeuristic
+from solver.fewest_places_heuristic import FewestPlacesHeuristic
+from solver.first_unsolved_cell_heuristic import FirstUnsolvedCellHeuristic
+from solver.minimum_remaining_values_heuristic import MinimumRemainingValuesHeuristic
+from sudoku_exception import SudokuException
 
 
 class TestBoard(unittest.TestCase):
@@ -48,6 +60,22 @@ class TestBoard(unittest.TestCase):
         self.assertTrue("Illegal value for cell: 'a'. Only digits [1-9] or '.' (empty cell) are allowed."
                         in str(context.exception))
 
+    def test_init_duplicate_value_in_unit(self):
+        invalid_rows = [
+            '..1......',
+            '.........',
+            '...23....',
+            '.....45..',
+            '.......67',
+            '.........',
+            '.........',
+            '..1......',
+            '.........'
+        ]
+        with self.assertRaises(BoardException) as context:
+            Board(invalid_rows)
+        self.assertTrue("Value 1 not unique in unit." in str(context.exception))
+
     def test_init_valid_rows(self):
         valid_rows = [
             '.57....68',
@@ -66,6 +94,14 @@ class TestBoard(unittest.TestCase):
         self.assertEqual(board.get_cell("x1y1").get_possible_values(), [1, 2, 3, 4, 5, 6, 7, 8, 9])
         self.assertEqual(board.get_cell("x2y1").get_possible_values(), [5])
         self.assertEqual(board.get_cell("x3y1").get_possible_values(), [7])
+        # Cell indices and string keys refer to the same cells:
+        self.assertIs(board.get_cell(0), board.get_cell("x1y1"))
+        self.assertIs(board.get_cell(80), board.get_cell("x9y9"))
+        # Indices out of range are not wrapped around
+        for index in (-1, 81):
+            with self.assertRaises(BoardException) as context:
+                board.get_cell(index)
+            self.assertTrue(f"Not a valid cell index: {index}." in str(context.exception))
 
     def test_clone(self):
         # Prepare: create an original board and solve partly
@@ -94,6 +130,69 @@ class TestBoard(unittest.TestCase):
                     cloned_board.get_cell(f"x{x}y{y}").get_possible_values()
                 )
 
+    def test_snapshot_restore(self):
+        rows = [
+            '.57....68',
+            '683......',
+            '1..896...',
+            '..846..9.',
+            '74.9..35.',
+            '3...17.46',
+            '4...5..8.',
+            '2.918.573',
+            '.35.72...'
+        ]
+        board = Board(rows)
+        snapshot = board.snapshot()
+        self.assertEqual(len(snapshot), 81)
+        board.set_cell_value("x1y1", 9)
+        board.get_cell("x9y9").remove_possible_value(1)
+        self.assertNotEqual(board.snapshot(), snapshot)
+        # Verify: restoring the snapshot reverts all changes
+        board.restore(snapshot)
+        self.assertTrue(board.equals(Board(rows)))
+
+    def test_propagate_schedules_affected_units(self):
+        board = Board(None)
+        board.propagate()
+        board.get_cell(0).remove_possible_value(1)
+        with patch.object(AbstractUnit, "run_solver", autospec=True, side_effect=AbstractUnit.run_solver) as run_solver:
+            board.propagate()
+        # The solvers run per unit, keyed by the type and cells of the unit
+        runs = {}
+        for (unit, solver), _ in run_solver.call_args_list:
+            runs.setdefault((type(unit), unit.get_cell_indices()), set()).add(solver)
+        topology = board.get_topology()
+        row, column, block = topology.get_rows()[0], topology.get_columns()[0], topology.get_blocks()[0]
+        # Only the row, column and block of the cell, and the neighbours of the block,
+        # are solved
+        self.assertEqual(set(runs), {
+            (RowUnit, row), (ColumnUnit, column), (BlockUnit, block),
+            (BlockUnit, topology.get_blocks()[1]), (BlockUnit, topology.get_blocks()[2]),
+            (BlockUnit, topology.get_blocks()[3]), (BlockUnit, topology.get_blocks()[6])
+        })
+        # The neighbours only with the solvers that depend on the changed block
+        for index in (1, 2):
+            self.assertTrue(runs[(BlockUnit, topology.get_blocks()[index])] <= BlockUnit.HORIZONTAL_NEIGHBOUR_SOLVERS)
+        for index in (3, 6):
+            self.assertTrue(runs[(BlockUnit, topology.get_blocks()[index])] <= BlockUnit.VERTICAL_NEIGHBOUR_SOLVERS)
+
+    def test_restore_propagated_discards_scheduled_units(self):
+        board = Board(None)
+        board.propagate()
+        snapshot = board.snapshot()
+        # Value 1 has no place left in the first row: propagating fails half-way,
+        # with units still pending (or deferred)
+        for cell in board.get_cells()[:9]:
+            cell.remove_possible_value(1)
+        with self.assertRaises(SudokuException):
+            board.propagate()
+        board.restore(snapshot, True)
+        with patch.object(AbstractUnit, "run_solver", autospec=True, side_effect=AbstractUnit.run_solver) as run_solver:
+            board.propagate()
+        run_solver.assert_not_called()
+        self.assertEqual(board.snapshot(), snapshot)
+
     def test_equals(self):
         # Prepare: create an original board and solve partly
         rows = [
@@ -190,6 +289,232 @@ class TestBoard(unittest.TestCase):
             " 8  2  1  9  3  4  6  7  5 "
         )
 
+    def test_solve_with_heuristics(self):
+        # A board that cannot be solved without guessing
+        rows = [
+            '1....7.9.',
+            '.3..2...8',
+            '..96..5..',
+            '..53..9..',
+            '.1..8...2',
+            '6....4...',
+            '3......1.',
+            '.4......7',
+            '..7...3..'
+        ]
+        heuristics = [
+            FirstUnsolvedCellHeuristic,
+            MinimumRemainingValuesHeuristic,
+            DegreeHeuristic,
+            FewestPlacesHeuristic
+        ]
+        for heuristic in heuristics:
+            board = Board(rows)
+            self.assertEqual(board.get_node_count(), 0)
+            # Solve it
+            board.solve(heuristic)
+            # Test the solution (and that the brute force solver had to search for it):
+            self.assertTrue(board.is_solved(), f"Expected board to be solved using {heuristic.__name__}.")
+            self.assertTrue(board.get_node_count() > 0)
+            self.assertEqual(
+                board.to_string().replace(" ", "").replace("\n", ""),
+                "162857493534129678789643521475312986913586742628794135356478219241935867897261354"
+            )
+
+    def test_solve_collect_stats(self):
+        rows = [
+            '1....7.9.',
+            '.3..2...8',
+            '..96..5..',
+            '..53..9..',
+            '.1..8...2',
+            '6....4...',
+            '3......1.',
+            '.4......7',
+            '..7...3..'
+        ]
+        board = Board(rows)
+        board.solve()
+        self.assertIsNone(board.get_stats())
+        board = Board(rows)
+        board.solve(collect_stats=True)
+        stats = board.get_stats()
+        self.assertEqual(stats.get_guesses(), board.get_node_count())
+        self.assertTrue(stats.get_backtracks() > 0)
+        self.assertTrue(stats.get_invocations("SingleUnitSolver") > 0)
+        # All 58 unsolved cells are solved, either by a strategy or by a guess
+        placements = sum([stats.get_placements(name) for name in stats.get_strategy_names()])
+        self.assertTrue(placements > 58 - stats.get_guesses())
+
+    def test_count_solutions(self):
+        rows = [
+            '1....7.9.',
+            '.3..2...8',
+            '..96..5..',
+            '..53..9..',
+            '.1..8...2',
+            '6....4...',
+            '3......1.',
+            '.4......7',
+            '..7...3..'
+        ]
+        board = Board(rows)
+        snapshot = board.snapshot()
+        self.assertEqual(board.count_solutions(), 1)
+        self.assertTrue(board.has_unique_solution())
+        self.assertTrue(board.get_node_count() > 0)
+        # The board itself is not solved
+        self.assertEqual(board.snapshot(), snapshot)
+        self.assertFalse(board.is_solved())
+
+        # Without its first given, the puzzle has more than one solution
+        board = Board(['.' + rows[0][1:]] + rows[1:])
+        self.assertEqual(board.count_solutions(2), 2)
+        self.assertFalse(board.has_unique_solution())
+        # The search stops at the limit
+        self.assertEqual(Board(None).count_solutions(5), 5)
+
+        # No solution: the last cell of the first row cannot be solved
+        board = Board(['12345678.', '........9'] + ['.........'] * 7)
+        self.assertEqual(board.count_solutions(2), 0)
+        self.assertFalse(board.has_unique_solution())
+
+    def test_solve_dancing_links(self):
+        rows = [
+            '1....7.9.',
+            '.3..2...8',
+            '..96..5..',
+            '..53..9..',
+            '.1..8...2',
+            '6....4...',
+            '3......1.',
+            '.4......7',
+            '..7...3..'
+        ]
+        board = Board(rows)
+        self.assertIs(board.solve(engine=Board.ENGINE_DANCING_LINKS), board)
+        self.assertTrue(board.is_solved())
+        self.assertTrue(board.get_node_count() > 0)
+        self.assertEqual(
+            board.to_string().replace(" ", "").replace("\n", ""),
+            "162857493534129678789643521475312986913586742628794135356478219241935867897261354"
+        )
+
+    def test_solve_unknown_engine(self):
+        with self.assertRaises(BoardException) as context:
+            Board(None).solve(engine="magic")
+        self.assertTrue("Unknown solving engine: 'magic'." in str(context.exception))
+
+    def test_init_invalid_box_size(self):
+        for box_size in (1, 6):
+            with self.assertRaises(BoardException) as context:
+                Board(None, box_size)
+            self.assertTrue(f"Illegal box size: '{box_size}'." in str(context.exception))
+
+    def test_init_large_board(self):
+        board = Board(None, 4)
+        self.assertEqual(board.get_size(), 16)
+        self.assertEqual(board.get_box_size(), 4)
+        self.assertEqual(len(board.get_cells()), 256)
+        self.assertEqual(board.get_cell(0).get_possible_values(), list(range(1, 17)))
+        self.assertIs(board.get_cell(255), board.get_cells()[-1])
+        with self.assertRaises(BoardException):
+            board.get_cell(256)
+        with self.assertRaises(BoardException) as context:
+            board.get_cell("x1y1")
+        self.assertTrue("Not a valid cell key on a 16 x 16 board: x1y1." in str(context.exception))
+        # The units find all their cells by index, beyond the 81 cells of a 9 x 9 board
+        last_block = board.get_block_units()[15]
+        self.assertIs(last_block.get_cell(255), board.get_cells()[-1])
+        self.assertIsNone(last_block.get_cell(0))
+        with self.assertRaises(BoardException):
+            last_block.get_cell("x1y1")
+        with self.assertRaises(BoardException) as context:
+            Board(['.' * 16] * 9, 4)
+        self.assertTrue("Illegal number of rows: '9'. Nr. of rows must be 16." in str(context.exception))
+        with self.assertRaises(BoardException) as context:
+            Board(['H' + '.' * 15] + ['.' * 16] * 15, 4)
+        self.assertTrue("Illegal value for cell: 'H'." in str(context.exception))
+        with self.assertRaises(BoardException):
+            Board(['GG' + '.' * 14] + ['.' * 16] * 15, 4)
+
+    def test_solve_large_boards(self):
+        for box_size in (2, 4, 5):
+            rows = self.__large_puzzle(box_size)
+            for engine in (Board.ENGINE_PROPAGATION, Board.ENGINE_DANCING_LINKS):
+                for heuristic in (None, MinimumRemainingValuesHeuristic(), DegreeHeuristic(),
+                                  FewestPlacesHeuristic()):
+                    board = Board(rows, box_size)
+                    board.solve(heuristic, engine)
+                    self.assertTrue(board.is_solved(), f"Expected the {box_size ** 2} x {box_size ** 2} board to be "
+                                                       f"solved by {engine}.")
+                    self.assert_solution(board, rows)
+                    self.assertEqual(board.clone().to_line(), board.to_line())
+
+    def test_count_solutions_large_board(self):
+        rows = self.__large_puzzle(4)
+        board = Board(rows, 4)
+        board.solve()
+        solution = board.to_line()
+        # Removing a single given from the solution leaves a unique solution
+        self.assertTrue(Board(['.' + solution[1:16]] + [solution[i: i + 16] for i in range(16, 256, 16)],
+                              4).has_unique_solution())
+
+    def test_solve_without_recursion(self):
+        # The search is iterative, so its depth (here over a hundred guesses on an
+        # empty 16 x 16 board) is not limited by the recursion limit
+        board = Board(None, 4)
+        recursion_limit = sys.getrecursionlimit()
+        sys.setrecursionlimit(len(inspect.stack()) + 80)
+        try:
+            board.solve(FirstUnsolvedCellHeuristic)
+        finally:
+            sys.setrecursionlimit(recursion_limit)
+        self.assertTrue(board.is_solved())
+        self.assert_solution(board, ['.' * 16] * 16)
+
+    def test_get_fingerprint(self):
+        board = Board(None)
+        empty = board.get_fingerprint()
+        snapshot = board.snapshot()
+        board.set_cell_value(0, 5)
+        board.propagate()
+        self.assertNotEqual(board.get_fingerprint(), empty)
+        self.assertEqual(board.clone().get_fingerprint(), board.get_fingerprint())
+        # The same state reached in another order has the same fingerprint
+        other = Board(None)
+        other.get_cell(1).remove_possible_value(5)
+        other.set_cell_value(0, 5)
+        other.propagate()
+        self.assertTrue(other.equals(board))
+        self.assertEqual(other.get_fingerprint(), board.get_fingerprint())
+        board.restore(snapshot, True)
+        self.assertEqual(board.get_fingerprint(), empty)
+
+    # Asserts that the specified (solved) board is a valid solution of the puzzle on
+    # the specified rows.
+    def assert_solution(self, board, rows):
+        size = board.get_size()
+        line = board.to_line()
+        for index, symbol in enumerate(''.join(rows)):
+            self.assertIn(symbol, ('.', line[index]), "Expected the solution to contain the given values.")
+        for unit in board.get_topology().get_units():
+            self.assertEqual(len(set([line[index] for index in unit])), size, "Expected unique values in units.")
+
+    # Returns the rows of a puzzle on a board of the specified box size, created by
+    # removing about half the cells from a solved grid (a shifted pattern).
+    @staticmethod
+    def __large_puzzle(box_size):
+        size = box_size * box_size
+        symbols = "123456789ABCDEFGHIJKLMNOP"[:size]
+        return [
+            ''.join([
+                symbols[(box_size * (y % box_size) + y // box_size + x) % size] if (7 * x + 3 * y) % 5 < 3 else '.'
+                for x in range(size)
+            ])
+            for y in range(size)
+        ]
+
 
 if __name__ == '__main__':
     unittest.main()
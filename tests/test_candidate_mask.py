@@ -0,0 +1,24 @@
+import unittest
+
+from board.candidate_mask import CandidateMask
+
+
+class TestCandidateMask(unittest.TestCase):
+
+    def test_of(self):
+        self.assertEqual(CandidateMask.of(1), 0b000000001)
+        self.assertEqual(CandidateMask.of(9), 0b100000000)
+        self.assertEqual(CandidateMask.of_values([1, 3, 9]), 0b100000101)
+        self.assertEqual(CandidateMask.of_values(range(1, 10)), CandidateMask.ALL)
+
+    def test_tables(self):
+        mask = CandidateMask.of_values([2, 5, 7])
+        self.assertEqual(CandidateMask.POPCOUNT[mask], 3)
+        self.assertEqual(CandidateMask.LOWEST_VALUE[mask], 2)
+        self.assertEqual(CandidateMask.VALUES[mask], (2, 5, 7))
+        self.assertEqual(CandidateMask.POPCOUNT[0], 0)
+        self.assertEqual(CandidateMask.VALUES[CandidateMask.ALL], tuple(range(1, 10)))
+
+
+if __name__ == '__main__':
+    unittest.main()
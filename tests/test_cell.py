@@ -54,6 +54,17 @@ class TestCell(unittest.TestCase):
         with self.assertRaises(BoardException):
             self.cell.remove_possible_values([9])
 
+    def test_remove_mask(self):
+        self.assertEqual(self.cell.get_mask(), 0b111111111)
+        self.assertTrue(self.cell.remove_mask(0b000000101))
+        self.assertEqual(self.cell.get_possible_values(), [2, 4, 5, 6, 7, 8, 9])
+        self.assertFalse(self.cell.remove_mask(0b000000001), "Expected no change when removing absent values.")
+        self.cell.remove_mask(0b011111010)
+        self.assertTrue(self.cell.is_solved(), "Expected cell to be solved.")
+        self.assertEqual(self.cell.get_solution(), 9)
+        with self.assertRaises(BoardException):
+            self.cell.remove_mask(0b100000000)
+
     def test_get_solution(self):
         self.assertIsNone(self.cell.get_solution(), "Expected solution to be 'None'.")
         self.cell.set_value(6)
@@ -64,6 +75,17 @@ class TestCell(unittest.TestCase):
         self.cell.set_value(5)
         self.assertEqual(self.cell.to_string(), " 5 ")
 
+    def test_large_cell(self):
+        cell = Cell(None, None, 16)
+        self.assertEqual(cell.get_possible_values(), list(range(1, 17)))
+        self.assertTrue(cell.has_possible_value(16))
+        self.assertFalse(cell.has_possible_value(17))
+        with self.assertRaises(BoardException):
+            cell.set_value(17)
+        cell.set_value(16)
+        self.assertEqual(cell.get_solution(), 16)
+        self.assertEqual(cell.to_string(), " G ")
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,25 @@
+import unittest
+
+from board.board_exception import BoardException
+from board.cell_key import CellKey
+
+
+class TestCellKey(unittest.TestCase):
+
+    def test_to_index(self):
+        self.assertEqual(CellKey.to_index("x1y1"), 0)
+        self.assertEqual(CellKey.to_index("x9y1"), 8)
+        self.assertEqual(CellKey.to_index("x1y2"), 9)
+        self.assertEqual(CellKey.to_index("x9y9"), 80)
+        self.assertEqual(CellKey.to_index(42), 42)
+        self.assertEqual(CellKey.KEYS[42], "x7y5")
+
+    def test_to_index_invalid_key(self):
+        for key in ["x0y1", "x1y10", 81, -1]:
+            with self.assertRaises(BoardException):
+                CellKey.to_index(key)
+            self.assertFalse(CellKey.is_valid(key))
+
+
+if __name__ == '__main__':
+    unittest.main()
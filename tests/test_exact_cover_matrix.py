@@ -0,0 +1,37 @@
+import unittest
+
+from solver.exact_cover_matrix import ExactCoverMatrix
+
+
+class TestExactCoverMatrix(unittest.TestCase):
+
+    def test_solutions(self):
+        # Knuth's example: the only exact cover consists of rows 'B', 'D' and 'F'
+        matrix = ExactCoverMatrix(7)
+        matrix.add_row('A', [0, 3, 6])
+        matrix.add_row('B', [0, 3])
+        matrix.add_row('C', [3, 4, 6])
+        matrix.add_row('D', [2, 4, 5])
+        matrix.add_row('E', [1, 2, 5, 6])
+        matrix.add_row('F', [1, 6])
+        solutions = [sorted(solution) for solution in matrix.solutions()]
+        self.assertEqual(solutions, [['B', 'D', 'F']])
+        self.assertTrue(matrix.get_node_count() > 0)
+
+    def test_multiple_solutions(self):
+        matrix = ExactCoverMatrix(2)
+        matrix.add_row(1, [0])
+        matrix.add_row(2, [1])
+        matrix.add_row(3, [0, 1])
+        solutions = sorted(sorted(solution) for solution in matrix.solutions())
+        self.assertEqual(solutions, [[1, 2], [3]])
+
+    def test_no_solution(self):
+        matrix = ExactCoverMatrix(3)
+        matrix.add_row(1, [0, 1])
+        matrix.add_row(2, [1, 2])
+        self.assertEqual(list(matrix.solutions()), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
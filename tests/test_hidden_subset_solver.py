@@ -0,0 +1,48 @@
+import unittest
+
+from board.board import Board
+from board.candidate_mask import CandidateMask
+from board.row_unit import RowUnit
+from solver.hidden_subset_solver import HiddenSubsetSolver
+from solver.solver_exception import SolverException
+from unit_fixtures import UnitFixtures
+
+
+class TestHiddenSubsetSolver(unittest.TestCase):
+
+    def test_hidden_single(self):
+        # 9 only fits in the last cell
+        masks = [CandidateMask.ALL & ~CandidateMask.of(9)] * 8 + [CandidateMask.ALL]
+        row = UnitFixtures.first_row(masks)
+        self.assertTrue(HiddenSubsetSolver.solve(row))
+        self.assertEqual(row.get_cells()[8].get_mask(), CandidateMask.of(9))
+        self.assertFalse(HiddenSubsetSolver.solve(row))
+
+    def test_hidden_pair(self):
+        # 1 and 2 only fit in the first two cells
+        masks = [CandidateMask.ALL] * 2 + [CandidateMask.ALL & ~CandidateMask.of_values([1, 2])] * 7
+        row = UnitFixtures.first_row(masks)
+        self.assertTrue(HiddenSubsetSolver.solve(row))
+        self.assertEqual(row.get_cells()[0].get_mask(), CandidateMask.of_values([1, 2]))
+        self.assertEqual(row.get_cells()[1].get_mask(), CandidateMask.of_values([1, 2]))
+        self.assertEqual(row.get_cells()[2].get_mask(), CandidateMask.ALL & ~CandidateMask.of_values([1, 2]))
+
+    def test_large_hidden_subset(self):
+        # On a 16 x 16 board, the values 1 to 5 only fit in the first five cells
+        board = Board(None, 4)
+        row = RowUnit(board, board.get_topology().get_rows()[0], True)
+        quintuple = CandidateMask.of_values([1, 2, 3, 4, 5])
+        for cell in row.get_cells()[5:]:
+            cell.set_mask(CandidateMask.full(16) & ~quintuple)
+        self.assertTrue(HiddenSubsetSolver.solve(row))
+        for cell in row.get_cells()[:5]:
+            self.assertEqual(cell.get_mask(), quintuple)
+
+    def test_value_without_place(self):
+        masks = [CandidateMask.ALL & ~CandidateMask.of(9)] * 9
+        with self.assertRaises(SolverException):
+            HiddenSubsetSolver.solve(UnitFixtures.first_row(masks))
+
+
+if __name__ == '__main__':
+    unittest.main()
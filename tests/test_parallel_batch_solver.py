@@ -0,0 +1,33 @@
+import unittest
+
+from batch.batch_solver import BatchSolver
+from batch.parallel_batch_solver import ParallelBatchSolver
+
+
+class TestParallelBatchSolver(unittest.TestCase):
+
+    __lines = [
+        "1....7.9..3..2...8..96..5....53..9...1..8...26....4...3......1..4......7..7...3..\n",
+        "# comment\n",
+        "..53.....8......2..7..1.5..4....53...1..7...6..32...8..6.5....9..4....3......97..\n",
+        "invalid\n",
+        "....9....7.6...........35..9..3.2.6..4.8.......6...4....52..7..4.6.........1.....\n",
+        "000000010400000000020000000000050407008000300001090000300400200050100000000806000\n",
+    ]
+
+    def test_solve_lines(self):
+        expected_solutions = list(BatchSolver.solve_lines(self.__lines))
+        with ParallelBatchSolver(2, max_chunk_size=2) as solver:
+            self.assertEqual(list(solver.solve_lines(self.__lines)), expected_solutions)
+            # The workers are reused for the next batch
+            self.assertEqual(list(solver.solve_lines(iter(self.__lines))), expected_solutions)
+
+    def test_solve_lines_unordered(self):
+        expected_solutions = list(BatchSolver.solve_lines(self.__lines))
+        with ParallelBatchSolver(2) as solver:
+            solutions = sorted(solver.solve_lines_unordered(self.__lines))
+        self.assertEqual(solutions, list(enumerate(expected_solutions)))
+
+
+if __name__ == '__main__':
+    unittest.main()
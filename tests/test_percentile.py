@@ -0,0 +1,17 @@
+import unittest
+
+from percentile import Percentile
+
+
+class TestPercentile(unittest.TestCase):
+
+    def test_of(self):
+        values = list(range(1, 101))
+        self.assertEqual(Percentile.of(values, 0.5), 50)
+        self.assertEqual(Percentile.of(values, 0.99), 99)
+        self.assertEqual(Percentile.of(values, 1.0), 100)
+        self.assertEqual(Percentile.of([7], 0.99), 7)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,51 @@
+import unittest
+
+from board.board import Board
+from generator.puzzle_generator import PuzzleGenerator
+from sudoku_exception import SudokuException
+
+
+class TestPuzzleGenerator(unittest.TestCase):
+
+    @staticmethod
+    def __board(line):
+        return Board([line[i: i + 9] for i in range(0, 81, 9)])
+
+    def test_generate(self):
+        puzzle, solution = PuzzleGenerator(seed=1).generate()
+        board = self.__board(puzzle)
+        self.assertTrue(board.has_unique_solution())
+        self.assertEqual(board.solve().to_line(), solution)
+        # The puzzle is minimal: removing any clue makes the solution ambiguous
+        for index in range(81):
+            if puzzle[index] != '.':
+                reduced = puzzle[:index] + '.' + puzzle[index + 1:]
+                self.assertFalse(self.__board(reduced).has_unique_solution())
+
+    def test_generate_grid(self):
+        grid = PuzzleGenerator(seed=1).generate_grid()
+        board = self.__board(''.join([str(value) for value in grid]))
+        self.assertTrue(board.is_solved())
+        board.validate()
+        # Another seed gives another grid
+        self.assertNotEqual(PuzzleGenerator(seed=2).generate_grid(), grid)
+
+    def test_generate_symmetry(self):
+        puzzle, solution = PuzzleGenerator(PuzzleGenerator.SYMMETRY_ROTATIONAL, seed=2).generate()
+        self.assertTrue(self.__board(puzzle).has_unique_solution())
+        for index in range(81):
+            self.assertEqual(puzzle[index] == '.', puzzle[80 - index] == '.')
+
+    def test_generate_target_clues(self):
+        puzzle, solution = PuzzleGenerator(target_clues=40, seed=3).generate()
+        self.assertEqual(81 - puzzle.count('.'), 40)
+        self.assertTrue(self.__board(puzzle).has_unique_solution())
+
+    def test_unknown_symmetry(self):
+        with self.assertRaises(SudokuException) as context:
+            PuzzleGenerator("spiral")
+        self.assertTrue("Unknown symmetry: 'spiral'." in str(context.exception))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+import unittest
+
+from board.board import Board
+from board.candidate_mask import CandidateMask
+from board.row_unit import RowUnit
+from solver.single_unit_solver import SingleUnitSolver
+from sudoku_exception import SudokuException
+from unit_fixtures import UnitFixtures
+
+
+class TestSingleUnitSolver(unittest.TestCase):
+
+    def test_naked_single(self):
+        masks = [CandidateMask.of(1)] + [CandidateMask.ALL] * 8
+        row = UnitFixtures.first_row(masks)
+        self.assertTrue(SingleUnitSolver.solve(row))
+        self.assertEqual(row.get_cells()[1].get_mask(), CandidateMask.ALL & ~CandidateMask.of(1))
+        self.assertFalse(SingleUnitSolver.solve(row))
+
+    def test_naked_pair(self):
+        masks = [CandidateMask.of_values([1, 2])] * 2 + [CandidateMask.ALL] * 7
+        row = UnitFixtures.first_row(masks)
+        self.assertTrue(SingleUnitSolver.solve(row))
+        self.assertEqual(row.get_cells()[0].get_mask(), CandidateMask.of_values([1, 2]))
+        self.assertEqual(row.get_cells()[2].get_mask(), CandidateMask.ALL & ~CandidateMask.of_values([1, 2]))
+
+    def test_naked_triple_of_pairs(self):
+        # {1, 2}, {2, 3} and {1, 3}: the cells do not have the same possible values
+        masks = [CandidateMask.of_values([1, 2]), CandidateMask.of_values([2, 3]),
+                 CandidateMask.of_values([1, 3])] + [CandidateMask.ALL] * 6
+        row = UnitFixtures.first_row(masks)
+        self.assertTrue(SingleUnitSolver.solve(row))
+        self.assertEqual(row.get_cells()[1].get_mask(), CandidateMask.of_values([2, 3]))
+        for cell in row.get_cells()[3:]:
+            self.assertEqual(cell.get_mask(), CandidateMask.ALL & ~CandidateMask.of_values([1, 2, 3]))
+        self.assertFalse(SingleUnitSolver.solve(row))
+
+    def test_large_naked_subset(self):
+        # On a 16 x 16 board, five cells with the values 1 to 5 form a naked quintuple
+        board = Board(None, 4)
+        row = RowUnit(board, board.get_topology().get_rows()[0], True)
+        quintuple = CandidateMask.of_values([1, 2, 3, 4, 5])
+        for cell in row.get_cells()[:5]:
+            cell.set_mask(quintuple)
+        self.assertTrue(SingleUnitSolver.solve(row))
+        for cell in row.get_cells()[5:]:
+            self.assertEqual(cell.get_mask(), CandidateMask.full(16) & ~quintuple)
+        self.assertEqual(row.get_cells()[0].get_mask(), quintuple)
+
+    def test_too_few_values(self):
+        masks = [CandidateMask.of_values([1, 2])] * 3 + [CandidateMask.ALL] * 6
+        with self.assertRaises(SudokuException):
+            SingleUnitSolver.solve(UnitFixtures.first_row(masks))
+
+
+if __name__ == '__main__':
+    unittest.main()
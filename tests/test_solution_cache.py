@@ -0,0 +1,63 @@
+import unittest
+
+from board.board import Board
+from solver.canonical_form import CanonicalForm
+from solver.solution_cache import SolutionCache
+
+
+class TestSolutionCache(unittest.TestCase):
+
+    __puzzle = "1....7.9..3..2...8..96..5....53..9...1..8...26....4...3......1..4......7..7...3.."
+    __solution = "162857493534129678789643521475312986913586742628794135356478219241935867897261354"
+
+    # Transforms a line: transposes it, swaps the first two bands, reverses the rows
+    # within the last band, swaps the first two columns and relabels the digits.
+    @staticmethod
+    def __transform(line):
+        transposed = ''.join([line[9 * c + r] for r in range(9) for c in range(9)])
+        rows = [3, 4, 5, 0, 1, 2, 8, 7, 6]
+        columns = [1, 0, 2, 3, 4, 5, 6, 7, 8]
+        labels = dict(zip("123456789", "975318642"))
+        labels['.'] = '.'
+        return ''.join([labels[transposed[9 * r + c]] for r in rows for c in columns])
+
+    @staticmethod
+    def __board(line):
+        return Board([line[i: i + 9] for i in range(0, 81, 9)])
+
+    def test_canonical_form(self):
+        transformed = self.__transform(self.__puzzle)
+        canonical_line, transformation = CanonicalForm.of(self.__puzzle)
+        self.assertEqual(CanonicalForm.of(transformed)[0], canonical_line)
+        # Solutions are transformed back and forth
+        canonical_solution = CanonicalForm.to_canonical(self.__solution, transformation)
+        self.assertEqual(CanonicalForm.to_original(canonical_solution, transformation), self.__solution)
+        transformed_transformation = CanonicalForm.of(transformed)[1]
+        self.assertEqual(CanonicalForm.to_original(canonical_solution, transformed_transformation),
+                         self.__transform(self.__solution))
+        # Too many transformations to try
+        self.assertIsNone(CanonicalForm.of("." * 81))
+
+    def test_solve(self):
+        cache = SolutionCache(1)
+        self.assertEqual(cache.solve(self.__board(self.__puzzle)).to_line(), self.__solution)
+        self.assertEqual((cache.get_hits(), cache.get_misses(), cache.get_size()), (0, 1, 1))
+
+        # An equivalent puzzle is a hit
+        board = cache.solve(self.__board(self.__transform(self.__puzzle)))
+        self.assertTrue(board.is_solved())
+        self.assertEqual(board.to_line(), self.__transform(self.__solution))
+        self.assertEqual((cache.get_hits(), cache.get_misses()), (1, 1))
+
+        # Another puzzle evicts the least recently used solution
+        other = "4.....8.5.3..........7......2.....6.....8.4......1.......6.3.7.5..2.....1.4......"
+        cache.solve(self.__board(other))
+        cache.solve(self.__board(self.__puzzle))
+        self.assertEqual((cache.get_hits(), cache.get_misses(), cache.get_size()), (1, 3, 1))
+
+        cache.clear()
+        self.assertEqual((cache.get_hits(), cache.get_misses(), cache.get_size()), (0, 0, 0))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+import unittest
+
+from board.board import Board
+from solver.budget_exhausted import BudgetExhausted
+from solver.budget_exhausted_exception import BudgetExhaustedException
+from solver.cancel_token import CancelToken
+from solver.solve_budget import SolveBudget
+
+
+class TestSolveBudget(unittest.TestCase):
+
+    __rows = [
+        '1....7.9.',
+        '.3..2...8',
+        '..96..5..',
+        '..53..9..',
+        '.1..8...2',
+        '6....4...',
+        '3......1.',
+        '.4......7',
+        '..7...3..'
+    ]
+
+    def test_check(self):
+        SolveBudget().check(1000)
+        with self.assertRaises(BudgetExhaustedException) as context:
+            SolveBudget(max_nodes=10).check(10)
+        self.assertEqual(context.exception.get_reason(), SolveBudget.REASON_MAX_NODES)
+        with self.assertRaises(BudgetExhaustedException) as context:
+            SolveBudget(timeout=0).check(0)
+        self.assertEqual(context.exception.get_reason(), SolveBudget.REASON_TIMEOUT)
+        token = CancelToken()
+        SolveBudget(cancel_token=token).check(0)
+        token.cancel()
+        with self.assertRaises(BudgetExhaustedException) as context:
+            SolveBudget(cancel_token=token).check(0)
+        self.assertEqual(context.exception.get_reason(), SolveBudget.REASON_CANCELLED)
+
+    def test_solve_max_nodes(self):
+        propagated = Board(self.__rows)
+        propagated.propagate()
+        for engine in (Board.ENGINE_PROPAGATION, Board.ENGINE_DANCING_LINKS):
+            board = Board(self.__rows)
+            result = board.solve(engine=engine, max_nodes=3)
+            self.assertIsInstance(result, BudgetExhausted)
+            self.assertEqual(result.get_reason(), SolveBudget.REASON_MAX_NODES)
+            self.assertEqual(result.get_node_count(), 3)
+            self.assertFalse(result.is_solved())
+            self.assertIs(result.get_board(), board)
+            self.assertFalse(board.is_solved())
+        # The propagation engine leaves the board propagated, without guesses
+        self.assertTrue(Board(self.__rows).solve(max_nodes=3).get_board().equals(propagated))
+
+    def test_solve_within_budget(self):
+        board = Board(self.__rows)
+        self.assertIs(board.solve(timeout=60, max_nodes=100000, cancel_token=CancelToken()), board)
+        self.assertTrue(board.is_solved())
+
+    def test_solve_cancelled(self):
+        token = CancelToken()
+        token.cancel()
+        result = Board(None).solve(cancel_token=token)
+        self.assertEqual(result.get_reason(), SolveBudget.REASON_CANCELLED)
+        self.assertEqual(result.get_node_count(), 0)
+
+    def test_solve_timeout(self):
+        result = Board(None).solve(engine=Board.ENGINE_DANCING_LINKS, timeout=0)
+        self.assertEqual(result.get_reason(), SolveBudget.REASON_TIMEOUT)
+        self.assertEqual(result.get_board().to_line(), "." * 81)
+
+
+if __name__ == '__main__':
+    unittest.main()
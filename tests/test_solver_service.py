@@ -0,0 +1,90 @@
+import asyncio
+import json
+import os
+import tempfile
+import unittest
+
+from service.solver_service import SolverService
+
+
+class TestSolverService(unittest.IsolatedAsyncioTestCase):
+
+    __puzzle = "1....7.9..3..2...8..96..5....53..9...1..8...26....4...3......1..4......7..7...3.."
+    __solution = "162857493534129678789643521475312986913586742628794135356478219241935867897261354"
+
+    def test_parse_address(self):
+        self.assertEqual(SolverService.parse_address("localhost:8765"), ("localhost", 8765))
+        self.assertEqual(SolverService.parse_address(":0"), ("127.0.0.1", 0))
+        self.assertEqual(SolverService.parse_address("/tmp/sudoku.sock"), ("/tmp/sudoku.sock", None))
+
+    def test_solve_batch(self):
+        lines = [self.__puzzle, "123", "11" + "." * 79, "12345678." + "........9" + "." * 63]
+        self.assertEqual(SolverService.solve_batch(lines), [
+            self.__solution, SolverService.RESPONSE_INVALID, SolverService.RESPONSE_INVALID,
+            SolverService.RESPONSE_UNSOLVED
+        ])
+
+    async def test_serve_tcp(self):
+        service = await SolverService(1).start("127.0.0.1:0")
+        try:
+            reader, writer = await asyncio.open_connection(*service.get_address())
+            writer.write(f"{self.__puzzle}\n\nbad\n{self.__puzzle}\nstats\n".encode())
+            await writer.drain()
+            responses = [(await reader.readline()).decode().strip() for _ in range(4)]
+            writer.close()
+            await writer.wait_closed()
+        finally:
+            await service.close()
+        self.assertEqual(responses[:3], [self.__solution, SolverService.RESPONSE_INVALID, self.__solution])
+        stats = json.loads(responses[3])
+        self.assertEqual(stats["requests"], 3)
+        self.assertEqual(stats["solved"], 2)
+        self.assertEqual(stats["invalid"], 1)
+        self.assertEqual(stats["queue_depth"], 0)
+        self.assertTrue(stats["batches"] >= 1)
+        self.assertTrue(stats["latency_max_ms"] >= stats["latency_p50_ms"] > 0)
+
+    async def test_serve_unix_socket(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "sudoku.sock")
+            service = await SolverService(1, timeout=0).start(path)
+            try:
+                reader, writer = await asyncio.open_unix_connection(path)
+                writer.write(f"{self.__puzzle}\n".encode())
+                await writer.drain()
+                response = (await reader.readline()).decode().strip()
+                writer.close()
+                await writer.wait_closed()
+            finally:
+                await service.close()
+        self.assertEqual(response, SolverService.RESPONSE_TIMEOUT)
+
+    async def test_solve_batches(self):
+        service = await SolverService(1, max_batch_size=4, max_queue_size=8).start("127.0.0.1:0")
+        try:
+            # More concurrent puzzles than fit in the queue: submitting waits for room
+            responses = await asyncio.gather(*[service.solve(self.__puzzle) for _ in range(12)])
+            stats = service.get_stats()
+        finally:
+            await service.close()
+        self.assertEqual(responses, [self.__solution] * 12)
+        self.assertTrue(3 <= stats["batches"] < 12)
+        self.assertEqual(stats["in_flight"], 0)
+
+    async def test_close_while_busy(self):
+        service = await SolverService(1, max_batch_size=1).start("127.0.0.1:0")
+        requests = [asyncio.create_task(service.solve(self.__puzzle)) for _ in range(12)]
+        # Let the batches fill the worker, so the batcher waits with a puzzle in hand
+        await asyncio.sleep(0.05)
+        await service.close()
+        # Every request is answered: solved, or failed by closing
+        done, pending = await asyncio.wait(requests, timeout=10)
+        self.assertEqual(len(pending), 0)
+        for request in done:
+            self.assertIn(request.result(), (self.__solution, SolverService.RESPONSE_ERROR))
+        # No more puzzles are accepted
+        self.assertEqual(await service.solve(self.__puzzle), SolverService.RESPONSE_ERROR)
+
+
+if __name__ == '__main__':
+    unittest.main()
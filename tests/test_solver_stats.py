@@ -0,0 +1,41 @@
+import unittest
+
+from solver.horizontal_block_solver import HorizontalBlockSolver
+from solver.single_unit_solver import SingleUnitSolver
+from solver.solver_stats import SolverStats
+
+
+class TestSolverStats(unittest.TestCase):
+
+    def test_record_strategy(self):
+        stats = SolverStats()
+        stats.record_strategy(SingleUnitSolver, 3, 1, 0.5)
+        stats.record_strategy(SingleUnitSolver, 2, 0, 0.25)
+        stats.record_strategy(HorizontalBlockSolver, 0, 0, 0.125)
+        self.assertEqual(stats.get_strategy_names(), ["SingleUnitSolver", "HorizontalBlockSolver"])
+        self.assertEqual(stats.get_invocations("SingleUnitSolver"), 2)
+        self.assertEqual(stats.get_eliminations("SingleUnitSolver"), 5)
+        self.assertEqual(stats.get_placements("SingleUnitSolver"), 1)
+        self.assertEqual(stats.get_seconds("SingleUnitSolver"), 0.75)
+        self.assertEqual(stats.get_invocations("VerticalBlockSolver"), 0)
+
+    def test_merge(self):
+        stats = SolverStats()
+        stats.record_strategy(SingleUnitSolver, 3, 1, 0.5)
+        stats.count_guess()
+        other = SolverStats()
+        other.record_strategy(SingleUnitSolver, 1, 1, 0.5)
+        other.count_guess()
+        other.count_backtrack()
+        stats.merge(other)
+        self.assertEqual(stats.to_dict(), {
+            "strategies": {
+                "SingleUnitSolver": {"invocations": 2, "eliminations": 4, "placements": 2, "seconds": 1.0}
+            },
+            "guesses": 2,
+            "backtracks": 1
+        })
+
+
+if __name__ == '__main__':
+    unittest.main()
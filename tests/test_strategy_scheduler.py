@@ -0,0 +1,65 @@
+import unittest
+from unittest.mock import Mock
+
+from board.board import Board
+from solver.bidirectional_block_solver import BidirectionalBlockSolver
+from solver.hidden_subset_solver import HiddenSubsetSolver
+from solver.single_unit_solver import SingleUnitSolver
+from solver.strategy_scheduler import StrategyScheduler
+
+
+class TestStrategyScheduler(unittest.TestCase):
+
+    def test_select(self):
+        scheduler = StrategyScheduler()
+        unit = Mock()
+        solvers = [SingleUnitSolver, HiddenSubsetSolver, BidirectionalBlockSolver]
+        # Expensive solvers are always deferred
+        self.assertEqual(scheduler.select(unit, solvers), ([SingleUnitSolver, HiddenSubsetSolver], [BidirectionalBlockSolver]))
+
+        # Unproductive solvers are deferred on the unit, until they are productive again
+        for _ in range(StrategyScheduler.BACKOFF):
+            scheduler.record(unit, SingleUnitSolver, False)
+        self.assertTrue(scheduler.is_backed_off(unit, SingleUnitSolver))
+        self.assertFalse(scheduler.is_backed_off(Mock(), SingleUnitSolver))
+        self.assertEqual(scheduler.select(unit, solvers), ([HiddenSubsetSolver], [SingleUnitSolver, BidirectionalBlockSolver]))
+        scheduler.record(unit, SingleUnitSolver, True)
+        self.assertFalse(scheduler.is_backed_off(unit, SingleUnitSolver))
+
+    def test_order(self):
+        scheduler = StrategyScheduler()
+        unit = Mock()
+        self.assertEqual(scheduler.get_yield(SingleUnitSolver), 1.0)
+        scheduler.record(unit, SingleUnitSolver, False)
+        scheduler.record(unit, HiddenSubsetSolver, True)
+        self.assertTrue(scheduler.get_yield(SingleUnitSolver) < scheduler.get_yield(HiddenSubsetSolver))
+        # The most productive solvers first
+        self.assertEqual(scheduler.order({SingleUnitSolver, HiddenSubsetSolver}), [HiddenSubsetSolver, SingleUnitSolver])
+
+    def test_propagate_fixpoint(self):
+        # Propagation reaches the same fixpoint as running all solvers on all units
+        rows = [
+            '1....7.9.',
+            '.3..2...8',
+            '..96..5..',
+            '..53..9..',
+            '.1..8...2',
+            '6....4...',
+            '3......1.',
+            '.4......7',
+            '..7...3..'
+        ]
+        board = Board(rows)
+        board.propagate()
+        self.assertTrue(board.get_scheduler().get_yield(SingleUnitSolver) < 1.0)
+        snapshot = board.snapshot()
+        updated = True
+        while updated:
+            updated = False
+            for unit in board.get_block_units():
+                updated = unit.solve() or updated
+        self.assertEqual(board.snapshot(), snapshot)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,37 @@
+import unittest
+
+from board.topology import Topology
+
+
+class TestTopology(unittest.TestCase):
+
+    def test_get_is_shared(self):
+        self.assertIs(Topology.get(), Topology.get(3))
+
+    def test_units(self):
+        topology = Topology.get()
+        self.assertEqual(len(topology.get_units()), 27)
+        self.assertEqual(topology.get_rows()[1], (9, 10, 11, 12, 13, 14, 15, 16, 17))
+        self.assertEqual(topology.get_columns()[1], (1, 10, 19, 28, 37, 46, 55, 64, 73))
+        self.assertEqual(topology.get_blocks()[4], (30, 31, 32, 39, 40, 41, 48, 49, 50))
+        self.assertEqual(topology.get_units_of_cell()[80], (8, 17, 26))
+        self.assertEqual(topology.get_block_of_cell()[80], 8)
+
+    def test_peers(self):
+        topology = Topology.get()
+        for index in range(81):
+            peers = topology.get_peers()[index]
+            self.assertEqual(len(peers), 20)
+            self.assertNotIn(index, peers)
+        self.assertEqual(topology.get_peers()[0][:11], (1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11))
+
+    def test_block_neighbours(self):
+        topology = Topology.get()
+        self.assertEqual(topology.get_horizontal_neighbours()[4], (3, 5))
+        self.assertEqual(topology.get_vertical_neighbours()[4], (1, 7))
+        self.assertEqual(topology.get_horizontal_neighbours()[0], (1, 2))
+        self.assertEqual(topology.get_vertical_neighbours()[8], (2, 5))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,45 @@
+import unittest
+
+from batch.batch_solver import BatchSolver
+from board.board import Board
+from solver.transposition_table import TranspositionTable
+
+
+class TestTranspositionTable(unittest.TestCase):
+
+    __puzzle = "....14....3....2...7..........9...3.6.1.............8.2.....1.4....5.6.....7.8..."
+
+    def test_add_dead_end(self):
+        table = TranspositionTable(2)
+        self.assertFalse(table.is_dead_end(1))
+        table.add_dead_end(1)
+        table.add_dead_end(2)
+        self.assertTrue(table.is_dead_end(1))
+        # The least recently used dead end (2) is evicted
+        table.add_dead_end(3)
+        self.assertEqual(table.get_size(), 2)
+        self.assertFalse(table.is_dead_end(2))
+        self.assertTrue(table.is_dead_end(3))
+        self.assertEqual(table.get_hits(), 2)
+        table.clear()
+        self.assertEqual(table.get_size(), 0)
+        self.assertEqual(table.get_hits(), 0)
+
+    def test_shared_between_searches(self):
+        rows = BatchSolver.line_to_rows(self.__puzzle)
+        table = TranspositionTable()
+        board = Board(rows)
+        self.assertEqual(board.count_solutions(None, None, table), 1)
+        first_node_count = board.get_node_count()
+        self.assertTrue(table.get_size() > 0)
+        # The dead ends of the first search are pruned in the second one
+        self.assertEqual(board.count_solutions(None, None, table), 1)
+        self.assertTrue(board.get_node_count() < first_node_count)
+        self.assertTrue(table.get_hits() > 0)
+        solved = Board(rows).solve(transposition_table=table)
+        self.assertTrue(solved.is_solved())
+        self.assertEqual(solved.to_line(), Board(rows).solve().to_line())
+
+
+if __name__ == '__main__':
+    unittest.main()
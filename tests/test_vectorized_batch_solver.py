@@ -0,0 +1,72 @@
+import os
+import tempfile
+import unittest
+
+from batch.batch_solver import BatchSolver
+from batch.binary_corpus_reader import BinaryCorpusReader
+from batch import vectorized_batch_solver
+from batch.vectorized_batch_solver import VectorizedBatchSolver
+from board.binary_format import BinaryFormat
+
+
+@unittest.skipIf(vectorized_batch_solver.numpy is None, "numpy is not installed")
+class TestVectorizedBatchSolver(unittest.TestCase):
+
+    # Solved by propagation alone
+    __easy = "...7...495....3...8..64...53.9.7.1...8.93.2..725.14.93.....7..196.4815...52......"
+    # Needs searching
+    __puzzle = "1....7.9..3..2...8..96..5....53..9...1..8...26....4...3......1..4......7..7...3.."
+    __solution = "162857493534129678789643521475312986913586742628794135356478219241935867897261354"
+
+    def test_propagate(self):
+        masks, valid = VectorizedBatchSolver.to_masks([self.__easy, self.__puzzle, "11" + "." * 79, "bad"])
+        self.assertEqual(list(valid), [True, True, True, False])
+        masks, valid = VectorizedBatchSolver.propagate(masks, valid)
+        # The duplicate value is detected
+        self.assertEqual(list(valid), [True, True, False, False])
+        self.assertEqual(VectorizedBatchSolver.to_line(masks[0]), BatchSolver.solve_line(self.__easy))
+        # Propagation alone does not solve the other puzzle, but agrees with its solution
+        for mask, digit in zip(masks[1].tolist(), self.__solution):
+            self.assertTrue(mask & (1 << (int(digit) - 1)))
+        self.assertTrue(any([bin(mask).count('1') > 1 for mask in masks[1].tolist()]))
+
+    def test_solve_batch(self):
+        lines = [self.__puzzle, self.__easy, "bad", "11" + "." * 79]
+        self.assertEqual(
+            VectorizedBatchSolver.solve_batch(lines),
+            [self.__solution, BatchSolver.solve_line(self.__easy), None, None]
+        )
+
+    def test_solve_lines(self):
+        lines = ["# comment\n", self.__puzzle + "\n", "\n", self.__easy, self.__puzzle]
+        solutions = list(VectorizedBatchSolver.solve_lines(lines, batch_size=2))
+        self.assertEqual(solutions, [self.__solution, BatchSolver.solve_line(self.__easy), self.__solution])
+
+    def test_solve_corpus(self):
+        handle, path = tempfile.mkstemp(suffix=".bin")
+        try:
+            with os.fdopen(handle, "wb") as file:
+                BinaryFormat.write(file, [self.__puzzle, "11" + "." * 79, self.__easy])
+            with BinaryCorpusReader(path) as reader:
+                solutions = list(VectorizedBatchSolver.solve_corpus(reader, batch_size=2))
+            self.assertEqual(solutions, [self.__solution, None, BatchSolver.solve_line(self.__easy)])
+        finally:
+            os.remove(path)
+
+    def test_solve_corrupt_corpus(self):
+        masks = list(BinaryFormat.to_masks(BinaryFormat.encode_givens(self.__puzzle)))
+        corrupt = [0xFFFF] + masks[1:]
+        handle, path = tempfile.mkstemp(suffix=".bin")
+        try:
+            with os.fdopen(handle, "wb") as file:
+                BinaryFormat.write(file, [masks, corrupt, masks], BinaryFormat.FORMAT_MASKS)
+            with BinaryCorpusReader(path) as reader:
+                solutions = list(VectorizedBatchSolver.solve_corpus(reader))
+            # Only the corrupt record is rejected
+            self.assertEqual(solutions, [self.__solution, None, self.__solution])
+        finally:
+            os.remove(path)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,15 @@
+from board.board import Board
+from board.row_unit import RowUnit
+
+
+# Builds board fixtures shared by the unit solver tests.
+class UnitFixtures:
+
+    # Returns the first row of an empty board whose cells carry the
+    # specified candidate masks, in order.
+    @staticmethod
+    def first_row(masks):
+        board = Board(None)
+        for cell, mask in zip(board.get_cells(), masks):
+            cell.set_mask(mask)
+        return RowUnit(board, [f"x{x}y1" for x in range(1, 10)])